@@ -1,244 +1,29 @@
-from datetime import datetime
-from sortedcontainers import SortedDict
+# Test cases for the optimization package. Running this file prints the result of every test case; importing
+# the package itself does no work and prints nothing.
+import json
+import math
+import os
+import sys
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from optimization import (EDGE_DTYPE, CSRGraph, ColumnarPostStore, ContractionHierarchy, DatetimeIndex, DijkstraCache,
+                          DijkstraStats, DistanceMatrix, Graph, IndexedHeap, Intersection, LandmarkHeuristic,
+                          PersistentPostManager, Post, PostManager, PostManagerWithPriority, PostManagerWithRange,
+                          PostManagerWithSketch, PostRollups, Road, ShardedPostManager, ShortestPathTree,
+                          add_edge_batch, benchmark_datetime_parsing, benchmark_edge_list_loading, cluster_houses,
+                          compare_benchmarks, compare_top_k, create_datetime, dijkstra, distance, distance_matrix,
+                          distances_from, euclidean_heuristic, find_nearest_neighbor, generate_clustered_stops,
+                          generate_post_stream, grid_edges, haversine_distance, haversine_heuristic, improve_route,
+                          instrumentation, load_csr_edge_list, load_edge_list, plan_vehicle_routes,
+                          random_geometric_edges, run_benchmarks, shortest_path)
 
 
-# Helper function to create datetime objects easily
-def create_datetime(date_str):
-    # This function uses strptime from the datetime module to convert a date string into a datetime object.
-    return datetime.strptime(date_str, "%Y-%m-%d %H:%M")
-
-
-class Post:
-    """Creating Class representing a social media post with datetime, content, and user attributes."""
-
-    def __init__(self, postDatetime, postContent, postUser):
-        self.postDatetime = postDatetime
-        self.postContent = postContent
-        self.postUser = postUser
-
-    def __repr__(self):
-        # Adding a function that summarizes the attributes for Post object
-        return f"Post(datetime={self.postDatetime}, content='{self.postContent}', user='{self.postUser}')"
-
-
-class PostManager:
-    """Creating a Class that Manages posts through hash table with the post datetime as the key"""
-
-    def __init__(self):
-        # Creating a dictionary to store the data of the post
-        self.posts_by_datetime = {}
-
-    def add_post(self, post):
-        # Adding a function that sdds a post to the hash table
-        self.posts_by_datetime[post.postDatetime] = post
-
-    def find_post_by_datetime(self, datetime):
-        # Creating a function that finds a post by datetime. Returns the post or 'Post not found' if not present
-        return self.posts_by_datetime.get(datetime, "Post not found")
-
-
-from sortedcontainers import SortedDict
-
-
-# Importing the sort dictionary from sortedcontainers
-
-
-class PostManagerWithRange:
-    """Adding a class that will be in charge of managing posts bySortedDict to generate efficient range queries"""
-
-    def __init__(self):
-        # Initializes the init constructor for storing data efficently
-        self.sorted_posts = SortedDict()
-
-    def add_post(self, post):
-        # This function is created to add add a post to a sorted dictionary
-        self.sorted_posts[post.postDatetime] = post
-
-    def find_posts_in_range(self, start_datetime, end_datetime):
-        # This function will retreive and get the posts depending on their specified datetime range
-        range_indices = self.sorted_posts.irange(start_datetime, end_datetime)
-        return [self.sorted_posts[datetime] for datetime in range_indices]
-
-
-import heapq
-
-
-class PostWithViews:
-    """Creating a class for Wrapper class for Post to handle the max-heap by views"""
-
-    def __init__(self, post, views):
-        self.post = post
-        self.views = -views  # Undo views for max-heap functionality
-
-    def __lt__(self, other):
-        # This function Ensure proper ordering in the heapq by views
-        return self.views < other.views
-
-    def __repr__(self):
-        # Readable representation of the object for debugging and logging
-        return f"{-self.views}, {self.post}"
-
-
-class PostManagerWithPriority:
-    """Creating a class that Manages posts with a priority queue to easily fetch the post with the most views"""
-
-    def __init__(self):
-        self.heap = []
-
-    def add_post(self, post, views):
-        # This function Adds a post with its views to the heap
-        heapq.heappush(self.heap, PostWithViews(post, views))
-
-    def get_most_viewed_post(self):
-        # This function Retrieves the post with the most views
-        if self.heap:
-            return self.heap[0]  # Access the smallest item in the min-heap, which is the largest by views
-        return "No posts available"
-
-
-    class Intersection:
-        """Class representing an intersection in the road network.
-
-        Attributes:
-            id (int): A unique identifier for the intersection.
-            name (str): The name of the intersection.
-        """
-
-        def __init__(self, id, name):
-            self.id = id  # Unique identifier for each intersection
-            self.name = name  # Human-readable name for the intersection
-
-        def __repr__(self):
-            # Provides a string representation of the Intersection object, useful for debugging.
-            return f"Intersection({self.id}, '{self.name}')"
-
-
-class Road:
-    """Class representing a road connecting two intersections.
-
-    Attributes:
-        id (int): A unique identifier for the road.
-        name (str): The name of the road.
-        length (float): The length of the road in kilometers.
-    """
-
-    def __init__(self, id, name, length):
-        self.id = id  # Unique identifier for each road
-        self.name = name  # Name of the road
-        self.length = length  # Length of the road in kilometers
-
-    def __repr__(self):
-        # Provides a string representation of the Road object, useful for debugging.
-        return f"Road(ID: {self.id}, Name: '{self.name}', Length: {self.length} km)"
-
-
-class Graph:
-    """Graph class to represent the network of intersections and roads.
-
-    Attributes:
-        adjacency_list (dict): A dictionary where keys are Intersection objects and values are lists
-                               of tuples (Intersection, Road) representing connections to neighboring intersections.
-    """
-
-    def __init__(self):
-        self.adjacency_list = {}  # Initializes an empty dictionary to store adjacency list.
-
-    def add_vertex(self, vertex):
-        if vertex not in self.adjacency_list:
-            self.adjacency_list[vertex] = []  # Initializes an empty list to store vertices.
-
-    def add_edge(self, frm, to, length):
-        # Ensure to include a road name when creating the Road instance.
-        road_name = f"Road from {frm} to {to}"
-        if frm not in self.adjacency_list:
-            self.adjacency_list[frm] = []
-        if to not in self.adjacency_list:
-            self.adjacency_list[to] = []
-        self.adjacency_list[frm].append((to, Road(frm, road_name, length)))
-        self.adjacency_list[to].append((frm, Road(to, road_name, length)))  # Assuming bidirectional for simplicity
-
-    def add_intersection(self, intersection):
-        """Adds an intersection to the graph if it is not already present."""
-        if intersection not in self.adjacency_list:
-            self.adjacency_list[intersection] = []  # Adds intersection with an empty list of connected roads.
-
-    def add_road(self, start, end, road):
-        """Adds a road between two intersections."""
-        self.adjacency_list[start].append((end, road))  # Adds end intersection and road to start's list.
-        self.adjacency_list[end].append(
-            (start, road))  # Adds start intersection and road to end's list (bidirectional).
-
-    def display(self):
-        """Prints a representation of the graph showing all connections."""
-        for intersection, roads in self.adjacency_list.items():
-            print(f"{intersection}:")
-            for neighbor, road in roads:
-                print(f"  -> to {neighbor} via {road}")
-
-
-# Code for Part 2: Nearest Neighbor Heuristic for Package Distribution
-# Function to calculate the shortest distance between two points a and b.
-# Each point is represented as a tuple (x-coordinate, y-coordinate).
-def distance(a, b):
-    # Calculate the square root of the sum of the squared differences of the coordinates.
-    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
-
-
-# Function to find the nearest neighbor route for package delivery starting from a given location.
-def find_nearest_neighbor(start, houses):
-    # Initialize the route with the start location.
-    route = [start]
-    # Set the current location as the start location.
-    current = start
-
-    # Continue until there are no more houses to visit.
-    while houses:
-        # Find the house nearest to the current location by comparing distances.
-        next_house = min(houses, key=lambda x: distance(current, x))
-        # Append the nearest house to the route.
-        route.append(next_house)
-        # Remove the visited house from the list of houses to prevent revisiting.
-        houses.remove(next_house)
-        # Update the current location to the newly visited house.
-        current = next_house
-
-    # Return the completed route that includes all visited houses.
-    return route
-
-
-# Import the heapq module to use the heap queue algorithm, also known as the priority queue algorithm.
-import heapq
-
-
-# Define the Dijkstra's algorithm function to find the shortest paths from a start vertex to all other vertices in a graph.
-def dijkstra(graph, start):
-    # Initialize a dictionary to store the shortest distance from the start vertex to each other vertex.
-    # Set all distances to infinity as default, except the start vertex which is set to zero.
-    distances = {vertex: float('infinity') for vertex in graph.adjacency_list}
-    distances[start] = 0
-
-    # Create a priority queue and add the start vertex with a distance of 0.
-    priority_queue = [(0, start)]
-
-    # Continue processing as long as there are vertices in the priority queue.
-    while priority_queue:
-        # Remove and return the vertex with the smallest distance from the priority queue.
-        current_distance, current_vertex = heapq.heappop(priority_queue)
-
-        # Iterate over each neighbor connected to the current vertex.
-        for neighbor, road in graph.adjacency_list[current_vertex]:
-            # Calculate the distance to this neighbor by adding the current distance to the length of the connecting road.
-            distance = current_distance + road.length
-            # If the calculated distance is less than the previously recorded distance in the distances dictionary,
-            # update the distance for this neighbor.
-            if distance < distances[neighbor]:
-                distances[neighbor] = distance
-                # Add the neighbor to the priority queue with the new distance.
-                heapq.heappush(priority_queue, (distance, neighbor))
-
-    # Return the dictionary containing the shortest distances from the start vertex to each vertex in the graph.
-    return distances
-
 # Initialize the PostManager
 post_manager = PostManager()
 
@@ -495,85 +280,6 @@ test_dijkstras_linear_graph_reversed()
 # Test cases for Part 1: Testing Graph Representation
 
 
-class Intersection:
-    """Class representing an intersection in the road network.
-
-    Attributes:
-        id (int): A unique identifier for the intersection.
-        name (str): The name of the intersection.
-    """
-
-    def __init__(self, id, name):
-        self.id = id  # Unique identifier for each intersection
-        self.name = name  # Human-readable name for the intersection
-
-    def __repr__(self):
-        # Provides a string representation of the Intersection object, useful for debugging.
-        return f"Intersection({self.id}, '{self.name}')"
-
-
-class Road:
-    """Class representing a road connecting two intersections.
-
-    Attributes:
-        id (int): A unique identifier for the road.
-        name (str): The name of the road.
-        length (float): The length of the road in kilometers.
-    """
-
-    def __init__(self, id, name, length):
-        self.id = id  # Unique identifier for each road
-        self.name = name  # Name of the road
-        self.length = length  # Length of the road in kilometers
-
-    def __repr__(self):
-        # Provides a string representation of the Road object, useful for debugging.
-        return f"Road(ID: {self.id}, Name: '{self.name}', Length: {self.length} km)"
-
-
-class Graph:
-    """Graph class to represent the network of intersections and roads.
-
-    Attributes:
-        adjacency_list (dict): A dictionary where keys are Intersection objects and values are lists
-                               of tuples (Intersection, Road) representing connections to neighboring intersections.
-    """
-
-    def __init__(self):
-        self.adjacency_list = {}  # Initializes an empty dictionary to store adjacency list.
-
-    def add_vertex(self, vertex):
-        if vertex not in self.adjacency_list:
-            self.adjacency_list[vertex] = []  # Initializes an empty list to store vertices.
-
-    def add_edge(self, frm, to, length):
-        # Ensure to include a road name when creating the Road instance.
-        road_name = f"Road from {frm} to {to}"
-        if frm not in self.adjacency_list:
-            self.adjacency_list[frm] = []
-        if to not in self.adjacency_list:
-            self.adjacency_list[to] = []
-        self.adjacency_list[frm].append((to, Road(frm, road_name, length)))
-        self.adjacency_list[to].append((frm, Road(to, road_name, length)))  # Assuming bidirectional for simplicity
-
-    def add_intersection(self, intersection):
-        """Adds an intersection to the graph if it is not already present."""
-        if intersection not in self.adjacency_list:
-            self.adjacency_list[intersection] = []  # Adds intersection with an empty list of connected roads.
-
-    def add_road(self, start, end, road):
-        """Adds a road between two intersections."""
-        self.adjacency_list[start].append((end, road))  # Adds end intersection and road to start's list.
-        self.adjacency_list[end].append(
-            (start, road))  # Adds start intersection and road to end's list (bidirectional).
-
-    def display(self):
-        """Prints a representation of the graph showing all connections."""
-        for intersection, roads in self.adjacency_list.items():
-            print(f"{intersection}:")
-            for neighbor, road in roads:
-                print(f"  -> to {neighbor} via {road}")
-
 
 # Test cases for Part 1: Testing Graph Representation
 
@@ -646,4 +352,936 @@ def test_graph_operations():
     graph.display()
 
 # Execute the test cases
-test_graph_operations()
\ No newline at end of file
+test_graph_operations()
+
+# Test cases for Part 3: Testing the CSR Graph Backend
+def test_csr_graph():
+    # Test Case 1: Linear graph gives the same distances as the dictionary-based dijkstra
+    graph = Graph()
+    for i in range(5):
+        graph.add_vertex(i)
+    for i in range(4):
+        graph.add_edge(i, i + 1, i + 1)
+    csr = CSRGraph.from_graph(graph)
+    print("Test Case 1: CSR Linear Graph", csr, dijkstra(csr, 0) == dijkstra(graph, 0))
+
+    # Test Case 2: Weighted graph with a shortcut and a parallel edge
+    graph = Graph()
+    graph.add_edge('A', 'B', 1)
+    graph.add_edge('B', 'C', 2)
+    graph.add_edge('A', 'C', 4)
+    graph.add_edge('A', 'C', 2.5)
+    graph.add_edge('C', 'D', 1)
+    csr = CSRGraph.from_graph(graph)
+    print("Test Case 2: CSR Weighted Graph", dijkstra(csr, 'A'), dijkstra(csr, 'A') == dijkstra(graph, 'A'))
+
+    # Test Case 3: Disconnected vertex stays at infinity
+    graph.add_vertex('E')
+    csr = CSRGraph.from_graph(graph)
+    print("Test Case 3: CSR Disconnected Vertex", dijkstra(csr, 'A')['E'], dijkstra(csr, 'A') == dijkstra(graph, 'A'))
+
+    # Test Case 4: UAE road network built from Intersections and Roads
+    graph = Graph()
+    marina, jbr, downtown, business_bay = (Intersection(1, "Dubai Marina"), Intersection(2, "JBR"),
+                                           Intersection(3, "Downtown Dubai"), Intersection(4, "Business Bay"))
+    for intersection in (marina, jbr, downtown, business_bay):
+        graph.add_intersection(intersection)
+    graph.add_road(marina, jbr, Road(1, "Sheikh Zayed Road", 2.0))
+    graph.add_road(jbr, downtown, Road(2, "Al Khail Road", 5.0))
+    graph.add_road(downtown, business_bay, Road(3, "Sheikh Mohammed bin Rashid Blvd", 1.5))
+    graph.add_road(business_bay, marina, Road(4, "Hessa Street", 3.5))
+    csr = CSRGraph.from_graph(graph)
+    print("Test Case 4: CSR UAE Road Network", dijkstra(csr, marina), dijkstra(csr, marina) == dijkstra(graph, marina))
+
+    # Test Case 5: Timing against the dictionary-based dijkstra on a 150 x 150 grid
+    graph = Graph()
+    add_edge_batch(graph, *grid_edges(150, 150))
+    csr = CSRGraph.from_graph(graph)
+    timings = {}
+    for name, searched in (("dict", graph), ("csr", csr)):
+        started = time.perf_counter()
+        distances = dijkstra(searched, 0)
+        timings[name] = time.perf_counter() - started
+    print("Test Case 5: CSR vs Dict Dijkstra", {name: f"{seconds:.3f} s" for name, seconds in timings.items()},
+          distances == dijkstra(graph, 0))
+
+
+test_csr_graph()
+
+
+# Test cases for Part 4: Testing Bulk Edge-List Ingestion
+def test_bulk_edge_loading():
+    with tempfile.TemporaryDirectory() as directory:
+        # Test Case 1: CSV edge list gives the same graph as calling add_edge per edge
+        csv_path = os.path.join(directory, "edges.csv")
+        with open(csv_path, "w") as file:
+            file.write("frm,to,length\n1,2,1.5\n2,3,2.0\n1,3,4.0\n3,4,1.0\n")
+        graph = load_edge_list(csv_path, chunk_size=2, skip_header=1)
+        expected = Graph()
+        for frm, to, length in [(1, 2, 1.5), (2, 3, 2.0), (1, 3, 4.0), (3, 4, 1.0)]:
+            expected.add_edge(frm, to, length)
+        print("Test Case 1: CSV Edge List", dijkstra(graph, 1), dijkstra(graph, 1) == dijkstra(expected, 1))
+
+        # Test Case 2: The same edges saved as .npy and .npz load into identical CSR graphs
+        edges = np.array([(1, 2, 1.5), (2, 3, 2.0), (1, 3, 4.0), (3, 4, 1.0)], dtype=EDGE_DTYPE)
+        npy_path = os.path.join(directory, "edges.npy")
+        npz_path = os.path.join(directory, "edges.npz")
+        np.save(npy_path, edges)
+        np.savez(npz_path, frm=edges["frm"], to=edges["to"], length=edges["length"])
+        from_npy = load_csr_edge_list(npy_path, chunk_size=3)
+        from_npz = load_csr_edge_list(npz_path)
+        from_graph = CSRGraph.from_graph(expected)
+        print("Test Case 2: NumPy Edge Lists",
+              np.array_equal(from_npy.targets, from_graph.targets) and np.array_equal(from_npz.weights, from_graph.weights),
+              dijkstra(from_npz, 1) == dijkstra(expected, 1))
+
+        # Test Case 3: Benchmark against the per-edge add_edge loop
+        print("Test Case 3: Bulk Loading Benchmark")
+        benchmark_edge_list_loading(os.path.join(directory, "benchmark.csv"))
+
+
+test_bulk_edge_loading()
+
+
+# Test cases for Part 5: Testing Point-to-Point Shortest Paths
+def test_shortest_path():
+    # Test Case 1: UAE road network, both search modes return the same roads
+    graph = Graph()
+    marina, jbr, downtown, business_bay = (Intersection(1, "Dubai Marina"), Intersection(2, "JBR"),
+                                           Intersection(3, "Downtown Dubai"), Intersection(4, "Business Bay"))
+    for intersection in (marina, jbr, downtown, business_bay):
+        graph.add_intersection(intersection)
+    graph.add_road(marina, jbr, Road(1, "Sheikh Zayed Road", 2.0))
+    graph.add_road(jbr, downtown, Road(2, "Al Khail Road", 5.0))
+    graph.add_road(downtown, business_bay, Road(3, "Sheikh Mohammed bin Rashid Blvd", 1.5))
+    graph.add_road(business_bay, marina, Road(4, "Hessa Street", 3.5))
+    print("Test Case 1: Marina to Downtown", shortest_path(graph, marina, downtown))
+    print("Test Case 1: Marina to Downtown (bidirectional)", shortest_path(graph, marina, downtown, bidirectional=True))
+
+    # Test Case 2: Source equals target
+    print("Test Case 2: Source Equals Target", shortest_path(graph, jbr, jbr, bidirectional=True))
+
+    # Test Case 3: Unreachable target
+    graph.add_intersection(Intersection(5, "Hatta"))
+    print("Test Case 3: Unreachable Target", shortest_path(graph, marina, list(graph.adjacency_list)[-1], bidirectional=True))
+
+    # Test Case 4: Long grid, bidirectional search agrees with dijkstra and settles fewer vertices
+    graph = Graph()
+    size = 30
+    for row in range(size):
+        for column in range(size):
+            if column + 1 < size:
+                graph.add_edge((row, column), (row, column + 1), 1 + (row * column) % 3)
+            if row + 1 < size:
+                graph.add_edge((row, column), (row + 1, column), 1 + (row + column) % 2)
+    source, target = (0, 0), (size // 2, size // 2)
+    one_way = shortest_path(graph, source, target)
+    two_way = shortest_path(graph, source, target, bidirectional=True)
+    print("Test Case 4: Grid Shortest Path", one_way.distance == two_way.distance == dijkstra(graph, source)[target],
+          sum(road.length for road in two_way.roads) == two_way.distance,
+          f"settled {one_way.settled} vs {two_way.settled} of {len(graph.adjacency_list)}")
+
+
+test_shortest_path()
+
+
+# Test cases for Part 6: Testing A* Heuristics and Landmarks
+def test_astar_heuristics():
+    # Test Case 1: UAE road network with latitude/longitude coordinates and the haversine bound
+    graph = Graph()
+    marina = Intersection(1, "Dubai Marina", (25.0805, 55.1403))
+    jbr = Intersection(2, "JBR", (25.0780, 55.1336))
+    downtown = Intersection(3, "Downtown Dubai", (25.1972, 55.2744))
+    business_bay = Intersection(4, "Business Bay", (25.1850, 55.2650))
+    for intersection in (marina, jbr, downtown, business_bay):
+        graph.add_intersection(intersection)
+    graph.add_road(marina, jbr, Road(1, "Sheikh Zayed Road", 2.0))
+    graph.add_road(jbr, downtown, Road(2, "Al Khail Road", 25.0))
+    graph.add_road(downtown, business_bay, Road(3, "Sheikh Mohammed bin Rashid Blvd", 1.5))
+    graph.add_road(business_bay, marina, Road(4, "Hessa Street", 21.0))
+    print("Test Case 1: Haversine A*", shortest_path(graph, jbr, downtown, heuristic=haversine_heuristic))
+
+    # Test Case 2: Grid with planar coordinates, Euclidean A* and ALT match dijkstra with fewer settled vertices
+    graph = Graph()
+    size = 40
+    for row in range(size):
+        for column in range(size):
+            if column + 1 < size:
+                graph.add_edge((row, column), (row, column + 1), 1 + (row * column) % 3)
+            if row + 1 < size:
+                graph.add_edge((row, column), (row + 1, column), 1 + (row + column) % 2)
+    source, target = (2, 3), (35, 30)
+    plain = shortest_path(graph, source, target)
+    euclidean = shortest_path(graph, source, target, heuristic=euclidean_heuristic)
+    landmarks = LandmarkHeuristic(graph, num_landmarks=4)
+    alt = shortest_path(graph, source, target, heuristic=landmarks)
+    print("Test Case 2: Grid A* and ALT", plain.distance == euclidean.distance == alt.distance == dijkstra(graph, source)[target],
+          f"settled dijkstra {plain.settled}, euclidean {euclidean.settled}, ALT {alt.settled}", landmarks)
+
+    # Test Case 3: Vertex without coordinates is reported clearly
+    try:
+        euclidean_heuristic(Intersection(9, "Unknown"), marina)
+    except ValueError as e:
+        print("Test Case 3: Missing Coordinates", e)
+
+
+test_astar_heuristics()
+
+
+# Test cases for Part 7: Testing Contraction Hierarchies
+def test_contraction_hierarchy():
+    # Test Case 1: UAE road network path matches shortest_path
+    graph = Graph()
+    marina, jbr, downtown, business_bay = (Intersection(1, "Dubai Marina"), Intersection(2, "JBR"),
+                                           Intersection(3, "Downtown Dubai"), Intersection(4, "Business Bay"))
+    for intersection in (marina, jbr, downtown, business_bay):
+        graph.add_intersection(intersection)
+    graph.add_road(marina, jbr, Road(1, "Sheikh Zayed Road", 2.0))
+    graph.add_road(jbr, downtown, Road(2, "Al Khail Road", 5.0))
+    graph.add_road(downtown, business_bay, Road(3, "Sheikh Mohammed bin Rashid Blvd", 1.5))
+    graph.add_road(business_bay, marina, Road(4, "Hessa Street", 3.5))
+    hierarchy = ContractionHierarchy.from_graph(graph)
+    print("Test Case 1: CH Marina to Downtown", hierarchy.shortest_path(marina, downtown).roads)
+    uae_graph, uae_hierarchy = graph, hierarchy
+
+    # Test Case 2: Grid distances match dijkstra for every target, before and after saving to disk
+    graph = Graph()
+    size = 20
+    for row in range(size):
+        for column in range(size):
+            if column + 1 < size:
+                graph.add_edge((row, column), (row, column + 1), 1 + (row * column) % 3)
+            if row + 1 < size:
+                graph.add_edge((row, column), (row + 1, column), 1 + (row + column) % 2)
+    hierarchy = ContractionHierarchy.from_graph(graph)
+    expected = dijkstra(graph, (0, 0))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hierarchy.npz")
+        hierarchy.save(path)
+        loaded = ContractionHierarchy.load(path, graph)
+    print("Test Case 2: CH Grid Distances", hierarchy,
+          all(hierarchy.distance((0, 0), vertex) == expected[vertex] for vertex in expected),
+          all(loaded.distance((0, 0), vertex) == expected[vertex] for vertex in expected))
+
+    # Test Case 3: Unpacked path uses original roads and settles few vertices
+    path = loaded.shortest_path((0, 0), (size - 1, size - 1))
+    print("Test Case 3: CH Unpacked Path", path.distance, sum(road.length for road in path.roads) == path.distance,
+          len(path.vertices) == len(path.roads) + 1, f"settled {path.settled} of {len(graph.adjacency_list)}")
+
+    # Test Case 4: A reloaded Intersection-keyed hierarchy accepts the caller's own Intersections and Roads
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "uae.npz")
+        uae_hierarchy.save(path)
+        loaded = ContractionHierarchy.load(path, uae_graph)
+    reloaded_path = loaded.shortest_path(marina, downtown)
+    print("Test Case 4: CH Reloaded Intersections", loaded.distance(marina, downtown), reloaded_path.vertices,
+          all(any(road is r for _, r in uae_graph.adjacency_list[v]) for v, road in
+              zip(reloaded_path.vertices, reloaded_path.roads)))
+
+
+test_contraction_hierarchy()
+
+
+# Test cases for Part 8: Testing the Indexed Decrease-Key Heap
+def test_indexed_heap_dijkstra():
+    # Test Case 1: IndexedHeap pops in priority order after decrease_key
+    queue = IndexedHeap()
+    for item, priority in [("A", 5), ("B", 3), ("C", 8), ("D", 1)]:
+        queue.push(item, priority)
+    queue.decrease_key("C", 0)
+    print("Test Case 1: IndexedHeap Order", [queue.pop() for _ in range(len(queue))])
+
+    # Test Case 2: Complete graph, both heaps agree and the counters show the stale pops that were skipped
+    graph = Graph()
+    size = 30
+    for i in range(size):
+        for j in range(i + 1, size):
+            graph.add_edge(i, j, abs(i - j) ** 1.5)
+    lazy_stats, indexed_stats = DijkstraStats(), DijkstraStats()
+    lazy = dijkstra(graph, 0, stats=lazy_stats)
+    indexed = dijkstra(graph, 0, heap="indexed", stats=indexed_stats)
+    print("Test Case 2: Complete Graph Heaps Agree", lazy == indexed)
+    print("  lazy:", lazy_stats)
+    print("  indexed:", indexed_stats)
+
+    # Test Case 3: Unknown heap type
+    try:
+        dijkstra(graph, 0, heap="fibonacci")
+    except ValueError as e:
+        print("Test Case 3: Unknown Heap", e)
+
+
+test_indexed_heap_dijkstra()
+
+
+# Test cases for Part 9: Testing Batch Multi-Source Dijkstra
+def test_distance_matrix():
+    graph = Graph()
+    vertices = ['A', 'B', 'C', 'D', 'E']
+    for vertex in vertices:
+        graph.add_vertex(vertex)
+    graph.add_edge('A', 'B', 1)
+    graph.add_edge('B', 'C', 2)
+    graph.add_edge('A', 'C', 4)
+    graph.add_edge('C', 'D', 1)
+    graph.add_edge('B', 'D', 5)
+
+    # Test Case 1: One-to-many matrix computed in this process
+    print("Test Case 1: Distance Matrix\n", distance_matrix(graph, ['A', 'D'], ['A', 'B', 'C', 'D', 'E'], processes=1))
+
+    # Test Case 2: Worker pool over shared memory returns the same rows as dijkstra
+    matrix = distance_matrix(graph, vertices, processes=2, chunk_size=2)
+    print("Test Case 2: Process Pool Matrix",
+          all(matrix[row].tolist() == [dijkstra(graph, source)[vertex] for vertex in vertices]
+              for row, source in enumerate(vertices)))
+
+
+test_distance_matrix()
+
+
+# Test cases for Part 10: Testing the Spatial Index for the Nearest Neighbor Heuristic
+def test_kdtree_nearest_neighbor():
+    # Test Case 1: Cluster of houses with ties gives the same route as the list scan
+    start = (0, 0)
+    houses = [(5, 5), (5, 6), (6, 5), (6, 6)]
+    print("Test Case 1: KDTree Cluster of Houses", find_nearest_neighbor(start, houses, method="kdtree"),
+          find_nearest_neighbor(start, houses, method="kdtree") == find_nearest_neighbor(start, houses[:]))
+
+    # Test Case 2: Input list is left untouched
+    print("Test Case 2: Houses Untouched", houses)
+
+    # Test Case 3: Random houses with repeated coordinates match the list scan
+    rng = np.random.default_rng(8)
+    houses = [tuple(point) for point in rng.integers(0, 50, size=(2000, 2)).tolist()]
+    print("Test Case 3: KDTree Random Houses",
+          find_nearest_neighbor((25, 25), houses, method="kdtree") == find_nearest_neighbor((25, 25), houses[:]))
+
+    # Test Case 4: No houses
+    print("Test Case 4: KDTree No Houses", find_nearest_neighbor((0, 0), [], method="kdtree"))
+
+
+test_kdtree_nearest_neighbor()
+
+
+# Test cases for Part 11: Testing Vectorized Distance Kernels
+def test_vectorized_distances():
+    # Test Case 1: One-to-many Euclidean distances match the scalar distance function
+    houses = [(1, 1), (10, 1), (1, 10), (10, 10)]
+    print("Test Case 1: Euclidean Kernel", distances_from((0, 0), houses).tolist() == [distance((0, 0), h) for h in houses])
+
+    # Test Case 2: Haversine kernel matches the scalar haversine distance
+    marina, downtown = (25.0805, 55.1403), (25.1972, 55.2744)
+    print("Test Case 2: Haversine Kernel", round(float(distances_from(marina, [downtown], "haversine")[0]), 3),
+          round(haversine_distance(marina, downtown), 3))
+
+    # Test Case 3: Matrix mode gives the same route as the list scan, with chunked blocks
+    rng = np.random.default_rng(9)
+    houses = [tuple(point) for point in rng.integers(0, 30, size=(300, 2)).tolist()]
+    matrix = DistanceMatrix([(0, 0)] + houses, chunk_size=64)
+    print("Test Case 3: Matrix Mode Route", find_nearest_neighbor((0, 0), houses, method="matrix", matrix=matrix)
+          == find_nearest_neighbor((0, 0), houses[:]), matrix)
+
+    # Test Case 4: Road distances from dijkstra instead of straight lines
+    graph = Graph()
+    graph.add_edge((0, 0), (0, 5), 5)
+    graph.add_edge((0, 5), (1, 1), 7)
+    graph.add_edge((0, 0), (4, 4), 6)
+    graph.add_edge((4, 4), (1, 1), 2)
+    houses = [(1, 1), (0, 5), (4, 4)]
+    road_matrix = DistanceMatrix.from_graph(graph, [(0, 0)] + houses)
+    print("Test Case 4: Road Distance Route", find_nearest_neighbor((0, 0), houses, method="matrix", matrix=road_matrix),
+          "vs straight line", find_nearest_neighbor((0, 0), houses[:]))
+
+    # Test Case 5: Road blocks read one at a time match the whole matrix built with one worker pool
+    grid = Graph()
+    for x in range(6):
+        for y in range(6):
+            if x < 5:
+                grid.add_edge((x, y), (x + 1, y), 1 + (x * y) % 3)
+            if y < 5:
+                grid.add_edge((x, y), (x, y + 1), 1 + (x + y) % 2)
+    locations = list(grid.adjacency_list)
+    lazy = DistanceMatrix.from_graph(grid, locations, chunk_size=8)
+    whole = DistanceMatrix.from_graph(grid, locations, chunk_size=8)
+    rows = np.vstack([lazy.row(i) for i in range(len(locations))])
+    print("Test Case 5: Road Matrix Blocks", np.array_equal(rows, whole.to_array()),
+          rows[0].tolist() == [dijkstra(grid, locations[0])[location] for location in locations])
+
+
+test_vectorized_distances()
+
+
+# Test cases for Part 12: Testing Route Improvement
+def test_route_improvement():
+    # Test Case 1: Crossing route is untangled by 2-opt
+    route = [(0, 0), (10, 10), (10, 0), (0, 10), (0, 20)]
+    print("Test Case 1: Untangle Crossing Route", improve_route(route).route)
+
+    # Test Case 2: Nearest neighbor route over random houses gets shorter and keeps every house once
+    rng = np.random.default_rng(10)
+    houses = [tuple(point) for point in rng.uniform(0, 100, size=(500, 2)).tolist()]
+    route = find_nearest_neighbor((0, 0), houses, method="kdtree")
+    result = improve_route(route)
+    print("Test Case 2: Improve Nearest Neighbor Route", result)
+    print("  same houses:", sorted(result.route) == sorted(route), "starts at depot:", result.route[0] == (0, 0))
+
+    # Test Case 3: Iteration limit and closed tours
+    print("Test Case 3: Limited Closed Tour", improve_route(route, max_iterations=10, closed=True))
+
+
+test_route_improvement()
+
+
+# Test cases for Part 13: Testing Multi-Vehicle Capacitated Routing
+def test_vehicle_routing():
+    # Test Case 1: Four houses, two vans carrying two parcels each
+    houses = [(1, 1), (10, 1), (1, 10), (10, 10)]
+    print("Test Case 1: Sweep Clusters", cluster_houses((0, 0), houses, capacity=2))
+    for vehicle_route in plan_vehicle_routes((0, 0), houses, capacity=2, processes=1):
+        print("  ", vehicle_route, vehicle_route.route)
+
+    # Test Case 2: Random houses with parcel counts, every house delivered once and no van over capacity
+    rng = np.random.default_rng(12)
+    houses = [tuple(point) for point in rng.uniform(-50, 50, size=(400, 2)).tolist()]
+    demands = rng.integers(1, 4, size=len(houses)).tolist()
+    for method in ("sweep", "kmeans"):
+        routes = plan_vehicle_routes((0, 0), houses, capacity=40, demands=demands, method=method, processes=2)
+        delivered = sorted(house for vehicle_route in routes for house in vehicle_route.route[1:])
+        print(f"Test Case 2: {method} plan", len(routes), "vans,", delivered == sorted(houses),
+              max(vehicle_route.load for vehicle_route in routes) <= 40,
+              round(sum(vehicle_route.length for vehicle_route in routes), 2))
+
+    # Test Case 3: A house that cannot fit in any van
+    try:
+        cluster_houses((0, 0), [(1, 1)], capacity=2, demands=[3])
+    except ValueError as e:
+        print("Test Case 3: Oversized Delivery", e)
+
+
+test_vehicle_routing()
+
+
+# Test cases for Part 14: Testing the Columnar Post Store
+def test_columnar_post_store():
+    store = ColumnarPostStore(capacity=2)
+    posts = [
+        Post(create_datetime("2022-10-01 10:15"), "Coffee time", "Rashed"),
+        Post(create_datetime("2022-10-01 10:00"), "Good morning!", "Ali"),
+        Post(create_datetime("2022-10-01 10:30"), "Time for work", "Jameela"),
+        Post(create_datetime("2022-10-01 10:45"), "Meeting time", "Mohamed"),
+        Post(create_datetime("2022-10-01 11:00"), "Lunch break", "Ali")
+    ]
+    for post in posts:
+        store.add_post(post)
+
+    # Test Case 1: Point lookup returns a lazily decoded Post view
+    print("Test Case 1: Columnar Point Lookup", store.find_post_by_datetime(create_datetime("2022-10-01 10:30")))
+
+    # Test Case 2: Range query after an out-of-order insert comes back sorted
+    print("Test Case 2: Columnar Range Query",
+          store.find_posts_in_range(create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 10:45")))
+
+    # Test Case 3: Missing post and the compact layout
+    print("Test Case 3: Columnar Post Not Found", store.find_post_by_datetime(create_datetime("2025-01-01 00:00")),
+          store, store.user_names)
+
+    # Test Case 4: Late posts added between queries are merged into later results in order
+    store.add_post(Post(create_datetime("2022-10-01 10:05"), "Running late", "Sarah"))
+    store.add_post(Post(create_datetime("2022-10-01 11:15"), "Back to work", "Rashed"))
+    store.add_post(Post(create_datetime("2022-10-01 10:05"), "Also late", "Jameela"))
+    print("Test Case 4: Columnar Late Posts",
+          [post.postContent for post in store.find_posts_in_range(create_datetime("2022-10-01 10:00"),
+                                                                   create_datetime("2022-10-01 10:15"))])
+
+
+test_columnar_post_store()
+
+
+# Test cases for Part 15: Testing the Multi-Valued Datetime Index
+def test_multi_valued_datetime_index():
+    # Test Case 1: Posts sharing a minute are all kept by PostManager
+    manager = PostManager()
+    dt = create_datetime("2024-04-01 12:00")
+    manager.add_post(Post(dt, "First post", "Bob"))
+    manager.add_post(Post(dt, "Second post", "Carol"))
+    print("Test Case 1: All Posts at One Datetime", manager.find_posts_by_datetime(dt))
+
+    # Test Case 2: Range query returns colliding and out-of-order posts in datetime order
+    manager = PostManagerWithRange()
+    manager.add_post(Post(create_datetime("2022-10-01 10:15"), "Coffee time", "Rashed"))
+    manager.add_post(Post(create_datetime("2022-10-01 10:15"), "Tea time", "Sarah"))
+    manager.add_post(Post(create_datetime("2022-10-01 10:30"), "Time for work", "Jameela"))
+    manager.add_post(Post(create_datetime("2022-10-01 10:00"), "Good morning!", "Ali"))
+    manager.add_post(Post(create_datetime("2022-10-01 10:15"), "Late coffee", "Mohamed"))
+    result = manager.find_posts_in_range(create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 10:15"))
+    print("Test Case 2: Range With Collisions", [post.postContent for post in result])
+
+    # Test Case 3: Empty lookups
+    print("Test Case 3: No Matches", manager.datetime_index.find(create_datetime("2025-01-01 00:00")),
+          PostManager().find_posts_by_datetime(dt))
+
+
+test_multi_valued_datetime_index()
+
+
+# Test cases for Part 16: Testing Streaming and Paginated Range Queries
+def test_paginated_range_queries():
+    manager = PostManagerWithRange()
+    for minute in (0, 15, 15, 30, 45, 5, 50):
+        manager.add_post(Post(datetime(2022, 10, 1, 10, minute), f"Post at 10:{minute:02d}", "Ali"))
+    start, end = create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 10:45")
+
+    # Test Case 1: Count without materializing posts
+    print("Test Case 1: Count Posts in Range", manager.count_posts_in_range(start, end))
+
+    # Test Case 2: Newest first with offset and limit
+    print("Test Case 2: Reverse With Offset",
+          [post.postContent for post in manager.iter_posts_in_range(start, end, reverse=True, offset=1, limit=3)])
+
+    # Test Case 3: Keyset pagination walks the whole range in pages of two, in both directions
+    for reverse in (False, True):
+        pages, cursor = [], None
+        while True:
+            posts, cursor = manager.page_posts_in_range(start, end, 2, cursor, reverse)
+            pages.append([post.postContent[-5:] for post in posts])
+            if cursor is None:
+                break
+        print(f"Test Case 3: Keyset Pages (reverse={reverse})", pages)
+
+
+test_paginated_range_queries()
+
+
+# Test cases for Part 17: Testing Time-Bucket Rollups
+def test_post_rollups():
+    manager = PostManagerWithRange(rollups=PostRollups())
+    posts = [
+        Post(create_datetime("2022-10-01 10:00"), "Good morning!", "Ali"),
+        Post(create_datetime("2022-10-01 10:15"), "Coffee time", "Rashed"),
+        Post(create_datetime("2022-10-01 10:15"), "Tea time", "Ali"),
+        Post(create_datetime("2022-10-01 11:30"), "Lunch soon", "Ali"),
+        Post(create_datetime("2022-09-30 23:45"), "Late night", "Sarah"),
+        Post(create_datetime("2022-10-02 09:00"), "Next day", "Rashed")
+    ]
+    for post in posts:
+        manager.add_post(post)
+    rollups = manager.rollups
+
+    # Test Case 1: Counts over arbitrary ranges agree with the range query
+    start, end = create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 11:30")
+    print("Test Case 1: Rollup Count", rollups.count(start, end), len(manager.find_posts_in_range(start, end)))
+
+    # Test Case 2: Hourly histogram for one user
+    print("Test Case 2: Hourly Histogram for Ali", rollups.histogram(start, end, "hour", user="Ali"))
+
+    # Test Case 3: Daily histogram by user, including a post before the first bucket seen
+    print("Test Case 3: Daily Histogram by User",
+          rollups.histogram_by_user(create_datetime("2022-09-30 00:00"), create_datetime("2022-10-02 00:00"), "day"))
+
+    # Test Case 4: Per-user counters only store non-empty buckets, however far apart the posts are
+    manager.add_post(Post(create_datetime("2022-10-31 10:00"), "A month later", "Sarah"))
+    print("Test Case 4: Sparse User Buckets", len(rollups.by_user["minute"]["Sarah"].counts),
+          rollups.count(create_datetime("2022-09-30 00:00"), create_datetime("2022-10-31 23:59"), "minute", "Sarah"))
+
+
+test_post_rollups()
+
+
+# Test cases for Part 18: Testing Live View Counts in PostManagerWithPriority
+def test_live_view_counts():
+    manager = PostManagerWithPriority()
+    for post, views in [("Post 1: Introduction to Python", 250), ("Post 2: Advanced Python", 150),
+                        ("Post 3: Python Tips and Tricks", 300), ("Post 4: New Python Features", 0)]:
+        manager.add_post(post, views)
+
+    # Test Case 1: Top 3 posts
+    print("Test Case 1: Top 3", manager.top_k(3))
+
+    # Test Case 2: A view burst moves a post to the top, and removal drops it again
+    manager.increment_views("Post 4: New Python Features", 400)
+    print("Test Case 2: After View Burst", manager.get_most_viewed_post())
+    manager.remove_post("Post 4: New Python Features")
+    print("Test Case 2: After Removal", manager.get_most_viewed_post(), manager.remove_post("Post 9: Missing"))
+
+    # Test Case 3: Trending mode with a one-hour half-life; recent views outweigh older ones
+    trending = PostManagerWithPriority(half_life=3600)
+    trending.increment_views("Old favourite", 100, at=0)
+    trending.increment_views("New hit", 60, at=3 * 3600)
+    print("Test Case 3: Trending After Three Hours",
+          [(round(-entry.views, 1), entry.post) for entry in trending.top_k(2, at=3 * 3600)])
+
+
+test_live_view_counts()
+
+
+# Test cases for Part 19: Testing Approximate Heavy-Hitter View Tracking
+def test_approximate_views():
+    # Test Case 1: Skewed replay, the sketch finds the same top 10 as the exact heap
+    rng = np.random.default_rng(17)
+    post_ids = rng.zipf(1.3, size=20_000)
+    events = [(f"Post {post_id}", 1) for post_id in post_ids.tolist()]
+    print("Test Case 1: Sketch vs Exact Top 10", compare_top_k(events, k=10, epsilon=0.01, delta=0.01, capacity=50))
+
+    # Test Case 2: Two shards merged give the same estimates as one sketch over all views
+    left, right, whole = (PostManagerWithSketch(epsilon=0.01, capacity=20) for _ in range(3))
+    for i, (post, views) in enumerate(events[:5000]):
+        (left if i % 2 else right).increment_views(post, views)
+        whole.increment_views(post, views)
+    left.merge(right)
+    print("Test Case 2: Merged Shards", left.get_most_viewed_post(), "|", whole.get_most_viewed_post(),
+          left.sketch.estimate("Post 1") == whole.sketch.estimate("Post 1"))
+
+    # Test Case 3: Sketches with different settings cannot be merged
+    try:
+        PostManagerWithSketch(epsilon=0.01).merge(PostManagerWithSketch(epsilon=0.1))
+    except ValueError as e:
+        print("Test Case 3: Incompatible Sketches", e)
+
+    # Test Case 4: The same Post objects viewed on two shards merge into one entry with all of its views
+    posts = [Post(create_datetime("2022-10-01 10:00"), "Good morning!", "Ali"),
+             Post(create_datetime("2022-10-01 10:15"), "Coffee time", "Rashed"),
+             Post(create_datetime("2022-10-01 10:30"), "Time for work", "Jameela")]
+    left, right = PostManagerWithSketch(epsilon=0.01, capacity=5), PostManagerWithSketch(epsilon=0.01, capacity=5)
+    for i in range(30):
+        (left if i % 2 else right).increment_views(posts[i % 3], i % 3 + 1)
+    left.merge(right)
+    print("Test Case 4: Merged Post Objects", [(entry.post.postContent, -entry.views) for entry in left.top_k(5)])
+
+
+test_approximate_views()
+
+
+# Test cases for Part 20: Testing Vectorized Datetime Parsing
+def test_datetime_parsing():
+    # Test Case 1: Fast path and strptime fallback agree
+    print("Test Case 1: Fast Path", create_datetime("2024-04-01 12:00"), create_datetime("2024-4-1 12:00"))
+
+    # Test Case 2: Malformed strings still raise ValueError
+    try:
+        create_datetime("2024-13-01 12:00")
+    except ValueError as e:
+        print("Test Case 2: Invalid Month", e)
+
+    # Test Case 3: Vectorized parser feeds the columnar store in bulk
+    store = ColumnarPostStore()
+    store.add_batch(["2022-10-01 10:15", "2022-10-01 10:00", "2022-10-01 10:30"],
+                    ["Coffee time", "Good morning!", "Time for work"], ["Rashed", "Ali", "Jameela"])
+    print("Test Case 3: Bulk Store Load",
+          store.find_posts_in_range(create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 10:15")))
+
+    # Test Case 4: Throughput against strptime
+    print("Test Case 4: Parsing Benchmark")
+    print("  results match strptime:", benchmark_datetime_parsing(20_000)[1])
+
+
+test_datetime_parsing()
+
+
+# Test cases for Part 21: Testing the Persistent Post Index
+def test_persistent_post_index():
+    with tempfile.TemporaryDirectory() as directory:
+        manager = PersistentPostManager(directory, segment_size=3)
+        posts = [
+            Post(create_datetime("2022-10-01 10:15"), "Coffee time", "Rashed"),
+            Post(create_datetime("2022-10-01 10:00"), "Good morning!", "Ali"),
+            Post(create_datetime("2022-10-01 10:30"), "Time for work", "Jameela"),
+            Post(create_datetime("2022-10-01 10:45"), "Meeting time", "Mohamed"),
+            Post(create_datetime("2022-10-01 10:15"), "Tea time", "Sarah")
+        ]
+        for post in posts:
+            manager.add_post(post)
+        manager.close()
+
+        # Test Case 1: Reopen from disk: one mapped segment plus two posts replayed from the log
+        started = time.perf_counter()
+        manager = PersistentPostManager(directory, segment_size=3)
+        reopen_ms = (time.perf_counter() - started) * 1000
+        print("Test Case 1: Reopened Index", len(manager.segments), "segment(s),", len(manager.buffer), "buffered,",
+              len(manager), "posts", "in under 100 ms:", reopen_ms < 100)
+
+        # Test Case 2: Range query merges the segment and the buffer
+        result = manager.find_posts_in_range(create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 10:30"))
+        print("Test Case 2: Persistent Range Query", [post.postContent for post in result])
+
+        # Test Case 3: Point lookup, count and missing post
+        print("Test Case 3: Persistent Lookups", manager.find_post_by_datetime(create_datetime("2022-10-01 10:45")),
+              manager.count_posts_in_range(create_datetime("2022-10-01 10:15"), create_datetime("2022-10-01 10:15")),
+              manager.find_post_by_datetime(create_datetime("2025-01-01 00:00")))
+        manager.close()
+
+    # Test Case 4: A torn last log line is cut off, so posts added after recovery survive the next restart
+    with tempfile.TemporaryDirectory() as directory:
+        manager = PersistentPostManager(directory)
+        manager.add_post(posts[0])
+        manager.close()
+        with open(os.path.join(directory, "wal.log"), "a") as file:
+            file.write('[1664619300, 1, "Half wri')
+        manager = PersistentPostManager(directory)
+        manager.add_post(posts[1])
+        manager.add_post(posts[2])
+        manager.close()
+        manager = PersistentPostManager(directory)
+        print("Test Case 4: Torn Log Recovery", len(manager),
+              [post.postContent for post in manager.find_posts_in_range(create_datetime("2022-10-01 00:00"),
+                                                                        create_datetime("2022-10-02 00:00"))])
+        manager.close()
+
+    # Test Case 5: A crash after the manifest is written but before the log is emptied does not duplicate posts
+    with tempfile.TemporaryDirectory() as directory:
+        manager = PersistentPostManager(directory)
+        manager.add_post(posts[0])
+        manager.add_post(posts[1])
+        with open(os.path.join(directory, "wal.log")) as file:
+            stale_log = file.read()
+        manager.flush()
+        manager.close()
+        with open(os.path.join(directory, "wal.log"), "w") as file:
+            file.write(stale_log)
+        manager = PersistentPostManager(directory)
+        manager.add_post(posts[2])
+        print("Test Case 5: Flushed Posts Not Replayed", len(manager), len(manager.buffer))
+        manager.close()
+
+
+test_persistent_post_index()
+
+
+# Test cases for Part 22: Testing the Sharded Post Manager
+def test_sharded_post_manager():
+    manager = ShardedPostManager(num_shards=4)
+    manager.add_post(Post(create_datetime("2022-10-01 10:15"), "Coffee time", "Rashed"))
+    manager.add_posts([
+        Post(create_datetime("2022-10-01 10:00"), "Good morning!", "Ali"),
+        Post(create_datetime("2022-10-01 10:30"), "Time for work", "Jameela"),
+        Post(create_datetime("2022-10-01 10:45"), "Meeting time", "Mohamed"),
+        Post(create_datetime("2022-10-01 10:15"), "Tea time", "Sarah")
+    ])
+
+    # Test Case 1: Range query merged across shards, posts sharing a datetime kept in arrival order
+    result = manager.find_posts_in_range(create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 10:30"))
+    print("Test Case 1: Sharded Range Query", [post.postContent for post in result])
+
+    # Test Case 2: Limit, count and point lookup
+    print("Test Case 2: Sharded Lookups",
+          [post.postContent for post in manager.find_posts_in_range(create_datetime("2022-10-01 10:00"),
+                                                                    create_datetime("2022-10-01 11:00"), limit=2)],
+          manager.count_posts_in_range(create_datetime("2022-10-01 10:00"), create_datetime("2022-10-01 11:00")),
+          manager.find_post_by_datetime(create_datetime("2025-01-01 00:00")))
+
+    # Test Case 3: Concurrent writers and readers lose no posts
+    concurrent = ShardedPostManager(num_shards=4, partition="time")
+    start = create_datetime("2022-10-01 00:00")
+    posts = [Post(start + timedelta(minutes=i), f"post {i}", f"user{i % 7}") for i in range(4000)]
+    writers = [threading.Thread(target=concurrent.add_posts, args=(posts[i::4],)) for i in range(4)]
+    readers = [threading.Thread(target=concurrent.find_posts_in_range, args=(start, start + timedelta(days=3)))
+               for _ in range(4)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers + readers:
+        thread.join()
+    merged = concurrent.find_posts_in_range(start, start + timedelta(days=3))
+    print("Test Case 3: Concurrent Ingest", len(merged),
+          [post.postDatetime for post in merged] == [post.postDatetime for post in posts])
+
+    # Test Case 4: A shard index stays in (datetime, sequence) order when a lower sequence arrives second
+    index = DatetimeIndex()
+    index.add(start, "b", 5)
+    index.add(start, "a", 3)
+    print("Test Case 4: Late Sequence", [value for _, value in index.iter_range(start, start)],
+          index.keys == sorted(index.keys))
+
+
+test_sharded_post_manager()
+
+
+# Test cases for Part 23: Testing Per-User Timelines and Feeds
+def test_user_feed():
+    manager = PostManagerWithRange()
+    for date, content, user in [("2022-10-01 10:00", "Good morning!", "Ali"),
+                                ("2022-10-01 10:15", "Coffee time", "Rashed"),
+                                ("2022-10-01 10:30", "Time for work", "Ali"),
+                                ("2022-10-01 10:15", "Tea time", "Sarah"),
+                                ("2022-10-01 10:45", "Meeting time", "Mohamed"),
+                                ("2022-10-01 09:50", "Early start", "Sarah")]:
+        manager.add_post(Post(create_datetime(date), content, user))
+
+    # Test Case 1: One user's timeline, oldest first
+    print("Test Case 1: Posts by Ali", [post.postContent for post in manager.find_posts_by_user("Ali")])
+
+    # Test Case 2: Newest three posts by the followed users
+    feed = manager.feed(["Ali", "Sarah", "Rashed"], 3)
+    print("Test Case 2: Feed", [post.postContent for post in feed])
+
+    # Test Case 3: Feed limited to a window, and a feed of unknown users
+    print("Test Case 3: Windowed Feed",
+          [post.postContent for post in manager.feed(["Ali", "Sarah"], 10, create_datetime("2022-10-01 10:00"),
+                                                     create_datetime("2022-10-01 10:15"))],
+          manager.feed(["Nobody"], 5))
+
+
+test_user_feed()
+
+
+# Test cases for Part 24: Testing Dynamic Graph Updates
+def test_dynamic_graph_updates():
+    graph = Graph()
+    graph.add_edge('A', 'B', 1)
+    graph.add_edge('B', 'C', 2)
+    graph.add_edge('A', 'C', 5)
+    graph.add_edge('C', 'D', 1)
+    graph.add_edge('D', 'E', 3)
+    tree = ShortestPathTree(graph, 'A')
+
+    # Test Case 1: Road closure on the shortest path is repaired from the change log
+    graph.remove_road('B', 'C')
+    settled = tree.refresh()
+    print("Test Case 1: Road Closure", tree.distances, tree.distances == dijkstra(graph, 'A'), "re-settled", settled)
+
+    # Test Case 2: Traffic makes a road shorter
+    graph.update_road_length('A', 'C', 1.5)
+    tree.refresh()
+    print("Test Case 2: Shorter Road", tree.distances, tree.distances == dijkstra(graph, 'A'))
+
+    # Test Case 3: New road and new vertex, read back as a path
+    graph.add_edge('A', 'E', 2)
+    graph.add_vertex('F')
+    print("Test Case 3: New Road", tree.shortest_path('E'), tree.distances == dijkstra(graph, 'A'))
+
+    # Test Case 4: Change log and missing road
+    print("Test Case 4: Change Log", graph.version, graph.changes[-3:])
+    try:
+        graph.remove_road('A', 'F')
+    except KeyError as e:
+        print("Caught an error as expected when removing a missing road:", e)
+
+    # Test Case 5: Edges added in bulk go through the change log, so the tree and a cache both see them
+    bulk = Graph()
+    bulk.add_edge(1, 2, 5.0)
+    bulk_tree, cache = ShortestPathTree(bulk, 1), DijkstraCache(bulk)
+    cache.dijkstra(1)
+    add_edge_batch(bulk, np.array([1, 3]), np.array([3, 2]), np.array([1.0, 1.0]))
+    print("Test Case 5: Bulk Edges", bulk.version, "re-settled", bulk_tree.refresh(), bulk_tree.distances,
+          dict(cache.dijkstra(1)) == dijkstra(bulk, 1))
+
+    # Test Case 6: The change log stays bounded; a tree that falls behind it is rebuilt from scratch
+    bounded = Graph(max_changes=4)
+    for i in range(5):
+        bounded.add_edge(i, i + 1, 1)
+    bounded_tree = ShortestPathTree(bounded, 0)
+    for i in range(5):
+        bounded.update_road_length(i, i + 1, 2)
+    print("Test Case 6: Bounded Change Log", len(bounded.changes), bounded.changes_since(0),
+          "re-settled", bounded_tree.refresh(), bounded_tree.distances == dijkstra(bounded, 0))
+
+
+test_dynamic_graph_updates()
+
+
+# Test cases for Part 25: Testing the Dijkstra Cache
+def test_dijkstra_cache():
+    graph = Graph()
+    graph.add_edge('A', 'B', 1)
+    graph.add_edge('B', 'C', 2)
+    graph.add_edge('A', 'C', 4)
+    cache = DijkstraCache(graph, max_entries=2)
+
+    # Test Case 1: Repeated source is answered from the cache
+    first = cache.dijkstra('A')
+    print("Test Case 1: Cached Distances", dict(cache.dijkstra('A')), first is cache.dijkstra('A'), cache.stats)
+
+    # Test Case 2: Graph change invalidates the cache
+    graph.add_edge('C', 'D', 1)
+    print("Test Case 2: After add_edge", dict(cache.dijkstra('A')), cache.stats)
+
+    # Test Case 3: LRU eviction and point-to-point distances
+    cache.dijkstra('B')
+    cache.shortest_path('D', 'A')
+    print("Test Case 3: LRU Eviction", list(cache.entries), cache.distance('B', 'D'), cache.stats)
+
+    # Test Case 4: Entries expire after the TTL
+    now = [0.0]
+    cache = DijkstraCache(graph, ttl=10, clock=lambda: now[0])
+    cache.dijkstra('A')
+    now[0] = 11.0
+    cache.dijkstra('A')
+    print("Test Case 4: TTL Expiry", cache.stats, "hit rate", cache.stats.hit_rate())
+
+    # Test Case 5: The size of a cached distance table counts the dict behind the read-only view
+    distances = cache.dijkstra('A')
+    print("Test Case 5: Entry Size Covers the Dict", cache.size >= sys.getsizeof(dict(distances)))
+
+
+test_dijkstra_cache()
+
+
+# Test cases for Part 26: Testing the Benchmark Suite
+def test_benchmark_suite():
+    # Test Case 1: Generators are reproducible for a fixed seed
+    frm, to, lengths, points = random_geometric_edges(500, 6, seed=1)
+    print("Test Case 1: Seeded Generators",
+          np.array_equal(frm, random_geometric_edges(500, 6, seed=1)[0]),
+          len(grid_edges(10, 10)[0]), "grid edges,",
+          bool(np.all(lengths <= math.sqrt(6 / (math.pi * 500)))),
+          generate_clustered_stops(3, seed=1) == generate_clustered_stops(3, seed=1))
+
+    # Test Case 2: Post streams contain shared datetimes and late posts
+    posts = generate_post_stream(1000, seed=1)
+    datetimes = [post.postDatetime for post in posts]
+    print("Test Case 2: Post Stream", len(posts), "posts,", len(set(datetimes)) < len(posts),
+          any(later < earlier for earlier, later in zip(datetimes, datetimes[1:])))
+
+    # Test Case 3: Small suite written as JSON and compared with itself
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmarks.json")
+        report = run_benchmarks(graph_sizes=(200,), post_counts=(500,), stop_counts=(100,), repeat=1, path=path,
+                                verbose=False)
+        with open(path) as file:
+            saved = json.load(file)
+        print("Test Case 3: Benchmark Report", len(report["results"]), "results,",
+              saved["results"] == report["results"], compare_benchmarks(path, report))
+
+    # Test Case 4: A result twice as slow as its baseline is returned as a regression for the caller to report
+    slower = {"results": [dict(report["results"][0], seconds=2 * report["results"][0]["seconds"])]}
+    for group, name, generator, size, before, after in compare_benchmarks(report, slower):
+        print("Test Case 4: Benchmark Regression", group, name, generator, size, round(after / before, 1))
+
+
+test_benchmark_suite()
+
+
+# Test cases for Part 27: Testing Import Side Effects and Instrumentation
+def test_instrumentation():
+    # Test Case 1: Importing the package runs nothing; a name only loads the submodules it needs
+    here = os.path.dirname(os.path.abspath(__file__))
+    for statement in ("import optimization", "from optimization import Post"):
+        check = f"import sys; {statement}; print(sorted(m for m in sys.modules if m.startswith('optimization')), 'numpy' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, cwd=here)
+        print(f"Test Case 1: {statement!r} loads", result.stdout.strip())
+
+    graph = Graph()
+    graph.add_edge('A', 'B', 1)
+    graph.add_edge('B', 'C', 2)
+    graph.add_edge('A', 'C', 4)
+    manager = PostManagerWithRange()
+
+    # Test Case 2: Counters and timings are collected while enabled
+    instrumentation.reset()
+    instrumentation.enable()
+    dijkstra(graph, 'A')
+    dijkstra(graph, 'A', heap="indexed")
+    find_nearest_neighbor((0, 0), [(1, 1), (10, 1), (1, 10)])
+    manager.add_post(Post(create_datetime("2022-10-01 10:00"), "Good morning!", "Ali"))
+    manager.find_posts_in_range(create_datetime("2022-10-01 09:00"), create_datetime("2022-10-01 11:00"))
+    instrumentation.disable()
+    print("Test Case 2: Counters", instrumentation.counters)
+    print("Test Case 2: Timed Calls", {name: histogram.count for name, histogram in instrumentation.timings.items()})
+
+    # Test Case 3: Nothing is recorded once disabled, and the plain methods are back in place
+    dijkstra(graph, 'A')
+    manager.add_post(Post(create_datetime("2022-10-01 10:15"), "Coffee time", "Rashed"))
+    print("Test Case 3: Disabled", instrumentation.timings["dijkstra"].count,
+          instrumentation.timings["PostManagerWithRange.add_post"].count,
+          hasattr(PostManagerWithRange.add_post, "__wrapped__"))
+
+
+test_instrumentation()
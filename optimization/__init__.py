@@ -0,0 +1,53 @@
+"""Social media post indexing and delivery route optimization.
+
+Importing the package does no work: every name below is loaded from its submodule the first time it is used, so
+``from optimization import Post`` never imports NumPy or the routing code.
+"""
+
+import importlib
+
+# Submodule that defines each public name.
+_EXPORTS = {
+    "posts": ("create_datetime", "Post", "PostManager", "PostManagerWithRange", "PostWithViews",
+              "PostManagerWithPriority", "EPOCH", "datetime_to_epoch", "epoch_to_datetime", "DatetimeIndex",
+              "UserTimelineIndex"),
+    "post_storage": ("PostView", "ColumnarPostStore", "parse_datetimes_to_epoch", "benchmark_datetime_parsing",
+                     "PostSegment", "PersistentPostManager"),
+    "post_analytics": ("FenwickTree", "BucketCounter", "SparseBucketCounter", "PostRollups", "MERSENNE_PRIME",
+                       "stable_hash", "post_key", "CountMinSketch", "SpaceSaving", "PostManagerWithSketch",
+                       "compare_top_k"),
+    "post_sharding": ("ReadWriteLock", "ShardedPostManager", "benchmark_sharded_posts"),
+    "graph": ("Intersection", "Road", "Graph", "GraphChange"),
+    "csr": ("CSRGraph", "csr_dijkstra_array", "csr_dijkstra", "EDGE_DTYPE", "read_edge_chunks", "add_edge_batch",
+            "load_edge_list", "load_csr_edge_list", "benchmark_edge_list_loading"),
+    "heaps": ("DijkstraStats", "IndexedHeap"),
+    "shortest_paths": ("dijkstra", "ShortestPath", "shortest_path", "EARTH_RADIUS_KM", "vertex_coordinates",
+                       "haversine_distance", "euclidean_heuristic", "haversine_heuristic", "LandmarkHeuristic",
+                       "ShortestPathTree", "CacheStats", "DijkstraCache"),
+    "contraction": ("ContractionHierarchy",),
+    "multi_source": ("distance_matrix",),
+    "routing": ("distance", "find_nearest_neighbor", "KDTree"),
+    "vectorized": ("distances_from", "pairwise_distances", "DistanceMatrix"),
+    "route_improvement": ("route_length", "RouteImprovement", "nearest_neighbor_lists", "improve_route"),
+    "vehicle_routing": ("VehicleRoute", "cluster_houses", "plan_vehicle_routes"),
+    "benchmarks": ("grid_edges", "random_geometric_edges", "generate_post_stream", "generate_clustered_stops",
+                   "run_benchmarks", "compare_benchmarks"),
+    "telemetry": ("TimingHistogram", "Instrumentation", "instrumentation", "instrumented", "instrumented_method"),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name):
+    # Called only for names not loaded yet: imports the defining submodule and caches the name on the package.
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
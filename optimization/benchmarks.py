@@ -0,0 +1,230 @@
+"""Seeded generators for graphs, post streams and delivery stops, and a benchmark harness over them."""
+
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+from datetime import timedelta
+
+import numpy as np
+
+from .csr import CSRGraph, add_edge_batch
+from .graph import Graph
+from .post_sharding import ShardedPostManager
+from .posts import (Post, PostManager, PostManagerWithPriority, PostManagerWithRange, create_datetime,
+                    datetime_to_epoch, epoch_to_datetime)
+from .routing import find_nearest_neighbor
+from .shortest_paths import dijkstra
+
+
+# Code for Part 26: Reproducible Benchmark Suite
+# Function to generate a rows x cols grid road network as edge arrays; vertex r * cols + c sits at row r, column c.
+def grid_edges(rows, cols, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows * cols).reshape(rows, cols)
+    frm = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    to = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    lengths = np.round(rng.uniform(0.1, 1.0, len(frm)), 3)
+    return frm, to, lengths
+
+
+# Function to generate a random geometric road network: points uniform in the unit square, joined by a road
+# whenever they are within the radius that gives the requested average degree. Returns (frm, to, lengths, points).
+# Points are bucketed into cells at least one radius wide, so only pairs in the same or adjacent cells are tested.
+def random_geometric_edges(num_vertices, average_degree=6, seed=0):
+    rng = np.random.default_rng(seed)
+    points = rng.random((num_vertices, 2))
+    radius = math.sqrt(average_degree / (math.pi * num_vertices))
+    cells_per_side = max(1, int(1 / radius))
+    cell_xy = (points * cells_per_side).astype(np.int64)
+    cells = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+    order = np.argsort(cells, kind="stable")
+    starts = np.searchsorted(cells[order], np.arange(cells_per_side ** 2 + 1))
+    counts = np.diff(starts)
+    x, y = cell_xy[order, 0], cell_xy[order, 1]
+    positions = np.arange(num_vertices)
+
+    frm_parts, to_parts, length_parts = [], [], []
+    # Half of the eight neighbor offsets plus the cell itself, so every pair of cells is visited once.
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        valid = (x + dx < cells_per_side) & (y + dy >= 0) & (y + dy < cells_per_side)
+        own = positions[valid]
+        neighbor_cells = (x + dx) * cells_per_side + (y + dy)
+        first, count = starts[neighbor_cells[valid]], counts[neighbor_cells[valid]]
+        # Pair every point with the k-th point of the neighboring cell, for every k at once.
+        for k in range(int(count.max()) if len(count) else 0):
+            keep = k < count
+            a, b = own[keep], first[keep] + k
+            if dx == dy == 0:
+                a, b = a[b > a], b[b > a]
+            lengths = np.sqrt(np.sum((points[order[a]] - points[order[b]]) ** 2, axis=1))
+            close = lengths <= radius
+            frm_parts.append(order[a[close]])
+            to_parts.append(order[b[close]])
+            length_parts.append(lengths[close])
+    return (np.concatenate(frm_parts), np.concatenate(to_parts), np.concatenate(length_parts), points)
+
+
+# Function to generate a stream of posts shaped like real traffic: several posts per minute, so many share a
+# datetime, a few arriving late and out of order, and users following a Zipf distribution.
+def generate_post_stream(count, seed=0, num_users=1000, posts_per_minute=5.0, late_fraction=0.02,
+                         start="2022-01-01 00:00"):
+    rng = np.random.default_rng(seed)
+    minutes = np.sort(rng.integers(0, max(1, int(count / posts_per_minute)), count))
+    late = rng.random(count) < late_fraction
+    minutes[late] = np.maximum(minutes[late] - rng.integers(1, 60, int(late.sum())), 0)
+    users = (rng.zipf(1.5, count) - 1) % num_users
+    start_epoch = datetime_to_epoch(create_datetime(start))
+    return [Post(epoch_to_datetime(start_epoch + 60 * minute), f"post {i}", f"user{user}")
+            for i, (minute, user) in enumerate(zip(minutes.tolist(), users.tolist()))]
+
+
+# Function to generate delivery stops gathered around a few neighborhoods in an extent x extent area.
+def generate_clustered_stops(count, num_clusters=10, spread=2.0, extent=100.0, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, extent, (num_clusters, 2))
+    labels = rng.integers(0, num_clusters, count)
+    points = np.clip(centers[labels] + rng.normal(0, spread, (count, 2)), 0, extent)
+    return [tuple(point) for point in points.tolist()]
+
+
+# Function to time a benchmark: the best wall time of repeat runs, then one extra run under tracemalloc for the
+# peak bytes allocated during the call. Returns (seconds, peak_bytes).
+def _measure(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        function()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return min(times), peak
+
+
+# Runs the benchmark suite and returns its results as a JSON-ready dict, also written to path when given.
+# graph_sizes are approximate edge counts for both generators; Graph objects are only built up to
+# graph_object_limit edges, larger graphs are benchmarked as CSRGraph only. The list scan of the nearest
+# neighbor heuristic is quadratic and is skipped above scan_limit stops. verbose=False stops the per-line output.
+def run_benchmarks(graph_sizes=(1_000, 10_000), post_counts=(10_000,), stop_counts=(1_000,), repeat=3, seed=0,
+                   path=None, graph_object_limit=1_000_000, scan_limit=5_000, verbose=True):
+    results = []
+
+    def record(group, name, generator, size, function):
+        seconds, peak = _measure(function, repeat)
+        results.append({"group": group, "name": name, "generator": generator, "size": size,
+                        "seconds": seconds, "peak_bytes": peak})
+        if verbose:
+            print(f"{group:6} {name:45} {generator:10} {size:>10,}: {seconds * 1000:10.2f} ms {peak / 2 ** 20:9.2f} MiB")
+
+    for size in graph_sizes:
+        side = max(2, int(math.sqrt(size / 2)))
+        generators = {"grid": grid_edges(side, side, seed),
+                      "geometric": random_geometric_edges(max(2, size // 3), 6, seed)[:3]}
+        for generator, (frm, to, lengths) in generators.items():
+            edges = len(frm)
+            csr = CSRGraph.from_edge_arrays(frm, to, lengths)
+            # The best-connected vertex, so the search starts inside the giant component of a geometric graph.
+            source = csr.vertices[int(np.argmax(np.diff(csr.offsets)))]
+            record("graph", "CSRGraph.from_edge_arrays", generator, edges,
+                   lambda: CSRGraph.from_edge_arrays(frm, to, lengths))
+            record("graph", "dijkstra (CSR)", generator, edges, lambda: dijkstra(csr, source))
+            if edges <= graph_object_limit:
+                graph = Graph()
+                add_edge_batch(graph, frm, to, lengths)
+                record("graph", "add_edge_batch", generator, edges, lambda: add_edge_batch(Graph(), frm, to, lengths))
+                record("graph", "dijkstra (lazy heap)", generator, edges, lambda: dijkstra(graph, source))
+                record("graph", "dijkstra (indexed heap)", generator, edges,
+                       lambda: dijkstra(graph, source, heap="indexed"))
+
+    for count in stop_counts:
+        stops = generate_clustered_stops(count + 1, seed=seed)
+        start, houses = stops[0], stops[1:]
+        record("route", "find_nearest_neighbor (kdtree)", "clustered", count,
+               lambda: find_nearest_neighbor(start, houses, method="kdtree"))
+        if count <= scan_limit:
+            # The list scan removes the houses it visits, so every run gets a fresh copy.
+            record("route", "find_nearest_neighbor (scan)", "clustered", count,
+                   lambda: find_nearest_neighbor(start, list(houses)))
+
+    for count in post_counts:
+        posts = generate_post_stream(count, seed)
+        rng = np.random.default_rng(seed)
+        lookups = [posts[i].postDatetime for i in rng.integers(0, count, 1000)]
+        windows = [(value, value + timedelta(hours=1)) for value in lookups[:100]]
+        users = [f"user{i}" for i in range(500)]
+
+        def fill(manager):
+            for post in posts:
+                manager.add_post(post)
+            return manager
+
+        for name, factory in (("PostManager", PostManager), ("PostManagerWithRange", PostManagerWithRange),
+                              ("ShardedPostManager", ShardedPostManager)):
+            manager = fill(factory())
+            record("posts", f"{name}.add_post", "stream", count, lambda: fill(factory()))
+            if hasattr(manager, "find_post_by_datetime"):
+                record("posts", f"{name}.find_post_by_datetime", "stream", count,
+                       lambda: [manager.find_post_by_datetime(value) for value in lookups])
+            if hasattr(manager, "find_posts_in_range"):
+                record("posts", f"{name}.find_posts_in_range", "stream", count,
+                       lambda: [manager.find_posts_in_range(*window) for window in windows])
+                record("posts", f"{name}.count_posts_in_range", "stream", count,
+                       lambda: [manager.count_posts_in_range(*window) for window in windows])
+            if hasattr(manager, "feed"):
+                record("posts", f"{name}.feed", "stream", count, lambda: [manager.feed(users, 50) for _ in range(10)])
+
+        views = rng.integers(0, 10_000, count).tolist()
+        increments = [posts[i] for i in rng.integers(0, count, 1000)]
+        priority_manager = PostManagerWithPriority()
+        for post, view in zip(posts, views):
+            priority_manager.add_post(post, view)
+
+        def fill_priority():
+            manager = PostManagerWithPriority()
+            for post, view in zip(posts, views):
+                manager.add_post(post, view)
+
+        record("posts", "PostManagerWithPriority.add_post", "stream", count, fill_priority)
+        record("posts", "PostManagerWithPriority.increment_views", "stream", count,
+               lambda: [priority_manager.increment_views(post) for post in increments])
+        record("posts", "PostManagerWithPriority.get_most_viewed_post", "stream", count,
+               lambda: [priority_manager.get_most_viewed_post() for _ in range(1000)])
+        record("posts", "PostManagerWithPriority.top_k", "stream", count, lambda: priority_manager.top_k(100))
+
+    report = {"meta": {"seed": seed, "repeat": repeat, "python": platform.python_version(),
+                       "numpy": np.__version__, "platform": platform.platform()},
+              "results": results}
+    if path is not None:
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+# Function to compare two benchmark reports (dicts or paths to the JSON files). Returns the benchmarks that got
+# slower by more than the tolerance, as (group, name, generator, size, baseline seconds, current seconds); nothing
+# is printed, so callers decide how to report them.
+def compare_benchmarks(baseline, current, tolerance=0.10):
+    reports = []
+    for report in (baseline, current):
+        if isinstance(report, (str, os.PathLike)):
+            with open(report) as file:
+                report = json.load(file)
+        reports.append({(r["group"], r["name"], r["generator"], r["size"]): r["seconds"] for r in report["results"]})
+    before, after = reports
+    regressions = []
+    for key, seconds in after.items():
+        if key in before and seconds > before[key] * (1 + tolerance):
+            regressions.append(key + (before[key], seconds))
+    return regressions
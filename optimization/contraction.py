@@ -0,0 +1,249 @@
+"""Contraction hierarchies for fast repeated point-to-point queries."""
+
+import heapq
+
+import numpy as np
+
+from .csr import _id_dtype
+from .shortest_paths import ShortestPath
+
+
+# Code for Part 7: Contraction Hierarchies
+class ContractionHierarchy:
+    """Contraction hierarchy over a Graph for fast repeated distance and path queries.
+
+    Vertices are contracted one at a time from least to most important. Contracting a vertex adds a shortcut between
+    two of its remaining neighbors whenever the only shortest path between them ran through it. Queries then search
+    upward from both ends and only ever follow edges towards more important vertices.
+
+    Attributes:
+        vertices (list): Maps each integer vertex id back to the original vertex object.
+        vertex_ids (dict): Maps each original vertex object to its integer id.
+        rank (np.ndarray): Position of every vertex id in the contraction order.
+        offsets (np.ndarray): CSR offsets of the upward graph, which only keeps edges to higher ranked vertices.
+        targets (np.ndarray): Upward neighbor id of every edge.
+        weights (np.ndarray): Length of every upward edge.
+        middles (np.ndarray): Contracted vertex a shortcut bypasses, or -1 for an original road.
+        roads (list): The Road of every original upward edge, None for shortcuts.
+    """
+
+    def __init__(self, vertices, rank, offsets, targets, weights, middles, roads):
+        self.vertices = list(vertices)
+        self.vertex_ids = {vertex: i for i, vertex in enumerate(self.vertices)}
+        self.rank = rank
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.middles = middles
+        self.roads = list(roads)
+        # Queries touch only a few hundred edges, so they run over plain lists rather than NumPy scalars.
+        self._upward = [[] for _ in self.vertices]
+        self._edges = {}
+        bounds = offsets.tolist()
+        for vertex_id in range(len(self.vertices)):
+            for edge in range(bounds[vertex_id], bounds[vertex_id + 1]):
+                neighbor_id, weight = int(targets[edge]), float(weights[edge])
+                self._upward[vertex_id].append((neighbor_id, weight))
+                self._edges[(vertex_id, neighbor_id)] = edge
+
+    @classmethod
+    def from_graph(cls, graph, witness_settle_limit=50):
+        """Contracts every vertex of the graph and returns the resulting hierarchy."""
+        vertices = list(graph.adjacency_list)
+        # adjacency[v][w] holds (length, middle, road) of the shortest edge between v and w among uncontracted vertices.
+        adjacency = _shortest_roads(graph, vertices)
+
+        contracted_neighbors = [0] * len(vertices)
+        priority_queue = [(cls._priority(adjacency, v, contracted_neighbors, witness_settle_limit), v)
+                          for v in range(len(vertices))]
+        heapq.heapify(priority_queue)
+        rank = np.empty(len(vertices), dtype=np.int64)
+        upward = [None] * len(vertices)
+        order = 0
+
+        while priority_queue:
+            _, vertex_id = heapq.heappop(priority_queue)
+            # Lazy update: the stored priority may be stale, so recompute it and requeue if it got worse.
+            priority = cls._priority(adjacency, vertex_id, contracted_neighbors, witness_settle_limit)
+            if priority_queue and priority > priority_queue[0][0]:
+                heapq.heappush(priority_queue, (priority, vertex_id))
+                continue
+
+            for u, w, length in cls._needed_shortcuts(adjacency, vertex_id, witness_settle_limit):
+                adjacency[u][w] = (length, vertex_id, None)
+                adjacency[w][u] = (length, vertex_id, None)
+            # Every remaining neighbor will be contracted later, so all current edges point upward.
+            upward[vertex_id] = adjacency[vertex_id]
+            for neighbor_id in adjacency[vertex_id]:
+                del adjacency[neighbor_id][vertex_id]
+                contracted_neighbors[neighbor_id] += 1
+            adjacency[vertex_id] = {}
+            rank[vertex_id] = order
+            order += 1
+
+        offsets = np.zeros(len(vertices) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(edges) for edges in upward])
+        edges = [(neighbor_id, length, middle, road)
+                 for vertex_edges in upward for neighbor_id, (length, middle, road) in vertex_edges.items()]
+        targets = np.array([edge[0] for edge in edges], dtype=_id_dtype(len(vertices)))
+        weights = np.array([edge[1] for edge in edges], dtype=np.float64)
+        middles = np.array([edge[2] for edge in edges], dtype=np.int64)
+        return cls(vertices, rank, offsets, targets, weights, middles, [edge[3] for edge in edges])
+
+    @staticmethod
+    def _needed_shortcuts(adjacency, vertex_id, witness_settle_limit):
+        # Returns the (u, w, length) shortcuts required to contract vertex_id, using local witness searches that
+        # avoid it. A search that gives up early only adds a redundant shortcut, never a wrong distance.
+        neighbors = list(adjacency[vertex_id].items())
+        shortcuts = []
+        for i, (u, (length_u, _, _)) in enumerate(neighbors):
+            candidates = {w: length_u + length_w for w, (length_w, _, _) in neighbors[i + 1:]}
+            if not candidates:
+                continue
+            limit = max(candidates.values())
+            distances = {u: 0}
+            priority_queue = [(0, u)]
+            settled = 0
+            while priority_queue and settled < witness_settle_limit:
+                current_distance, current = heapq.heappop(priority_queue)
+                if current_distance > distances[current] or current_distance > limit:
+                    continue
+                settled += 1
+                for neighbor, (length, _, _) in adjacency[current].items():
+                    distance = current_distance + length
+                    if neighbor != vertex_id and distance < distances.get(neighbor, float('infinity')):
+                        distances[neighbor] = distance
+                        heapq.heappush(priority_queue, (distance, neighbor))
+            for w, length in candidates.items():
+                if distances.get(w, float('infinity')) > length:
+                    shortcuts.append((u, w, length))
+        return shortcuts
+
+    @classmethod
+    def _priority(cls, adjacency, vertex_id, contracted_neighbors, witness_settle_limit):
+        # Edge difference (shortcuts added minus edges removed) plus the number of already contracted neighbors,
+        # which spreads contraction evenly over the map.
+        shortcuts = len(cls._needed_shortcuts(adjacency, vertex_id, witness_settle_limit))
+        return shortcuts - len(adjacency[vertex_id]) + contracted_neighbors[vertex_id]
+
+    def _upward_search(self, source_id, target_id):
+        # Bidirectional search over upward edges. The graph is undirected, so both sides use the same edges.
+        distances = ({source_id: 0.0}, {target_id: 0.0})
+        predecessors = ({}, {})
+        queues = ([(0.0, source_id)], [(0.0, target_id)])
+        best_distance, meeting_id = (0.0, source_id) if source_id == target_id else (float('infinity'), None)
+        settled = 0
+
+        while queues[0] or queues[1]:
+            # Each side stops once its smallest key cannot improve on the best meeting point.
+            for side in (0, 1):
+                if queues[side] and queues[side][0][0] >= best_distance:
+                    queues[side].clear()
+            side = 0 if queues[0] and (not queues[1] or queues[0][0][0] <= queues[1][0][0]) else 1
+            if not queues[side]:
+                break
+            current_distance, current_id = heapq.heappop(queues[side])
+            if current_distance > distances[side][current_id]:
+                continue
+            settled += 1
+            other_distance = distances[1 - side].get(current_id)
+            if other_distance is not None and current_distance + other_distance < best_distance:
+                best_distance, meeting_id = current_distance + other_distance, current_id
+            for neighbor_id, length in self._upward[current_id]:
+                distance = current_distance + length
+                if distance < distances[side].get(neighbor_id, float('infinity')):
+                    distances[side][neighbor_id] = distance
+                    predecessors[side][neighbor_id] = current_id
+                    heapq.heappush(queues[side], (distance, neighbor_id))
+
+        return best_distance, meeting_id, predecessors, settled
+
+    def distance(self, source, target):
+        """Returns the shortest distance between two vertices, or infinity if they are not connected."""
+        best_distance, _, _, _ = self._upward_search(self.vertex_ids[source], self.vertex_ids[target])
+        return best_distance
+
+    def shortest_path(self, source, target):
+        """Returns a ShortestPath with the original roads, unpacking every shortcut on the way."""
+        source_id, target_id = self.vertex_ids[source], self.vertex_ids[target]
+        best_distance, meeting_id, predecessors, settled = self._upward_search(source_id, target_id)
+        if meeting_id is None:
+            return ShortestPath(float('infinity'), [], [], settled)
+
+        # Chain of hierarchy vertices: source up to the meeting vertex, then back down to the target.
+        chain = [meeting_id]
+        while chain[-1] in predecessors[0]:
+            chain.append(predecessors[0][chain[-1]])
+        chain.reverse()
+        while chain[-1] in predecessors[1]:
+            chain.append(predecessors[1][chain[-1]])
+
+        vertex_ids, roads = [chain[0]], []
+        for a, b in zip(chain, chain[1:]):
+            self._unpack(a, b, vertex_ids, roads)
+        return ShortestPath(best_distance, [self.vertices[i] for i in vertex_ids], roads, settled)
+
+    def _unpack(self, a, b, vertex_ids, roads):
+        # Appends the original vertices and roads of the hierarchy edge a -> b, recursing through shortcuts.
+        edge = self._edges.get((a, b))
+        if edge is None:
+            edge = self._edges[(b, a)]
+        middle = int(self.middles[edge])
+        if middle < 0:
+            vertex_ids.append(b)
+            roads.append(self.roads[edge])
+        else:
+            self._unpack(a, middle, vertex_ids, roads)
+            self._unpack(middle, b, vertex_ids, roads)
+
+    def save(self, path):
+        """Writes the hierarchy to an .npz file so preprocessing does not have to be repeated.
+
+        Only the numeric arrays are written. The vertices and roads stay with the graph, and load maps the saved
+        ids back onto them.
+        """
+        np.savez(path, rank=self.rank, offsets=self.offsets, targets=self.targets, weights=self.weights,
+                 middles=self.middles)
+
+    @classmethod
+    def load(cls, path, graph):
+        """Reads a hierarchy written by save for the same, unchanged graph; its own vertices and Roads are used."""
+        vertices = list(graph.adjacency_list)
+        with np.load(path) as data:
+            rank, offsets, targets = data["rank"], data["offsets"], data["targets"]
+            weights, middles = data["weights"], data["middles"]
+        if len(rank) != len(vertices):
+            raise ValueError(f"The graph has {len(vertices)} vertices but the hierarchy was saved with {len(rank)}")
+        # Original edges get back the same Road that from_graph picked: the shortest one between their endpoints.
+        adjacency = _shortest_roads(graph, vertices)
+        roads = []
+        bounds = offsets.tolist()
+        for vertex_id in range(len(vertices)):
+            for edge in range(bounds[vertex_id], bounds[vertex_id + 1]):
+                if middles[edge] >= 0:
+                    roads.append(None)
+                    continue
+                length, _, road = adjacency[vertex_id].get(int(targets[edge]), (None, None, None))
+                if road is None or length != weights[edge]:
+                    raise ValueError("The graph's roads do not match the saved hierarchy")
+                roads.append(road)
+        return cls(vertices, rank, offsets, targets, weights, middles, roads)
+
+    def __repr__(self):
+        shortcuts = int(np.count_nonzero(self.middles >= 0))
+        return f"ContractionHierarchy(vertices={len(self.vertices)}, edges={len(self.targets)}, shortcuts={shortcuts})"
+
+
+# Function to index the shortest road between every pair of adjacent vertices, as {neighbor id: (length, -1, road)}
+# per vertex id. Roads back to the vertex itself are left out.
+def _shortest_roads(graph, vertices):
+    vertex_ids = {vertex: i for i, vertex in enumerate(vertices)}
+    adjacency = [{} for _ in vertices]
+    for vertex, connections in graph.adjacency_list.items():
+        vertex_id = vertex_ids[vertex]
+        for neighbor, road in connections:
+            neighbor_id = vertex_ids[neighbor]
+            if neighbor_id != vertex_id and road.length < adjacency[vertex_id].get(neighbor_id, (float('infinity'),))[0]:
+                adjacency[vertex_id][neighbor_id] = (road.length, -1, road)
+                adjacency[neighbor_id][vertex_id] = (road.length, -1, road)
+    return adjacency
@@ -0,0 +1,279 @@
+"""Frozen compressed sparse row graphs and bulk edge-list loading."""
+
+import heapq
+import itertools
+import os
+import time
+
+import numpy as np
+
+from .graph import Graph
+from .telemetry import instrumentation
+
+
+# Code for Part 3: Compressed Sparse Row (CSR) Graph Backend
+class CSRGraph:
+    """Frozen compressed sparse row representation of a Graph.
+
+    Attributes:
+        vertices (list): Maps each integer vertex id back to the original vertex object.
+        vertex_ids (dict): Maps each original vertex object to its integer id.
+        offsets (np.ndarray): int64 array of length n + 1; the edges of vertex i are offsets[i]:offsets[i + 1].
+        targets (np.ndarray): Integer array holding the neighbor id of every edge.
+        weights (np.ndarray): float64 array holding the length of every edge.
+    """
+
+    def __init__(self, vertices, offsets, targets, weights):
+        self.vertices = list(vertices)
+        self.vertex_ids = {vertex: i for i, vertex in enumerate(self.vertices)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        # The arrays are shared by every query, so they are made read-only to keep the graph frozen.
+        for array in (self.offsets, self.targets, self.weights):
+            array.setflags(write=False)
+        self._lists = None
+
+    def as_lists(self):
+        # The offsets, targets and weights as plain Python lists, converted on first use and then kept. Dijkstra
+        # touches one element at a time, which is far cheaper on lists than on NumPy scalars or small slices.
+        if self._lists is None:
+            self._lists = (self.offsets.tolist(), self.targets.tolist(), self.weights.tolist())
+        return self._lists
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Builds a CSR graph from a Graph, keeping the vertex and edge order of its adjacency list."""
+        vertices = list(graph.adjacency_list)
+        vertex_ids = {vertex: i for i, vertex in enumerate(vertices)}
+        # Collected into lists first and converted once; assigning NumPy elements one by one is much slower.
+        connections = [graph.adjacency_list[vertex] for vertex in vertices]
+        offsets = np.zeros(len(vertices) + 1, dtype=np.int64)
+        np.cumsum([len(edges) for edges in connections], out=offsets[1:])
+        targets = np.array([vertex_ids[neighbor] for edges in connections for neighbor, _ in edges],
+                           dtype=_id_dtype(len(vertices)))
+        weights = np.array([road.length for edges in connections for _, road in edges], dtype=np.float64)
+        return cls(vertices, offsets, targets, weights)
+
+    @classmethod
+    def from_edge_arrays(cls, frm, to, lengths):
+        """Builds a CSR graph directly from parallel edge arrays, treating every edge as bidirectional.
+
+        Vertex ids and edge order match loading the same edges into a Graph with add_edge and calling from_graph.
+        """
+        frm, to = np.asarray(frm), np.asarray(to)
+        # Interleave both directions so each vertex sees its edges in the order add_edge would append them.
+        sources = np.stack([frm, to], axis=1).ravel()
+        destinations = np.stack([to, frm], axis=1).ravel()
+        weights = np.repeat(np.asarray(lengths, dtype=np.float64), 2)
+        # Vertex ids follow first appearance, like the insertion order of Graph.adjacency_list.
+        labels, first_seen, inverse = np.unique(sources, return_index=True, return_inverse=True)
+        order = np.argsort(first_seen, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        source_ids = rank[inverse]
+        target_ids = rank[np.searchsorted(labels, destinations)]
+        # A stable sort by source id groups the edges per vertex without reordering them.
+        edge_order = np.argsort(source_ids, kind="stable")
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source_ids, minlength=len(labels)), out=offsets[1:])
+        targets = target_ids[edge_order].astype(_id_dtype(len(labels)))
+        return cls(labels[order].tolist(), offsets, targets, weights[edge_order])
+
+    @property
+    def num_vertices(self):
+        return len(self.vertices)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def neighbors(self, vertex_id):
+        # Returns the neighbor ids and edge lengths of a vertex as array views (no copies are made).
+        start, end = self.offsets[vertex_id], self.offsets[vertex_id + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    def to_distance_dict(self, distances):
+        # Converts an array of distances indexed by vertex id into the {vertex: distance} form used by dijkstra.
+        return {vertex: float(d) for vertex, d in zip(self.vertices, distances.tolist())}
+
+    def __repr__(self):
+        return f"CSRGraph(vertices={self.num_vertices}, edges={self.num_edges})"
+
+
+def _id_dtype(num_vertices):
+    # Uses 32-bit vertex ids whenever they fit, halving the size of the target array.
+    return np.int32 if num_vertices < 2 ** 31 else np.int64
+
+
+# Dijkstra's algorithm over the CSR arrays. Returns an array of distances indexed by vertex id.
+def csr_dijkstra_array(csr, source_id, stats=None):
+    return np.array(_csr_dijkstra_lists(*csr.as_lists(), source_id, stats))
+
+
+# List-level implementation, so worker processes can run it over shared arrays without a CSRGraph object. Takes
+# the offsets, targets and weights as plain lists and returns a list of distances indexed by vertex id.
+def _csr_dijkstra_lists(offsets, targets, weights, source_id, stats=None):
+    distances = [float('infinity')] * (len(offsets) - 1)
+    distances[source_id] = 0.0
+    priority_queue = [(0.0, source_id)]
+    pushes, pops, stale_pops = 1, 0, 0
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    while priority_queue:
+        current_distance, current_id = heappop(priority_queue)
+        pops += 1
+        # Skip queue entries that were superseded by a shorter distance found later.
+        if current_distance > distances[current_id]:
+            stale_pops += 1
+            continue
+        for edge in range(offsets[current_id], offsets[current_id + 1]):
+            neighbor_id = targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < distances[neighbor_id]:
+                distances[neighbor_id] = distance
+                heappush(priority_queue, (distance, neighbor_id))
+                pushes += 1
+
+    if stats is not None:
+        stats.record(pushes=pushes, pops=pops, stale_pops=stale_pops)
+    if instrumentation.enabled:
+        relaxations = sum(offsets[i + 1] - offsets[i] for i, d in enumerate(distances) if d != float('infinity'))
+        instrumentation.count_all("dijkstra", runs=1, relaxations=relaxations, pushes=pushes, pops=pops,
+                                  stale_pops=stale_pops)
+    return distances
+
+
+# Dijkstra's algorithm over a CSRGraph, returning the same {vertex: distance} dictionary as dijkstra.
+def csr_dijkstra(csr, start, stats=None):
+    return csr.to_distance_dict(csr_dijkstra_array(csr, csr.vertex_ids[start], stats))
+
+
+# Code for Part 4: Bulk Edge-List Ingestion
+# Edge lists are read in fixed-size chunks so the raw file is never held in memory at once. Parsing each chunk is
+# vectorized; filling a Graph still creates its Road objects one edge at a time (see Graph.add_edges), so for large
+# lists the Python objects, not the parsing, set the pace. load_csr_edge_list skips them entirely.
+
+# Each edge-list row holds the two endpoint ids and the length of the road between them.
+EDGE_DTYPE = np.dtype([("frm", np.int64), ("to", np.int64), ("length", np.float64)])
+
+
+# Function to stream (frm, to, length) arrays out of a CSV, .npy or .npz edge list, chunk_size rows at a time.
+def read_edge_chunks(path, chunk_size=100_000, delimiter=",", skip_header=0):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        # Memory-map the array so only the rows of the current chunk are paged in.
+        edges = np.load(path, mmap_mode="r")
+        yield from _edge_array_chunks(edges, chunk_size)
+    elif extension == ".npz":
+        with np.load(path) as archive:
+            if "edges" in archive:
+                yield from _edge_array_chunks(archive["edges"], chunk_size)
+            else:
+                frm, to, length = archive["frm"], archive["to"], archive["length"]
+                for start in range(0, len(frm), chunk_size):
+                    end = start + chunk_size
+                    yield frm[start:end], to[start:end], length[start:end]
+    else:
+        with open(path) as file:
+            for _ in range(skip_header):
+                next(file, None)
+            while True:
+                lines = list(itertools.islice(file, chunk_size))
+                if not lines:
+                    break
+                rows = np.atleast_1d(np.loadtxt(lines, delimiter=delimiter, dtype=EDGE_DTYPE, ndmin=1))
+                yield rows["frm"], rows["to"], rows["length"]
+
+
+def _edge_array_chunks(edges, chunk_size):
+    # Accepts either a structured array with frm/to/length fields or a plain (m, 3) array.
+    for start in range(0, len(edges), chunk_size):
+        chunk = edges[start:start + chunk_size]
+        if chunk.dtype.names:
+            yield chunk["frm"], chunk["to"], chunk["length"]
+        else:
+            yield chunk[:, 0].astype(np.int64), chunk[:, 1].astype(np.int64), chunk[:, 2].astype(np.float64)
+
+
+# Function to add a parsed chunk of edges to a Graph. Produces exactly the adjacency lists and change log of calling
+# add_edge per edge, so version-keyed results (ShortestPathTree, DijkstraCache) see the new roads. The arrays are
+# converted in one step, but the Roads are still built per edge.
+def add_edge_batch(graph, frm, to, lengths):
+    # Converting the arrays to lists once gives plain Python ints and floats as vertices and lengths.
+    graph.add_edges(np.asarray(frm).tolist(), np.asarray(to).tolist(), np.asarray(lengths).tolist())
+    return graph
+
+
+# Function to load an edge-list file into a Graph (a new one unless an existing graph is given).
+def load_edge_list(path, graph=None, chunk_size=100_000, delimiter=",", skip_header=0):
+    if graph is None:
+        graph = Graph()
+    for frm, to, lengths in read_edge_chunks(path, chunk_size, delimiter, skip_header):
+        add_edge_batch(graph, frm, to, lengths)
+    return graph
+
+
+# Function to load an edge-list file straight into a frozen CSRGraph, skipping the Graph objects entirely.
+# The columns grow as chunks arrive, doubling in place, so the parsed chunks and a concatenated copy of them are
+# never held at the same time.
+def load_csr_edge_list(path, chunk_size=100_000, delimiter=",", skip_header=0):
+    columns, size = None, 0
+    for chunk in read_edge_chunks(path, chunk_size, delimiter, skip_header):
+        count = len(chunk[0])
+        if columns is None:
+            columns = [np.empty(count, dtype=column.dtype) for column in chunk]
+        elif size + count > len(columns[0]):
+            capacity = max(2 * len(columns[0]), size + count)
+            for column in columns:
+                column.resize(capacity, refcheck=False)
+        for column, values in zip(columns, chunk):
+            column[size:size + count] = values
+        size += count
+    if columns is None:
+        return CSRGraph([], np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0))
+    frm, to, lengths = (column[:size] for column in columns)
+    return CSRGraph.from_edge_arrays(frm, to, lengths)
+
+
+# Benchmark comparing the per-edge add_edge loop against the bulk loaders on a random edge list. Parsing alone is
+# timed separately for both, to show how much of each load is reading the file and how much is building the graph.
+def benchmark_edge_list_loading(path, num_vertices=10_000, num_edges=50_000, seed=0):
+    rng = np.random.default_rng(seed)
+    frm = rng.integers(0, num_vertices, num_edges)
+    to = rng.integers(0, num_vertices, num_edges)
+    lengths = np.round(rng.uniform(0.1, 10.0, num_edges), 3)
+    np.savetxt(path, np.column_stack([frm, to, lengths]), delimiter=",", fmt=["%d", "%d", "%.3f"])
+
+    results = {}
+    started = time.perf_counter()
+    with open(path) as file:
+        for line in file:
+            a, b, length = line.split(",")
+            int(a), int(b), float(length)
+    results["line-by-line parse only"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in read_edge_chunks(path):
+        pass
+    results["read_edge_chunks parse only"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    graph = Graph()
+    with open(path) as file:
+        for line in file:
+            a, b, length = line.split(",")
+            graph.add_edge(int(a), int(b), float(length))
+    results["add_edge loop"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    bulk_graph = load_edge_list(path)
+    results["load_edge_list"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    load_csr_edge_list(path)
+    results["load_csr_edge_list"] = time.perf_counter() - started
+
+    for name, seconds in results.items():
+        print(f"{name}: {seconds:.3f} s ({num_edges / seconds:,.0f} edges/s)")
+    return results, len(bulk_graph.adjacency_list) == len(graph.adjacency_list)
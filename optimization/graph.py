@@ -0,0 +1,193 @@
+"""Road network: intersections, roads and the adjacency-list graph with its change log."""
+
+import gc
+
+
+class Intersection:
+    """Class representing an intersection in the road network.
+
+    Attributes:
+        id (int): A unique identifier for the intersection.
+        name (str): The name of the intersection.
+        coordinates (tuple): Optional location of the intersection, used by the A* heuristics.
+    """
+
+    def __init__(self, id, name, coordinates=None):
+        self.id = id  # Unique identifier for each intersection
+        self.name = name  # Human-readable name for the intersection
+        self.coordinates = coordinates  # Optional (x, y) in kilometers or (latitude, longitude) in degrees
+
+    def __repr__(self):
+        # Provides a string representation of the Intersection object, useful for debugging.
+        return f"Intersection({self.id}, '{self.name}')"
+
+
+class Road:
+    """Class representing a road connecting two intersections.
+
+    Attributes:
+        id (int): A unique identifier for the road.
+        name (str): The name of the road.
+        length (float): The length of the road in kilometers.
+    """
+
+    def __init__(self, id, name, length):
+        self.id = id  # Unique identifier for each road
+        self.name = name  # Name of the road
+        self.length = length  # Length of the road in kilometers
+
+    def __repr__(self):
+        # Provides a string representation of the Road object, useful for debugging.
+        return f"Road(ID: {self.id}, Name: '{self.name}', Length: {self.length} km)"
+
+
+class Graph:
+    """Graph class to represent the network of intersections and roads.
+
+    Attributes:
+        adjacency_list (dict): A dictionary where keys are Intersection objects and values are lists
+                               of tuples (Intersection, Road) representing connections to neighboring intersections.
+        version (int): Number of changes made to the graph so far, so derived results can tell if they are stale.
+        changes (list): GraphChange records of the most recent changes, oldest first; changes[i].version is
+                        change_base + i + 1. Once there are more than max_changes, the oldest half is dropped.
+        change_base (int): Version just before the oldest record still in changes.
+    """
+
+    def __init__(self, max_changes=10_000):
+        self.adjacency_list = {}  # Initializes an empty dictionary to store adjacency list.
+        self.version = 0
+        self.changes = []
+        self.change_base = 0
+        self.max_changes = max_changes  # 0 keeps no log: every consumer then recomputes from scratch
+
+    def _record(self, kind, start, end=None, roads=()):
+        # Bumps the version and appends the change to the change log, trimming the log when it is full.
+        self.version += 1
+        self.changes.append(GraphChange(self.version, kind, start, end, tuple(roads)))
+        if len(self.changes) > self.max_changes:
+            # Dropping half at a time keeps the cost of trimming amortized O(1) per change.
+            dropped = len(self.changes) - self.max_changes // 2
+            del self.changes[:dropped]
+            self.change_base += dropped
+
+    def changes_since(self, version):
+        """Changes made after the given version, oldest first, or None if the log no longer reaches back that far."""
+        if version < self.change_base:
+            return None
+        return self.changes[version - self.change_base:]
+
+    def add_vertex(self, vertex):
+        if vertex not in self.adjacency_list:
+            self.adjacency_list[vertex] = []  # Initializes an empty list to store vertices.
+            self._record("add_vertex", vertex)
+
+    def add_edge(self, frm, to, length):
+        # Ensure to include a road name when creating the Road instance.
+        road_name = f"Road from {frm} to {to}"
+        if frm not in self.adjacency_list:
+            self.adjacency_list[frm] = []
+        if to not in self.adjacency_list:
+            self.adjacency_list[to] = []
+        self.adjacency_list[frm].append((to, Road(frm, road_name, length)))
+        self.adjacency_list[to].append((frm, Road(to, road_name, length)))  # Assuming bidirectional for simplicity
+        # Additions only ever shorten paths, and consumers find the new roads in the adjacency list, so the
+        # record does not keep the Road objects.
+        self._record("add_edge", frm, to)
+
+    def add_edges(self, frm, to, lengths):
+        """Adds one two-way road per (frm[i], to[i], lengths[i]), giving the adjacency lists calling add_edge would.
+
+        The whole batch is a single "add_edges" change without endpoints, which tells consumers to recompute rather
+        than replay it. The cyclic garbage collector is paused while the batch is added; this affects the whole
+        process, so other threads get no automatic collections until it returns.
+        """
+        # Every edge allocates two Roads and two adjacency tuples, none of them in reference
+        # cycles, so the cyclic garbage collector is paused for the batch. Left running, its repeated passes over
+        # the growing graph take most of the time of a bulk load. A caller that already disabled it keeps it off.
+        collecting = gc.isenabled()
+        if collecting:
+            gc.disable()
+        try:
+            adjacency_list = self.adjacency_list
+            for a, b, length in zip(frm, to, lengths):
+                road_name = f"Road from {a} to {b}"
+                from_roads = adjacency_list.get(a)
+                if from_roads is None:
+                    from_roads = adjacency_list[a] = []
+                to_roads = adjacency_list.get(b)
+                if to_roads is None:
+                    to_roads = adjacency_list[b] = []
+                from_roads.append((b, Road(a, road_name, length)))
+                to_roads.append((a, Road(b, road_name, length)))
+        finally:
+            if collecting:
+                gc.enable()
+        self._record("add_edges", None)
+
+    def add_intersection(self, intersection):
+        """Adds an intersection to the graph if it is not already present."""
+        if intersection not in self.adjacency_list:
+            self.adjacency_list[intersection] = []  # Adds intersection with an empty list of connected roads.
+            self._record("add_intersection", intersection)
+
+    def add_road(self, start, end, road):
+        """Adds a road between two intersections."""
+        self.adjacency_list[start].append((end, road))  # Adds end intersection and road to start's list.
+        self.adjacency_list[end].append(
+            (start, road))  # Adds start intersection and road to end's list (bidirectional).
+        self._record("add_road", start, end)
+
+    def _roads_between(self, start, end, road=None):
+        # Every Road object linking start and end in either direction, or just road when it is given.
+        roads = [r for n, r in self.adjacency_list[start] if n == end and (road is None or r is road)]
+        roads += [r for n, r in self.adjacency_list[end] if n == start and (road is None or r is road)
+                  and not any(r is seen for seen in roads)]
+        if not roads:
+            raise KeyError(f"No road between {start} and {end}")
+        return roads
+
+    def update_road_length(self, start, end, length, road=None):
+        """Sets the length of the road between two intersections, or of every road between them if road is None."""
+        roads = self._roads_between(start, end, road)
+        for r in roads:
+            r.length = length
+        self._record("update_road", start, end, roads)
+
+    def remove_road(self, start, end, road=None):
+        """Removes the road between two intersections in both directions, or every road between them if road is None."""
+        roads = self._roads_between(start, end, road)
+        for frm, to in ((start, end), (end, start)):
+            self.adjacency_list[frm] = [(n, r) for n, r in self.adjacency_list[frm]
+                                        if not (n == to and any(r is removed for removed in roads))]
+        self._record("remove_road", start, end, roads)
+
+    def display(self):
+        """Prints a representation of the graph showing all connections."""
+        for intersection, roads in self.adjacency_list.items():
+            print(f"{intersection}:")
+            for neighbor, road in roads:
+                print(f"  -> to {neighbor} via {road}")
+
+
+# Code for Part 24: Dynamic Graph Updates and Incremental Shortest-Path Repair
+class GraphChange:
+    """One entry of a Graph's change log.
+
+    Attributes:
+        version (int): Graph version right after the change.
+        kind (str): "add_vertex", "add_intersection", "add_edge", "add_edges", "add_road", "update_road" or
+                    "remove_road".
+        start: The vertex added, or the first endpoint of the road(s) changed; None for a batch of edges.
+        end: The second endpoint of the road(s) changed, None for vertex changes and batches.
+        roads (tuple): The Road objects updated or removed; empty for additions.
+    """
+
+    def __init__(self, version, kind, start, end, roads):
+        self.version = version
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.roads = roads
+
+    def __repr__(self):
+        return f"GraphChange(version={self.version}, kind='{self.kind}', start={self.start}, end={self.end})"
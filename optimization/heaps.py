@@ -0,0 +1,153 @@
+"""Indexed binary heap with decrease-key, and counters for Dijkstra runs."""
+
+import heapq
+
+
+# Code for Part 8: Indexed Decrease-Key Heap for Dijkstra
+class DijkstraStats:
+    """Counters collected by dijkstra runs, accumulated over every run the object is passed to.
+
+    Attributes:
+        runs (int): Number of dijkstra calls recorded.
+        pushes (int): Entries inserted into the priority queue.
+        pops (int): Entries removed from the priority queue.
+        stale_pops (int): Removed entries that were outdated and skipped.
+        decrease_keys (int): In-place priority decreases (indexed heap only).
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.decrease_keys = 0
+
+    def record(self, pushes=0, pops=0, stale_pops=0, decrease_keys=0):
+        # Adds the counters of one dijkstra run.
+        self.runs += 1
+        self.pushes += pushes
+        self.pops += pops
+        self.stale_pops += stale_pops
+        self.decrease_keys += decrease_keys
+
+    def __repr__(self):
+        return (f"DijkstraStats(runs={self.runs}, pushes={self.pushes}, pops={self.pops}, "
+                f"stale_pops={self.stale_pops}, decrease_keys={self.decrease_keys})")
+
+
+class IndexedHeap:
+    """Binary min-heap that tracks the position of every item, so an item's priority can be decreased in place.
+
+    Each item is stored at most once, which means the heap never holds stale entries.
+    """
+
+    def __init__(self):
+        self.heap = []  # List of [priority, item] pairs in heap order
+        self.positions = {}  # Maps each item to its index in self.heap
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def push(self, item, priority):
+        # Adds a new item; use decrease_key for items already in the heap.
+        self.positions[item] = len(self.heap)
+        self.heap.append([priority, item])
+        self._sift_up(len(self.heap) - 1)
+
+    def decrease_key(self, item, priority):
+        # Lowers the priority of an item already in the heap and restores the heap order.
+        index = self.positions[item]
+        if priority > self.heap[index][0]:
+            raise ValueError("decrease_key cannot increase a priority")
+        self.heap[index][0] = priority
+        self._sift_up(index)
+
+    def update(self, item, priority):
+        # Changes the priority of an item already in the heap in either direction.
+        index = self.positions[item]
+        old_priority = self.heap[index][0]
+        self.heap[index][0] = priority
+        if priority < old_priority:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def priority(self, item):
+        return self.heap[self.positions[item]][0]
+
+    def peek(self):
+        # Returns the (priority, item) pair with the smallest priority without removing it.
+        return self.heap[0][0], self.heap[0][1]
+
+    def remove(self, item):
+        # Removes an item from anywhere in the heap and returns its priority.
+        index = self.positions.pop(item)
+        removed = self.heap[index]
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.positions[last[1]] = index
+            self._sift_up(index)
+            self._sift_down(self.positions[last[1]])
+        return removed[0]
+
+    def smallest(self, k):
+        # Returns the k (priority, item) pairs with the smallest priorities in order, in O(k log k), by exploring
+        # the heap from the root with a small frontier heap instead of popping.
+        result = []
+        frontier = [(self.heap[0][0], 0)] if self.heap else []
+        while frontier and len(result) < k:
+            priority, index = heapq.heappop(frontier)
+            result.append((priority, self.heap[index][1]))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, (self.heap[child][0], child))
+        return result
+
+    def pop(self):
+        # Removes and returns the (priority, item) pair with the smallest priority.
+        last = self.heap.pop()
+        if not self.heap:
+            del self.positions[last[1]]
+            return last[0], last[1]
+        top = self.heap[0]
+        self.heap[0] = last
+        self.positions[last[1]] = 0
+        del self.positions[top[1]]
+        self._sift_down(0)
+        return top[0], top[1]
+
+    def _sift_up(self, index):
+        heap, positions = self.heap, self.positions
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if heap[parent][0] <= entry[0]:
+                break
+            heap[index] = heap[parent]
+            positions[heap[index][1]] = index
+            index = parent
+        heap[index] = entry
+        positions[entry[1]] = index
+
+    def _sift_down(self, index):
+        heap, positions = self.heap, self.positions
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if entry[0] <= heap[child][0]:
+                break
+            heap[index] = heap[child]
+            positions[heap[index][1]] = index
+            index = child
+        heap[index] = entry
+        positions[entry[1]] = index
+
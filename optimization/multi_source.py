@@ -0,0 +1,78 @@
+"""Many-source Dijkstra over shared memory, spread across worker processes."""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .csr import CSRGraph, _csr_dijkstra_lists, csr_dijkstra_array
+
+
+# Code for Part 9: Batch Multi-Source Dijkstra
+# Worker processes attach to the CSR arrays through shared memory instead of receiving a pickled copy of the graph.
+
+# Arrays and shared memory handles attached by the initializer of each worker process.
+_shared_arrays = {}
+
+
+# Function to compute a distance matrix with one row per source and one column per target (every vertex of the
+# graph, in CSRGraph vertex order, when targets is None). Rows are spread over a pool of worker processes.
+def distance_matrix(graph, sources, targets=None, processes=None, chunk_size=None):
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    source_ids = np.array([csr.vertex_ids[source] for source in sources], dtype=np.int64)
+    target_ids = None if targets is None else np.array([csr.vertex_ids[target] for target in targets], dtype=np.int64)
+    width = csr.num_vertices if target_ids is None else len(target_ids)
+    processes = min(processes or os.cpu_count() or 1, len(source_ids))
+
+    if processes <= 1:
+        matrix = np.empty((len(source_ids), width))
+        for row, source_id in enumerate(source_ids.tolist()):
+            distances = csr_dijkstra_array(csr, source_id)
+            matrix[row] = distances if target_ids is None else distances[target_ids]
+        return matrix
+
+    arrays = {"offsets": csr.offsets, "targets": csr.targets, "weights": csr.weights,
+              "result": np.empty((len(source_ids), width))}
+    if target_ids is not None:
+        arrays["target_ids"] = target_ids
+    blocks = {}
+    try:
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks[name] = block
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        specs = {name: (blocks[name].name, array.shape, array.dtype.str) for name, array in arrays.items()}
+
+        # Several chunks per worker keep the pool balanced when some sources reach more of the graph than others.
+        chunk_size = chunk_size or max(1, len(source_ids) // (processes * 4))
+        tasks = [(start, source_ids[start:start + chunk_size]) for start in range(0, len(source_ids), chunk_size)]
+        with multiprocessing.Pool(processes, initializer=_attach_shared_arrays, initargs=(specs,)) as pool:
+            for _ in pool.imap_unordered(_distance_rows, tasks):
+                pass
+        return np.ndarray(arrays["result"].shape, np.float64, buffer=blocks["result"].buf).copy()
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+
+def _attach_shared_arrays(specs):
+    # Pool initializer: maps every shared block into this worker as a NumPy array view.
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _shared_arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        _shared_arrays[name + "_block"] = block
+
+
+def _distance_rows(task):
+    # Worker task: runs dijkstra for a chunk of sources and writes the rows straight into the shared result.
+    start, source_ids = task
+    if "lists" not in _shared_arrays:
+        # Converted once per worker; the search itself runs over plain lists (see CSRGraph.as_lists).
+        _shared_arrays["lists"] = tuple(_shared_arrays[name].tolist() for name in ("offsets", "targets", "weights"))
+    result, target_ids = _shared_arrays["result"], _shared_arrays.get("target_ids")
+    for row, source_id in enumerate(source_ids.tolist(), start):
+        distances = np.array(_csr_dijkstra_lists(*_shared_arrays["lists"], source_id))
+        result[row] = distances if target_ids is None else distances[target_ids]
+    return len(source_ids)
@@ -0,0 +1,432 @@
+"""Time-bucket rollups and approximate heavy-hitter view tracking for posts."""
+
+import bisect
+import hashlib
+import math
+from array import array
+
+import numpy as np
+
+from .heaps import IndexedHeap
+from .posts import Post, PostManagerWithPriority, PostWithViews, datetime_to_epoch, epoch_to_datetime
+
+
+# Code for Part 17: Time-Bucket Rollups
+class FenwickTree:
+    """Binary indexed tree over int64 counts: point updates and prefix sums in O(log n)."""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = array("q", bytes(8 * (size + 1)))  # 1-based; tree[0] is unused
+
+    @classmethod
+    def from_counts(cls, counts):
+        # Builds the tree from per-position counts in O(n).
+        fenwick = cls(len(counts))
+        tree = fenwick.tree
+        for i, count in enumerate(counts, 1):
+            tree[i] += count
+            parent = i + (i & -i)
+            if parent <= fenwick.size:
+                tree[parent] += tree[i]
+        return fenwick
+
+    def append(self, count):
+        # Extends the tree by one position holding count, in O(log n). The new node covers the positions
+        # (size - lowbit(size), size], which is count plus the nodes at size - 1, size - 2, size - 4, ...
+        self.size += 1
+        index, total, step = self.size, count, 1
+        while step < index & -index:
+            total += self.tree[index - step]
+            step <<= 1
+        self.tree.append(total)
+
+    def add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, end):
+        # Sum of the counts at positions [0, end).
+        total = 0
+        while end > 0:
+            total += self.tree[end]
+            end -= end & -end
+        return total
+
+    def range_sum(self, start, end):
+        # Sum of the counts at positions [start, end).
+        return self.prefix_sum(end) - self.prefix_sum(start)
+
+
+class BucketCounter:
+    """Post counts per fixed-width time bucket, growing to cover whatever span of time is added.
+
+    Attributes:
+        width (int): Bucket width in seconds.
+        origin (int): Bucket number (seconds since EPOCH // width) stored at position 0.
+        counts (array): Count of every bucket, for O(1) single-bucket reads.
+        fenwick (FenwickTree): The same counts, for O(log n) sums over any run of buckets.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.origin = None
+        self.counts = array("q")
+        self.fenwick = FenwickTree(0)
+
+    def _position(self, bucket):
+        # Maps a bucket number to its position, regrowing the arrays when the bucket is outside them.
+        if self.origin is None:
+            self.origin = bucket
+        position = bucket - self.origin
+        if position < 0 or position >= len(self.counts):
+            # Double the covered span in the direction that ran out, so growth stays amortized O(1) per bucket.
+            first = min(self.origin, bucket)
+            last = max(self.origin + len(self.counts) - 1, bucket)
+            span = max(2 * (last - first + 1), 64)
+            new_origin = first - (span - (last - first + 1)) if position < 0 else first
+            counts = array("q", bytes(8 * span))
+            offset = self.origin - new_origin
+            counts[offset:offset + len(self.counts)] = self.counts
+            self.origin, self.counts = new_origin, counts
+            self.fenwick = FenwickTree.from_counts(counts)
+            position = bucket - self.origin
+        return position
+
+    def add(self, timestamp, delta=1):
+        position = self._position(timestamp // self.width)
+        self.counts[position] += delta
+        self.fenwick.add(position, delta)
+
+    def _clamp(self, bucket):
+        return min(max(bucket - self.origin, 0), len(self.counts))
+
+    def count(self, start_timestamp, end_timestamp):
+        # Total of the buckets containing start_timestamp through end_timestamp, in O(log n).
+        if self.origin is None:
+            return 0
+        start = self._clamp(start_timestamp // self.width)
+        end = self._clamp(end_timestamp // self.width + 1)
+        return self.fenwick.range_sum(start, end) if start < end else 0
+
+    def bucket_counts(self, start_timestamp, end_timestamp):
+        # (bucket start timestamp, count) for every bucket from start_timestamp through end_timestamp.
+        result = []
+        for bucket in range(start_timestamp // self.width, end_timestamp // self.width + 1):
+            position = bucket - self.origin if self.origin is not None else -1
+            count = self.counts[position] if 0 <= position < len(self.counts) else 0
+            result.append((bucket * self.width, count))
+        return result
+
+
+class SparseBucketCounter:
+    """Post counts per fixed-width time bucket that only stores the buckets holding posts.
+
+    Memory grows with the number of non-empty buckets rather than with the span of time covered, so it suits the
+    per-user counters, where a user with two posts a month apart would otherwise need a month of minute buckets.
+    Sums over a range of buckets take O(log n), from a FenwickTree over the non-empty buckets in order.
+
+    Attributes:
+        width (int): Bucket width in seconds.
+        buckets (list): Numbers (seconds since EPOCH // width) of the non-empty buckets, sorted.
+        counts (dict): Count of every non-empty bucket.
+        fenwick (FenwickTree): The counts of buckets[i] at position i, for O(log n) range sums.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.buckets = []
+        self.counts = {}
+        self.fenwick = FenwickTree(0)
+
+    def add(self, timestamp, delta=1):
+        bucket = timestamp // self.width
+        if bucket in self.counts:
+            self.counts[bucket] += delta
+            # Posts mostly arrive in time order, so the bucket is usually the last one.
+            last = len(self.buckets) - 1
+            position = last if bucket == self.buckets[last] else bisect.bisect_left(self.buckets, bucket)
+            self.fenwick.add(position, delta)
+        elif not self.buckets or bucket > self.buckets[-1]:
+            # A new bucket at the end extends the tree in O(log n).
+            self.counts[bucket] = delta
+            self.buckets.append(bucket)
+            self.fenwick.append(delta)
+        else:
+            # A new bucket before the end shifts every later position, so the tree is rebuilt in O(n).
+            self.counts[bucket] = delta
+            bisect.insort(self.buckets, bucket)
+            self.fenwick = FenwickTree.from_counts([self.counts[bucket] for bucket in self.buckets])
+
+    def count(self, start_timestamp, end_timestamp):
+        # Total of the buckets containing start_timestamp through end_timestamp, in O(log n).
+        lo = bisect.bisect_left(self.buckets, start_timestamp // self.width)
+        hi = bisect.bisect_right(self.buckets, end_timestamp // self.width)
+        return self.fenwick.range_sum(lo, hi) if lo < hi else 0
+
+    def bucket_counts(self, start_timestamp, end_timestamp):
+        # (bucket start timestamp, count) for every bucket from start_timestamp through end_timestamp.
+        return [(bucket * self.width, self.counts.get(bucket, 0))
+                for bucket in range(start_timestamp // self.width, end_timestamp // self.width + 1)]
+
+
+class PostRollups:
+    """Incremental per-minute, per-hour and per-day post counters, overall and for every user.
+
+    The overall counters are dense BucketCounters; the per-user ones are SparseBucketCounters, so the cost of a
+    user depends on how many buckets they posted in, not on how long they have been posting.
+
+    Attributes:
+        totals (dict): BucketCounter of all posts for every resolution.
+        by_user (dict): For every resolution, a dictionary of SparseBucketCounter per postUser.
+    """
+
+    RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+
+    def __init__(self, resolutions=("minute", "hour", "day")):
+        self.totals = {name: BucketCounter(self.RESOLUTIONS[name]) for name in resolutions}
+        self.by_user = {name: {} for name in resolutions}
+
+    def add_post(self, post):
+        timestamp = datetime_to_epoch(post.postDatetime)
+        for name, counter in self.totals.items():
+            counter.add(timestamp)
+            user_counter = self.by_user[name].get(post.postUser)
+            if user_counter is None:
+                user_counter = self.by_user[name][post.postUser] = SparseBucketCounter(counter.width)
+            user_counter.add(timestamp)
+
+    def _counter(self, resolution, user):
+        if resolution not in self.totals:
+            raise ValueError(f"Resolution {resolution!r} is not maintained")
+        return self.totals[resolution] if user is None else self.by_user[resolution].get(user)
+
+    def count(self, start_datetime, end_datetime, resolution="minute", user=None):
+        # Number of posts in the buckets from start_datetime through end_datetime, for one user or for everyone.
+        counter = self._counter(resolution, user)
+        if counter is None:
+            return 0
+        return counter.count(datetime_to_epoch(start_datetime), datetime_to_epoch(end_datetime))
+
+    def histogram(self, start_datetime, end_datetime, resolution="hour", user=None):
+        # List of (bucket start datetime, count) pairs covering the range, for one user or for everyone.
+        counter = self._counter(resolution, user) or SparseBucketCounter(self.RESOLUTIONS[resolution])
+        return [(epoch_to_datetime(timestamp), count) for timestamp, count in
+                counter.bucket_counts(datetime_to_epoch(start_datetime), datetime_to_epoch(end_datetime))]
+
+    def histogram_by_user(self, start_datetime, end_datetime, resolution="hour", users=None):
+        # Dictionary of user -> histogram. Users without posts in the range are left out.
+        users = self.by_user[resolution] if users is None else users
+        histograms = {}
+        for user in users:
+            if self.count(start_datetime, end_datetime, resolution, user):
+                histograms[user] = self.histogram(start_datetime, end_datetime, resolution, user)
+        return histograms
+
+
+# Code for Part 19: Approximate Heavy-Hitter View Tracking
+# Large prime for the pairwise-independent hash family of the Count-Min Sketch.
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def stable_hash(item):
+    # 64-bit hash of an item's string form that is the same in every process, so sketches built on different
+    # shards can be merged (the built-in hash() of a string changes between interpreter runs).
+    return int.from_bytes(hashlib.blake2b(str(item).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# Function to give an item the same identity on every shard and in every process. Post objects compare by
+# identity, so the same post seen on two shards would count as two items; they are keyed by their fields instead.
+def post_key(item):
+    if isinstance(item, Post):
+        return ("Post", item.postDatetime, item.postContent, item.postUser)
+    return item
+
+
+class CountMinSketch:
+    """Count-Min Sketch: fixed-size table of counters that never underestimates a count.
+
+    With width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)), an estimate exceeds the true count by more than
+    epsilon * (total of all counts) with probability at most delta.
+
+    Attributes:
+        width (int): Counters per row.
+        depth (int): Number of rows, each with its own hash function.
+        table (np.ndarray): depth x width int64 counters.
+        total (int): Sum of all added counts.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01, seed=0):
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.seed = seed
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+        rng = np.random.default_rng(seed)
+        self.hash_parameters = [(int(a), int(b)) for a, b in
+                                zip(rng.integers(1, MERSENNE_PRIME, self.depth), rng.integers(0, MERSENNE_PRIME, self.depth))]
+
+    def _columns(self, item):
+        h = stable_hash(item)
+        return [((a * h + b) % MERSENNE_PRIME) % self.width for a, b in self.hash_parameters]
+
+    def add(self, item, count=1):
+        for row, column in enumerate(self._columns(item)):
+            self.table[row, column] += count
+        self.total += count
+
+    def estimate(self, item):
+        return int(min(self.table[row, column] for row, column in enumerate(self._columns(item))))
+
+    def merge(self, other):
+        # Adds the counts of a sketch built with the same epsilon, delta and seed (for example on another shard).
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Only sketches with the same width, depth and seed can be merged")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def memory_usage(self):
+        return self.table.nbytes
+
+
+class SpaceSaving:
+    """Space-Saving summary that tracks at most `capacity` items and always keeps the heaviest ones.
+
+    When a new item arrives and the summary is full, it replaces the item with the smallest count and inherits
+    that count as its possible overestimate. Any item with a true count above total / capacity is guaranteed
+    to be tracked.
+
+    Attributes:
+        capacity (int): Maximum number of tracked items.
+        counts (IndexedHeap): Tracked items keyed by their (over)estimated count, smallest on top.
+        errors (dict): Largest possible overestimate of every tracked item.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = IndexedHeap()
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, item, count=1):
+        if item in self.counts:
+            self.counts.update(item, self.counts.priority(item) + count)
+        elif len(self.counts) < self.capacity:
+            self.counts.push(item, count)
+            self.errors[item] = 0
+        else:
+            smallest_count, evicted = self.counts.pop()
+            del self.errors[evicted]
+            self.counts.push(item, smallest_count + count)
+            self.errors[item] = smallest_count
+
+    def estimate(self, item):
+        # Upper bound on the count of a tracked item; untracked items may still have up to the smallest count.
+        if item in self.counts:
+            return self.counts.priority(item)
+        return self.counts.peek()[0] if len(self.counts) == self.capacity else 0
+
+    def top_k(self, k):
+        # The k tracked items with the highest estimated counts, as (count, item) pairs.
+        return sorted(((count, item) for count, item in self.counts.heap), key=lambda entry: -entry[0])[:k]
+
+    def merge(self, other):
+        # Merges another summary: items missing from one side are charged that side's smallest count (the most
+        # they could have had there), then only the `capacity` largest combined counts are kept.
+        own_floor = self.counts.peek()[0] if len(self.counts) == self.capacity else 0
+        other_floor = other.counts.peek()[0] if len(other.counts) == other.capacity else 0
+        combined = {}
+        for item in set(self.counts.positions) | set(other.counts.positions):
+            own_count = self.counts.priority(item) if item in self.counts else own_floor
+            other_count = other.counts.priority(item) if item in other.counts else other_floor
+            error = self.errors.get(item, own_floor) + other.errors.get(item, other_floor)
+            combined[item] = (own_count + other_count, error)
+        self.counts, self.errors = IndexedHeap(), {}
+        for item, (count, error) in sorted(combined.items(), key=lambda entry: -entry[1][0])[:self.capacity]:
+            self.counts.push(item, count)
+            self.errors[item] = error
+        return self
+
+
+class PostManagerWithSketch:
+    """Approximate drop-in for PostManagerWithPriority with a fixed memory footprint.
+
+    A Count-Min Sketch estimates the views of any post and a Space-Saving summary keeps the heaviest posts for
+    top-k queries. Both are keyed by post_key, so the same post counted on several shards merges into one item.
+    Memory depends only on epsilon, delta and capacity, not on the number of posts.
+
+    Attributes:
+        sketch (CountMinSketch): View estimates of every post.
+        heavy_hitters (SpaceSaving): The heaviest post keys.
+        posts (dict): Post key to the post object returned by top_k, for tracked keys only.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01, capacity=100, seed=0):
+        self.sketch = CountMinSketch(epsilon, delta, seed)
+        self.heavy_hitters = SpaceSaving(capacity)
+        self.posts = {}
+
+    def add_post(self, post, views):
+        self.increment_views(post, views)
+
+    def increment_views(self, post, delta=1):
+        key = post_key(post)
+        self.sketch.add(key, delta)
+        self.heavy_hitters.add(key, delta)
+        self.posts.setdefault(key, post)
+        if len(self.posts) > 2 * self.heavy_hitters.capacity:
+            self._forget_untracked()
+
+    def _forget_untracked(self):
+        # Drops the posts of keys that Space-Saving has evicted, keeping memory bounded by the capacity.
+        self.posts = {key: post for key, post in self.posts.items() if key in self.heavy_hitters.counts}
+
+    def estimate_views(self, post):
+        # Both structures only ever overestimate, so the smaller answer is the better one.
+        key = post_key(post)
+        if key in self.heavy_hitters.counts:
+            return min(self.sketch.estimate(key), self.heavy_hitters.estimate(key))
+        return self.sketch.estimate(key)
+
+    def top_k(self, k):
+        return [PostWithViews(self.posts[key], self.estimate_views(key)) for _, key in self.heavy_hitters.top_k(k)]
+
+    def get_most_viewed_post(self):
+        top = self.top_k(1)
+        return top[0] if top else "No posts available"
+
+    def merge(self, other):
+        # Folds in the sketch of another shard built with the same settings.
+        self.sketch.merge(other.sketch)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        for key, post in other.posts.items():
+            self.posts.setdefault(key, post)
+        self._forget_untracked()
+        return self
+
+    def memory_usage(self):
+        # Bytes used by the sketch counters plus a rough per-entry cost of the tracked heavy hitters.
+        return self.sketch.memory_usage() + 200 * len(self.heavy_hitters)
+
+
+# Function to replay (post, views) events into an exact and an approximate manager and report how far the
+# approximate top-k is from the exact one.
+def compare_top_k(events, k=10, **sketch_options):
+    exact, approximate = PostManagerWithPriority(), PostManagerWithSketch(**sketch_options)
+    for post, views in events:
+        exact.increment_views(post, views)
+        approximate.increment_views(post, views)
+    exact_top = {post_key(entry.post): -entry.views for entry in exact.top_k(k)}
+    approximate_top = {post_key(entry.post): -entry.views for entry in approximate.top_k(k)}
+    errors = [abs(approximate.estimate_views(key) - views) / max(views, 1) for key, views in exact_top.items()]
+    return {
+        "recall": len(exact_top.keys() & approximate_top.keys()) / max(len(exact_top), 1),
+        "max_relative_error": max(errors, default=0.0),
+        "exact_posts": len(exact.heap),
+        "sketch_bytes": approximate.memory_usage(),
+    }
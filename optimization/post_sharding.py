@@ -0,0 +1,218 @@
+"""Sharded, thread-safe post manager."""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from .post_analytics import stable_hash
+from .posts import DatetimeIndex, Post, datetime_to_epoch, epoch_to_datetime
+from .telemetry import instrumented_method
+
+
+# Code for Part 22: Sharded Thread-Safe Post Manager
+class ReadWriteLock:
+    """Lock that lets any number of readers in at once, or one writer alone.
+
+    Writers are preferred: once a writer is waiting, new readers wait too, so a steady stream of range queries
+    cannot starve ingest.
+
+    Attributes:
+        readers (int): Number of readers currently holding the lock.
+        writer (bool): Whether a writer currently holds the lock.
+        waiting_writers (int): Number of writers waiting for the lock.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self.condition:
+            while self.writer or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writer = False
+                self.condition.notify_all()
+
+
+class ShardedPostManager:
+    """Post manager split into shards that each have their own DatetimeIndex and ReadWriteLock.
+
+    Posts are routed to a shard by a stable hash of their user, or by time bucket with partition="time". Writers
+    on different shards never block each other, and readers only wait for writers on the shard they are reading.
+    Every post gets a number from one shared arrival sequence, so merging the shards gives the same order as a
+    single PostManagerWithRange fed the posts in that sequence. Range queries page through each shard, holding its
+    read lock only while a page is copied.
+
+    Attributes:
+        shards (list): DatetimeIndex of every shard.
+        locks (list): ReadWriteLock of every shard.
+        partition (str): "user" or "time".
+        bucket_width (timedelta): Width of a time bucket when partition="time".
+    """
+
+    def __init__(self, num_shards=8, partition="user", bucket_width=timedelta(hours=1)):
+        if partition not in ("user", "time"):
+            raise ValueError(f"Unknown partition: {partition!r}")
+        self.partition = partition
+        self.bucket_width = bucket_width
+        self.shards = [DatetimeIndex() for _ in range(num_shards)]
+        self.locks = [ReadWriteLock() for _ in range(num_shards)]
+        # next() on an itertools.count is atomic under the GIL, so writers can share it without a lock. Numbers are
+        # only taken while holding the write lock of the target shard, so each shard receives them in order, and
+        # DatetimeIndex.add sends any key that still lands out of order to its late index.
+        self.sequence = itertools.count()
+
+    def shard_of(self, post):
+        # Index of the shard that stores this post.
+        if self.partition == "user":
+            return stable_hash(post.postUser) % len(self.shards)
+        bucket = datetime_to_epoch(post.postDatetime) // int(self.bucket_width.total_seconds())
+        return bucket % len(self.shards)
+
+    @instrumented_method
+    def add_post(self, post):
+        shard = self.shard_of(post)
+        with self.locks[shard].write():
+            self.shards[shard].add(post.postDatetime, post, next(self.sequence))
+
+    @instrumented_method
+    def add_posts(self, posts):
+        # Batched ingest: the posts are grouped by shard first, so each shard's write lock is taken once per batch
+        # rather than once per post, and only one shard is locked at a time. Sequence numbers are taken under that
+        # shard's lock, so each shard receives them in order; posts of one batch keep their list order per shard.
+        batches = {}
+        for post in posts:
+            batches.setdefault(self.shard_of(post), []).append(post)
+        for shard, batch in batches.items():
+            with self.locks[shard].write():
+                index = self.shards[shard]
+                for post in batch:
+                    index.add(post.postDatetime, post, next(self.sequence))
+
+    def _shard_pages(self, shard, start_datetime, end_datetime, page_size):
+        # Yields one shard's matching (key, post) pairs, copying page_size of them at a time under its read lock and
+        # resuming after the last key copied. Posts that arrive later are included if they sort after that key.
+        index, lock = self.shards[shard], self.locks[shard]
+        after = None
+        while True:
+            with lock.read():
+                page = list(itertools.islice(index.iter_range(start_datetime, end_datetime, after=after), page_size))
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page[-1][0]
+
+    def iter_posts_in_range(self, start_datetime, end_datetime, limit=None, page_size=1024):
+        # k-way merge of the shards by (datetime, sequence), yielding posts lazily. No shard is asked for more than
+        # limit posts at once, since the merged result can never need more than that from any one shard.
+        page_size = page_size if limit is None else max(1, min(page_size, limit))
+        pages = [self._shard_pages(shard, start_datetime, end_datetime, page_size) for shard in range(len(self.shards))]
+        merged = heapq.merge(*pages, key=lambda item: item[0])
+        return (post for _, post in itertools.islice(merged, limit))
+
+    @instrumented_method
+    def find_posts_in_range(self, start_datetime, end_datetime, limit=None):
+        # Posts between the two datetimes (inclusive), ordered by datetime and then arrival, at most limit of them.
+        return list(self.iter_posts_in_range(start_datetime, end_datetime, limit))
+
+    def find_posts_by_datetime(self, datetime):
+        return self.find_posts_in_range(datetime, datetime)
+
+    @instrumented_method
+    def find_post_by_datetime(self, datetime):
+        # Like PostManager: the most recently added post with exactly this datetime, or 'Post not found'.
+        posts = self.find_posts_by_datetime(datetime)
+        return posts[-1] if posts else "Post not found"
+
+    @instrumented_method
+    def count_posts_in_range(self, start_datetime, end_datetime):
+        total = 0
+        for index, lock in zip(self.shards, self.locks):
+            with lock.read():
+                total += index.count_range(start_datetime, end_datetime)
+        return total
+
+    def __len__(self):
+        return sum(len(index) for index in self.shards)
+
+
+# Benchmark of mixed read/write throughput: writer threads ingest batches with add_posts while reader threads
+# run range queries, for each shard count. Returns {num_shards: (posts written/s, queries/s)}.
+def benchmark_sharded_posts(num_posts=200_000, shard_counts=(1, 8), readers=4, writers=2, batch_size=500,
+                            window=timedelta(hours=1), seed=0):
+    # NumPy is only needed to generate the benchmark data, so importing the manager does not load it.
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 60 * 24 * 30, num_posts)
+    users = rng.integers(0, 1000, num_posts)
+    posts = [Post(epoch_to_datetime(60 * int(minute)), f"post {i}", f"user{user}")
+             for i, (minute, user) in enumerate(zip(minutes, users))]
+    batches = [posts[i:i + batch_size] for i in range(0, num_posts, batch_size)]
+
+    results = {}
+    for num_shards in shard_counts:
+        manager = ShardedPostManager(num_shards)
+        queue = iter(batches)
+        queue_lock = threading.Lock()
+        done = threading.Event()
+        queries = [0] * readers
+
+        def write():
+            while True:
+                with queue_lock:
+                    batch = next(queue, None)
+                if batch is None:
+                    return
+                manager.add_posts(batch)
+
+        def read(reader):
+            query_rng = np.random.default_rng(seed + reader + 1)
+            while not done.is_set():
+                start = epoch_to_datetime(60 * int(query_rng.integers(0, 60 * 24 * 30)))
+                manager.find_posts_in_range(start, start + window, limit=100)
+                queries[reader] += 1
+
+        threads = [threading.Thread(target=read, args=(reader,)) for reader in range(readers)]
+        write_threads = [threading.Thread(target=write) for _ in range(writers)]
+        started = time.perf_counter()
+        for thread in threads + write_threads:
+            thread.start()
+        for thread in write_threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        done.set()
+        for thread in threads:
+            thread.join()
+
+        results[num_shards] = (len(manager) / elapsed, sum(queries) / elapsed)
+        print(f"{num_shards} shard(s): {results[num_shards][0]:,.0f} posts/s written, "
+              f"{results[num_shards][1]:,.0f} range queries/s")
+    return results
@@ -0,0 +1,467 @@
+"""Columnar in-memory post storage, vectorized datetime parsing and the persistent on-disk post index."""
+
+import bisect
+import heapq
+import json
+import mmap
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from sortedcontainers import SortedList
+
+from .posts import Post, create_datetime, datetime_to_epoch, epoch_to_datetime
+from .telemetry import instrumented_method
+
+
+# Code for Part 14: Columnar Post Store
+class PostView(Post):
+    """Lightweight Post that reads its fields from a ColumnarPostStore row only when they are accessed."""
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    @property
+    def postDatetime(self):
+        return epoch_to_datetime(self.store.timestamps[self.row])
+
+    @property
+    def postContent(self):
+        return self.store.content_at(self.row)
+
+    @property
+    def postUser(self):
+        return self.store.user_names[self.store.user_ids[self.row]]
+
+    def __eq__(self, other):
+        return isinstance(other, PostView) and other.store is self.store and other.row == self.row
+
+    def __hash__(self):
+        return hash((id(self.store), self.row))
+
+
+class ColumnarPostStore:
+    """Memory-compact post store that keeps every post as a row of flat columns instead of a Post object.
+
+    While posts arrive in datetime order the rows themselves are sorted and queries binary-search the timestamps
+    column. After the first out-of-order post, the rows that arrived in order are tracked in sorted arrays and the
+    late ones in a small sorted side index, like DatetimeIndex; queries merge the two parts. The side index is
+    folded into the arrays once it outgrows an eighth of them, so no add or query ever re-sorts every row.
+
+    Attributes:
+        timestamps (np.ndarray): int64 seconds since EPOCH of every row.
+        user_ids (np.ndarray): int32 dictionary code of the user of every row.
+        user_names (list): User name of every dictionary code.
+        user_codes (dict): Dictionary code of every user name.
+        content (bytearray): UTF-8 content of all rows, back to back.
+        content_offsets (np.ndarray): Row i's content is content[content_offsets[i]:content_offsets[i + 1]].
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+        self.user_ids = np.empty(capacity, dtype=np.int32)
+        self.content_offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self.user_names = []
+        self.user_codes = {}
+        self.content = bytearray()
+        # Rows that arrived in order and their timestamps, both sorted; None while every row is in order.
+        self._main_rows = None
+        self._main_timestamps = None
+        self._main_size = 0
+        # (timestamp, row) of every row that arrived older than the newest in-order row.
+        self._late = SortedList()
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.size:
+            raise IndexError("post row out of range")
+        return PostView(self, row)
+
+    def _grow(self):
+        # Doubles the capacity of the columns, so appends stay amortized O(1).
+        capacity = 2 * len(self.timestamps)
+        self.timestamps = np.resize(self.timestamps, capacity)
+        self.user_ids = np.resize(self.user_ids, capacity)
+        self.content_offsets = np.resize(self.content_offsets, capacity + 1)
+
+    def add(self, post_datetime, content, user):
+        # Appends one post given as its three fields and returns its row number.
+        if self.size == len(self.timestamps):
+            self._grow()
+        row = self.size
+        timestamp = datetime_to_epoch(post_datetime)
+        self.timestamps[row] = timestamp
+        self._index_rows(np.array([row]), np.array([timestamp]))
+        code = self.user_codes.get(user)
+        if code is None:
+            code = self.user_codes[user] = len(self.user_names)
+            self.user_names.append(user)
+        self.user_ids[row] = code
+        self.content += content.encode("utf-8")
+        self.content_offsets[row + 1] = len(self.content)
+        self.size += 1
+        return row
+
+    @instrumented_method
+    def add_post(self, post):
+        # Adds a Post; the store keeps only its fields, not the object.
+        return self.add(post.postDatetime, post.postContent, post.postUser)
+
+    def add_batch(self, date_strings, contents, users):
+        # Bulk ingestion: parses every "YYYY-MM-DD HH:MM" string in one vectorized call and appends the columns
+        # in bulk instead of one add() per post.
+        timestamps = parse_datetimes_to_epoch(date_strings)
+        while self.size + len(timestamps) > len(self.timestamps):
+            self._grow()
+        start, end = self.size, self.size + len(timestamps)
+        self.timestamps[start:end] = timestamps
+        self._index_rows(np.arange(start, end), timestamps)
+        codes = self.user_codes
+        for row, user in enumerate(users, start):
+            code = codes.get(user)
+            if code is None:
+                code = codes[user] = len(self.user_names)
+                self.user_names.append(user)
+            self.user_ids[row] = code
+        encoded = [content.encode("utf-8") for content in contents]
+        self.content_offsets[start + 1:end + 1] = len(self.content) + np.cumsum([len(chunk) for chunk in encoded])
+        self.content += b"".join(encoded)
+        self.size = end
+
+    def content_at(self, row):
+        return self.content[self.content_offsets[row]:self.content_offsets[row + 1]].decode("utf-8")
+
+    def _index_rows(self, rows, timestamps):
+        # Files newly added rows as in order or late. A row is in order when it is no older than every row before
+        # it, which is the running maximum of the timestamps seen so far.
+        if not len(rows):
+            return
+        first = int(rows[0])
+        newest = self.timestamps[first - 1] if self._main_rows is None else self._main_timestamps[self._main_size - 1]
+        if first:
+            running = np.maximum.accumulate(np.concatenate(([newest], timestamps[:-1])))
+        else:
+            running = np.concatenate(([timestamps[0]], np.maximum.accumulate(timestamps[:-1])))
+        in_order = timestamps >= running
+        if self._main_rows is None:
+            if in_order.all():
+                return
+            # First late row: from now on the in-order rows are no longer simply 0..size-1.
+            self._main_rows = np.arange(len(self.timestamps), dtype=np.int64)
+            self._main_timestamps = self.timestamps.copy()
+            self._main_size = first
+        main_rows, main_timestamps = rows[in_order], timestamps[in_order]
+        while self._main_size + len(main_rows) > len(self._main_rows):
+            self._main_rows = np.resize(self._main_rows, 2 * len(self._main_rows))
+            self._main_timestamps = np.resize(self._main_timestamps, 2 * len(self._main_timestamps))
+        end = self._main_size + len(main_rows)
+        self._main_rows[self._main_size:end] = main_rows
+        self._main_timestamps[self._main_size:end] = main_timestamps
+        self._main_size = end
+        late = ~in_order
+        self._late.update(zip(timestamps[late].tolist(), rows[late].tolist()))
+        if len(self._late) > max(1024, self._main_size // 8):
+            self._fold_late()
+
+    def _fold_late(self):
+        # Merges the side index into the sorted arrays; amortized over the adds that filled it, this is O(log n).
+        late = np.array(list(self._late), dtype=np.int64).reshape(-1, 2)
+        rows = np.concatenate((self._main_rows[:self._main_size], late[:, 1]))
+        timestamps = np.concatenate((self._main_timestamps[:self._main_size], late[:, 0]))
+        order = np.lexsort((rows, timestamps))
+        capacity = max(len(self._main_rows), len(rows))
+        self._main_rows = np.resize(rows[order], capacity)
+        self._main_timestamps = np.resize(timestamps[order], capacity)
+        self._main_size = len(rows)
+        self._late.clear()
+
+    def _rows_between(self, start_timestamp, end_timestamp):
+        # Rows with a timestamp between the two (inclusive), ordered by timestamp and then by row.
+        if self._main_rows is None:
+            timestamps = self.timestamps[:self.size]
+            lo = np.searchsorted(timestamps, start_timestamp, side="left")
+            hi = np.searchsorted(timestamps, end_timestamp, side="right")
+            return np.arange(lo, hi)
+        timestamps = self._main_timestamps[:self._main_size]
+        lo = np.searchsorted(timestamps, start_timestamp, side="left")
+        hi = np.searchsorted(timestamps, end_timestamp, side="right")
+        late = [row for _, row in self._late.irange((start_timestamp,), (end_timestamp, float('infinity')))]
+        if not late:
+            return self._main_rows[lo:hi]
+        rows = np.concatenate((self._main_rows[lo:hi], late))
+        return rows[np.lexsort((rows, self.timestamps[rows]))]
+
+    @instrumented_method
+    def find_post_by_datetime(self, datetime):
+        # Like PostManager: returns the most recently added post with exactly this datetime, or 'Post not found'.
+        timestamp = datetime_to_epoch(datetime)
+        rows = self._rows_between(timestamp, timestamp)
+        if len(rows) == 0:
+            return "Post not found"
+        return PostView(self, int(rows.max()))
+
+    @instrumented_method
+    def find_posts_in_range(self, start_datetime, end_datetime):
+        # Like PostManagerWithRange: returns the posts between the two datetimes (inclusive), oldest first.
+        rows = self._rows_between(datetime_to_epoch(start_datetime), datetime_to_epoch(end_datetime))
+        return [PostView(self, row) for row in rows.tolist()]
+
+    def memory_usage(self):
+        # Bytes held by the columns (excluding the per-user name strings).
+        return (self.timestamps.nbytes + self.user_ids.nbytes + self.content_offsets.nbytes + len(self.content))
+
+    def __repr__(self):
+        return f"ColumnarPostStore(posts={self.size}, users={len(self.user_names)}, bytes={self.memory_usage()})"
+
+
+# Code for Part 20: Vectorized Datetime Parsing
+# Function to turn many "YYYY-MM-DD HH:MM" strings into int64 seconds since EPOCH in one NumPy call.
+def parse_datetimes_to_epoch(date_strings):
+    minutes = np.asarray(date_strings, dtype="datetime64[m]")
+    return minutes.astype(np.int64) * 60
+
+
+# Benchmark of the create_datetime fast path and the vectorized parser against datetime.strptime.
+def benchmark_datetime_parsing(count=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 60 * 24 * 365 * 5, count) + 52 * 365 * 24 * 60
+    date_strings = np.datetime_as_string(minutes.astype("datetime64[m]")).astype(object)
+    date_strings = [value.replace("T", " ") for value in date_strings]
+
+    results = {}
+    started = time.perf_counter()
+    expected = [datetime.strptime(value, "%Y-%m-%d %H:%M") for value in date_strings]
+    results["strptime"] = time.perf_counter() - started
+    started = time.perf_counter()
+    parsed = [create_datetime(value) for value in date_strings]
+    results["create_datetime"] = time.perf_counter() - started
+    started = time.perf_counter()
+    epochs = parse_datetimes_to_epoch(date_strings)
+    results["parse_datetimes_to_epoch"] = time.perf_counter() - started
+
+    matches = parsed == expected and epochs.tolist() == [datetime_to_epoch(value) for value in expected]
+    for name, seconds in results.items():
+        print(f"{name}: {count / seconds:,.0f} strings/s ({results['strptime'] / seconds:.1f}x strptime)")
+    return results, matches
+
+
+# Code for Part 21: Persistent Post Index with Memory-Mapped Segments
+class PostSegment:
+    """Immutable on-disk run of posts sorted by timestamp, opened with memory mapping.
+
+    Opening a segment only maps its files; pages are read from disk when a query touches them, so the resident
+    memory follows the queried working set rather than the size of the segment.
+
+    Attributes:
+        name (str): File name prefix of the segment inside the index directory.
+        timestamps (np.memmap): Sorted int64 seconds since EPOCH.
+        sequences (np.memmap): Global arrival number of every post, which orders posts sharing a timestamp.
+        user_ids (np.memmap): int32 code of every post's user, into user_names.
+        content_offsets (np.memmap): Post i's content is content[content_offsets[i]:content_offsets[i + 1]].
+        user_names (list): User name of every code.
+    """
+
+    COLUMNS = ("timestamps", "sequences", "user_ids", "content_offsets")
+
+    def __init__(self, directory, name):
+        self.name = name
+        base = os.path.join(directory, name)
+        for column in self.COLUMNS:
+            setattr(self, column, np.load(f"{base}.{column}.npy", mmap_mode="r"))
+        with open(f"{base}.users.json") as file:
+            self.user_names = json.load(file)
+        with open(f"{base}.content.bin", "rb") as file:
+            # mmap cannot map an empty file, so an empty content buffer is kept as plain bytes.
+            self.content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(file.fileno()).st_size else b""
+
+    @staticmethod
+    def write(directory, name, timestamps, sequences, users, contents):
+        # Writes a segment from columns that are already sorted by (timestamp, sequence).
+        base = os.path.join(directory, name)
+        user_names, user_ids = [], []
+        codes = {}
+        for user in users:
+            if user not in codes:
+                codes[user] = len(user_names)
+                user_names.append(user)
+            user_ids.append(codes[user])
+        encoded = [content.encode("utf-8") for content in contents]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        columns = {"timestamps": np.asarray(timestamps, dtype=np.int64), "sequences": np.asarray(sequences, dtype=np.int64),
+                   "user_ids": np.asarray(user_ids, dtype=np.int32), "content_offsets": offsets}
+        for column, values in columns.items():
+            np.save(f"{base}.{column}.npy", values)
+        with open(f"{base}.users.json", "w") as file:
+            json.dump(user_names, file)
+        with open(f"{base}.content.bin", "wb") as file:
+            file.write(b"".join(encoded))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def rows_between(self, start_timestamp, end_timestamp):
+        # Binary search directly over the mapped timestamps; only the touched pages are read.
+        lo = int(np.searchsorted(self.timestamps, start_timestamp, side="left"))
+        hi = int(np.searchsorted(self.timestamps, end_timestamp, side="right"))
+        return lo, hi
+
+    def entries(self, lo, hi):
+        # Yields ((timestamp, sequence), Post) for rows [lo, hi), decoding each post only when it is reached.
+        for row in range(lo, hi):
+            content = bytes(self.content[self.content_offsets[row]:self.content_offsets[row + 1]]).decode("utf-8")
+            timestamp = int(self.timestamps[row])
+            yield (timestamp, int(self.sequences[row])), Post(epoch_to_datetime(timestamp), content,
+                                                              self.user_names[self.user_ids[row]])
+
+    def close(self):
+        if isinstance(self.content, mmap.mmap):
+            self.content.close()
+
+
+class PersistentPostManager:
+    """Post index stored on disk as sorted immutable segments plus a write-ahead log of recent posts.
+
+    New posts are appended to the write-ahead log and kept in a small in-memory buffer. Once the buffer reaches
+    segment_size posts it is sorted and written out as a new PostSegment. Reopening the directory maps the
+    segments and replays only the log, so a restart takes milliseconds instead of re-adding every post.
+
+    Attributes:
+        directory (str): Directory holding the manifest, the log and the segment files.
+        segments (list): Open PostSegment objects, oldest first.
+        buffer (list): ((timestamp, sequence), Post) entries not yet written to a segment, sorted.
+    """
+
+    def __init__(self, directory, segment_size=100_000, sync=False):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync = sync  # fsync the log after every post, for durability across power loss
+        os.makedirs(directory, exist_ok=True)
+        manifest = self._read_manifest()
+        self.segments = [PostSegment(directory, name) for name in manifest["segments"]]
+        self.next_segment = manifest["next_segment"]
+        self.sequence = manifest["next_sequence"]
+        self.buffer = []
+        self._replay_log()
+        self.log = open(self._path("wal.log"), "a", encoding="utf-8")
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self):
+        try:
+            with open(self._path("manifest.json")) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {"segments": [], "next_segment": 0, "next_sequence": 0}
+
+    def _write_manifest(self):
+        # Write to a temporary file and rename, so a crash never leaves a half-written manifest behind.
+        temporary = self._path("manifest.json.tmp")
+        with open(temporary, "w") as file:
+            json.dump({"segments": [segment.name for segment in self.segments], "next_segment": self.next_segment,
+                       "next_sequence": self.sequence}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self._path("manifest.json"))
+
+    def _replay_log(self):
+        # Entries below the manifest's next sequence are already in a segment (a crash between writing the manifest
+        # and emptying the log), so they are skipped. A torn last line is cut off, otherwise new posts would be
+        # appended after it and lost on the next replay.
+        covered = self.sequence
+        try:
+            with open(self._path("wal.log"), "r+b") as file:
+                intact = 0
+                for line in file:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated log line")
+                        timestamp, sequence, content, user = json.loads(line)
+                    except ValueError:
+                        break  # A torn last line from a crash mid-write; everything before it is intact.
+                    intact += len(line)
+                    if sequence >= covered:
+                        self._buffer_post((timestamp, sequence), Post(epoch_to_datetime(timestamp), content, user))
+                        self.sequence = max(self.sequence, sequence + 1)
+                if intact < file.seek(0, os.SEEK_END):
+                    file.truncate(intact)
+        except FileNotFoundError:
+            pass
+
+    def _buffer_post(self, key, post):
+        if not self.buffer or key >= self.buffer[-1][0]:
+            self.buffer.append((key, post))
+        else:
+            bisect.insort(self.buffer, (key, post), key=lambda entry: entry[0])
+
+    @instrumented_method
+    def add_post(self, post):
+        key = (datetime_to_epoch(post.postDatetime), self.sequence)
+        self.sequence += 1
+        self.log.write(json.dumps([key[0], key[1], post.postContent, post.postUser]) + "\n")
+        self.log.flush()
+        if self.sync:
+            os.fsync(self.log.fileno())
+        self._buffer_post(key, post)
+        if len(self.buffer) >= self.segment_size:
+            self.flush()
+
+    @instrumented_method
+    def flush(self):
+        # Writes the buffered posts out as a new segment and empties the write-ahead log.
+        if not self.buffer:
+            return
+        name = f"segment-{self.next_segment:06d}"
+        keys = [key for key, _ in self.buffer]
+        PostSegment.write(self.directory, name, [key[0] for key in keys], [key[1] for key in keys],
+                          [post.postUser for _, post in self.buffer], [post.postContent for _, post in self.buffer])
+        self.segments.append(PostSegment(self.directory, name))
+        self.next_segment += 1
+        self._write_manifest()
+        # The manifest now covers these posts, so the log can start over.
+        self.log.close()
+        self.log = open(self._path("wal.log"), "w", encoding="utf-8")
+        self.buffer = []
+
+    def _iter_range(self, start_datetime, end_datetime):
+        start, end = datetime_to_epoch(start_datetime), datetime_to_epoch(end_datetime)
+        sources = [segment.entries(*segment.rows_between(start, end)) for segment in self.segments]
+        lo = bisect.bisect_left(self.buffer, (start,), key=lambda entry: entry[0])
+        hi = bisect.bisect_left(self.buffer, (end, float('infinity')), key=lambda entry: entry[0])
+        sources.append(iter(self.buffer[lo:hi]))
+        return heapq.merge(*sources, key=lambda entry: entry[0])
+
+    @instrumented_method
+    def find_posts_in_range(self, start_datetime, end_datetime):
+        # Posts between the two datetimes (inclusive) from every segment and the buffer, in datetime order.
+        return [post for _, post in self._iter_range(start_datetime, end_datetime)]
+
+    @instrumented_method
+    def find_post_by_datetime(self, datetime):
+        # Like PostManager: the most recently added post with exactly this datetime, or 'Post not found'.
+        posts = self.find_posts_in_range(datetime, datetime)
+        return posts[-1] if posts else "Post not found"
+
+    @instrumented_method
+    def count_posts_in_range(self, start_datetime, end_datetime):
+        start, end = datetime_to_epoch(start_datetime), datetime_to_epoch(end_datetime)
+        total = sum(hi - lo for lo, hi in (segment.rows_between(start, end) for segment in self.segments))
+        lo = bisect.bisect_left(self.buffer, (start,), key=lambda entry: entry[0])
+        hi = bisect.bisect_left(self.buffer, (end, float('infinity')), key=lambda entry: entry[0])
+        return total + hi - lo
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments) + len(self.buffer)
+
+    def close(self):
+        self.log.close()
+        for segment in self.segments:
+            segment.close()
@@ -0,0 +1,351 @@
+"""Social media posts and the managers that index them by datetime, user and views."""
+
+import bisect
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+
+from sortedcontainers import SortedDict
+
+from .heaps import IndexedHeap
+from .telemetry import instrumented_method
+
+
+# Helper function to create datetime objects easily
+def create_datetime(date_str):
+    # Fast path for the fixed "YYYY-MM-DD HH:MM" layout: the C parser behind fromisoformat is many times faster
+    # than strptime, which also takes a lock on every call. Anything else falls back to strptime, which gives the
+    # usual errors.
+    if (len(date_str) == 16 and date_str[4] == "-" and date_str[7] == "-" and date_str[10] == " "
+            and date_str[13] == ":" and date_str.isascii()):
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    # This function uses strptime from the datetime module to convert a date string into a datetime object.
+    return datetime.strptime(date_str, "%Y-%m-%d %H:%M")
+
+
+class Post:
+    """Creating Class representing a social media post with datetime, content, and user attributes."""
+
+    def __init__(self, postDatetime, postContent, postUser):
+        self.postDatetime = postDatetime
+        self.postContent = postContent
+        self.postUser = postUser
+
+    def __repr__(self):
+        # Adding a function that summarizes the attributes for Post object
+        return f"Post(datetime={self.postDatetime}, content='{self.postContent}', user='{self.postUser}')"
+
+
+class PostManager:
+    """Creating a Class that Manages posts through hash table with the post datetime as the key"""
+
+    def __init__(self):
+        # Creating a dictionary to store the data of the post, with every post sharing a datetime in arrival order
+        self.posts_by_datetime = {}
+
+    @instrumented_method
+    def add_post(self, post):
+        # Adding a function that sdds a post to the hash table
+        self.posts_by_datetime.setdefault(post.postDatetime, []).append(post)
+
+    @instrumented_method
+    def find_post_by_datetime(self, datetime):
+        # Creating a function that finds a post by datetime. Returns the most recently added post at that datetime
+        # or 'Post not found' if not present
+        posts = self.posts_by_datetime.get(datetime)
+        return posts[-1] if posts else "Post not found"
+
+    @instrumented_method
+    def find_posts_by_datetime(self, datetime):
+        # Returns every post with this datetime in the order they were added (an empty list if there are none)
+        return list(self.posts_by_datetime.get(datetime, ()))
+
+
+class PostManagerWithRange:
+    """Adding a class that will be in charge of managing posts bySortedDict to generate efficient range queries"""
+
+    def __init__(self, rollups=None):
+        # Initializes the init constructor for storing data efficently
+        # Index keyed by (datetime, sequence) so posts sharing a datetime are all kept
+        self.datetime_index = DatetimeIndex()
+        # Optional PostRollups kept up to date with every added post, for histogram queries
+        self.rollups = rollups
+        # Per-user timelines sharing the datetime index's sequence numbers, for feed queries
+        self.user_timelines = UserTimelineIndex()
+
+    @instrumented_method
+    def add_post(self, post):
+        # This function is created to add a post to the datetime index and its user's timeline
+        _, sequence = self.datetime_index.add(post.postDatetime, post)
+        self.user_timelines.add(post, sequence)
+        if self.rollups is not None:
+            self.rollups.add_post(post)
+
+    @property
+    def sorted_posts(self):
+        # The SortedDict of datetime -> post this class used to keep is gone: rebuilding it would copy every post.
+        raise AttributeError("sorted_posts was removed; query datetime_index or use find_posts_in_range instead")
+
+    @instrumented_method
+    def find_posts_in_range(self, start_datetime, end_datetime):
+        # This function will retreive and get the posts depending on their specified datetime range.
+        # Posts sharing a datetime are all returned, in the order they were added.
+        return self.datetime_index.find_range(start_datetime, end_datetime)
+
+    def iter_posts_in_range(self, start_datetime, end_datetime, reverse=False, offset=0, limit=None):
+        # Generator version of find_posts_in_range that yields posts one at a time, newest first with reverse=True.
+        # offset skips that many posts and limit stops after that many, without building a list.
+        posts = (post for _, post in self.datetime_index.iter_range(start_datetime, end_datetime, reverse))
+        return itertools.islice(posts, offset, None if limit is None else offset + limit)
+
+    @instrumented_method
+    def page_posts_in_range(self, start_datetime, end_datetime, limit, cursor=None, reverse=False):
+        # Keyset pagination: returns (posts, next_cursor) for the page that follows cursor. Pass next_cursor back
+        # in to get the next page; it is None once the range is exhausted. Unlike an offset, a cursor costs
+        # O(log n) however deep the page, and stays stable while new posts are added.
+        page = list(itertools.islice(
+            self.datetime_index.iter_range(start_datetime, end_datetime, reverse, after=cursor), limit + 1))
+        next_cursor = page[limit - 1][0] if len(page) > limit else None
+        return [post for _, post in page[:limit]], next_cursor
+
+    @instrumented_method
+    def count_posts_in_range(self, start_datetime, end_datetime):
+        # Counts the posts in the range from index positions only, without touching any post
+        return self.datetime_index.count_range(start_datetime, end_datetime)
+
+    @instrumented_method
+    def find_posts_by_user(self, user, start_datetime=datetime.min, end_datetime=datetime.max):
+        # Posts by one user between the two datetimes (inclusive), oldest first
+        return self.user_timelines.find_range(user, start_datetime, end_datetime)
+
+    @instrumented_method
+    def feed(self, users, limit, start_datetime=datetime.min, end_datetime=datetime.max):
+        # The newest limit posts by any of these users between the two datetimes, newest first
+        return self.user_timelines.feed(users, limit, start_datetime, end_datetime)
+
+
+class PostWithViews:
+    """Creating a class for Wrapper class for Post to handle the max-heap by views"""
+
+    def __init__(self, post, views):
+        self.post = post
+        self.views = -views  # Undo views for max-heap functionality
+
+    def __lt__(self, other):
+        # This function Ensure proper ordering in the heapq by views
+        return self.views < other.views
+
+    def __repr__(self):
+        # Readable representation of the object for debugging and logging
+        return f"{-self.views}, {self.post}"
+
+
+class PostManagerWithPriority:
+    """Creating a class that Manages posts with a priority queue to easily fetch the post with the most views"""
+
+    def __init__(self, half_life=None):
+        # Indexed heap of posts keyed by negated views, so views can change in place in O(log n)
+        self.heap = IndexedHeap()
+        # With a half-life (in seconds) the manager ranks trending posts: every view loses half its weight per
+        # half-life. Views are stored scaled up by 2 ** ((t - reference) / half_life) at the time they arrive,
+        # which decays every post at the same rate and so never changes the heap order as time passes.
+        self.half_life = half_life
+        self.reference = None
+
+    def _weight(self, at):
+        # Forward-decay weight of a view arriving at time `at` (seconds; defaults to now).
+        if self.half_life is None:
+            return 1
+        at = time.time() if at is None else at
+        if self.reference is None:
+            self.reference = at
+        exponent = (at - self.reference) / self.half_life
+        if exponent > 512:
+            # Move the reference forward before the scaled scores overflow; all scores shrink by the same factor.
+            self._rebase(at)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rebase(self, at):
+        factor = 2.0 ** (-(at - self.reference) / self.half_life)
+        for entry in self.heap.heap:
+            entry[0] *= factor
+        self.reference = at
+
+    def _current_views(self, score, at=None):
+        # Converts a stored score back into views as of time `at` (seconds; defaults to now).
+        if self.half_life is None:
+            return score
+        at = time.time() if at is None else at
+        return score * 2.0 ** (-(at - self.reference) / self.half_life)
+
+    @instrumented_method
+    def add_post(self, post, views, at=None):
+        # This function Adds a post with its views to the heap; adding a post again replaces its views
+        score = views * self._weight(at)
+        if post in self.heap:
+            self.heap.update(post, -score)
+        else:
+            self.heap.push(post, -score)
+
+    @instrumented_method
+    def increment_views(self, post, delta=1, at=None):
+        # Adds delta views to a post in O(log n); a post that is not tracked yet starts from zero views
+        score = delta * self._weight(at)
+        if post in self.heap:
+            self.heap.update(post, self.heap.priority(post) - score)
+        else:
+            self.heap.push(post, -score)
+
+    @instrumented_method
+    def remove_post(self, post):
+        # Stops tracking a post in O(log n)
+        if post not in self.heap:
+            return "Post not found"
+        self.heap.remove(post)
+
+    @instrumented_method
+    def get_most_viewed_post(self):
+        # This function Retrieves the post with the most views
+        if self.heap:
+            priority, post = self.heap.peek()  # The smallest negated score is the largest by views
+            return PostWithViews(post, self._current_views(-priority))
+        return "No posts available"
+
+    @instrumented_method
+    def top_k(self, k, at=None):
+        # Returns the k most viewed (or, with a half-life, most trending) posts, most viewed first, in O(k log k)
+        return [PostWithViews(post, self._current_views(-priority, at)) for priority, post in self.heap.smallest(k)]
+
+
+# Post timestamps are stored as whole seconds since this epoch.
+EPOCH = datetime(1970, 1, 1)
+
+
+# Function to convert a datetime into int64 seconds since EPOCH, and back.
+def datetime_to_epoch(value):
+    return (value - EPOCH) // timedelta(seconds=1)
+
+
+def epoch_to_datetime(seconds):
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+# Code for Part 15: Multi-Valued Datetime Index
+class DatetimeIndex:
+    """Sorted index keyed by (datetime, sequence) that keeps every post, even when many share a datetime.
+
+    Posts usually arrive in datetime order, so they are appended to a plain sorted list in O(1). The rare post
+    older than the newest one goes into a SortedDict in O(log n) instead. Lookups merge the two parts.
+
+    Attributes:
+        keys (list): (datetime, sequence) keys of the in-order posts, sorted.
+        values (list): The in-order posts, matching keys.
+        late (SortedDict): Posts that arrived out of order, keyed by (datetime, sequence).
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.values = []
+        self.late = SortedDict()
+        # The sequence number orders posts that share a datetime by arrival.
+        self.sequence = itertools.count()
+
+    def __len__(self):
+        return len(self.keys) + len(self.late)
+
+    def add(self, key_datetime, value, sequence=None):
+        # sequence can be passed in when several indexes must share one arrival order (see ShardedPostManager).
+        key = (key_datetime, next(self.sequence) if sequence is None else sequence)
+        # The whole key is compared: a passed-in sequence can be lower than the last one at the same datetime.
+        if not self.keys or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.values.append(value)
+        else:
+            self.late[key] = value
+        return key
+
+    def _bounds(self, start_datetime, end_datetime):
+        # Positions in self.keys of the first key at or after start and the first key after end.
+        # A one-element tuple sorts before every (datetime, sequence) key with the same datetime.
+        lo = bisect.bisect_left(self.keys, (start_datetime,))
+        hi = bisect.bisect_left(self.keys, (end_datetime, float('infinity')))
+        return lo, hi
+
+    def iter_range(self, start_datetime, end_datetime, reverse=False, after=None):
+        # Yields the (key, value) pairs between the two datetimes (inclusive) in key order, or newest first with
+        # reverse=True. With after set to a key, only pairs that come after that key in this order are yielded.
+        # Nothing is copied: the first pair is found by binary search and the rest are produced on demand.
+        lo, hi = self._bounds(start_datetime, end_datetime)
+        low_key, high_key = (start_datetime,), (end_datetime, float('infinity'))
+        if after is not None:
+            if reverse:
+                hi = min(hi, bisect.bisect_left(self.keys, after))
+                high_key = min(high_key, after)
+            else:
+                lo = max(lo, bisect.bisect_right(self.keys, after))
+                low_key = max(low_key, after)
+        positions = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        in_order = ((self.keys[i], self.values[i]) for i in positions)
+        if not self.late:
+            return in_order
+        # The cursor key itself is excluded, the datetime bounds are inclusive.
+        inclusive = (after is None or reverse, after is None or not reverse)
+        late = ((key, self.late[key]) for key in self.late.irange(low_key, high_key, inclusive, reverse=reverse))
+        return heapq.merge(in_order, late, key=lambda item: item[0], reverse=reverse)
+
+    def count_range(self, start_datetime, end_datetime):
+        # Counts the values between the two datetimes (inclusive) from index positions alone, in O(log n).
+        lo, hi = self._bounds(start_datetime, end_datetime)
+        late_lo = self.late.bisect_left((start_datetime,))
+        late_hi = self.late.bisect_left((end_datetime, float('infinity')))
+        return (hi - lo) + (late_hi - late_lo)
+
+    def find(self, key_datetime):
+        # Returns every value with exactly this datetime, in arrival order.
+        return [value for _, value in self.iter_range(key_datetime, key_datetime)]
+
+    def find_range(self, start_datetime, end_datetime):
+        # Returns every value between the two datetimes (inclusive), ordered by datetime and then arrival.
+        return [value for _, value in self.iter_range(start_datetime, end_datetime)]
+
+
+# Code for Part 23: Per-User Timelines and Feed Merging
+class UserTimelineIndex:
+    """One DatetimeIndex per user, so a user's posts can be read without scanning everyone else's.
+
+    Keys reuse the sequence numbers of the owning manager's datetime index, so posts from different users that
+    share a datetime still merge in arrival order.
+
+    Attributes:
+        timelines (dict): User name to the DatetimeIndex of that user's posts.
+    """
+
+    def __init__(self):
+        self.timelines = {}
+
+    def add(self, post, sequence=None):
+        timeline = self.timelines.get(post.postUser)
+        if timeline is None:
+            timeline = self.timelines[post.postUser] = DatetimeIndex()
+        timeline.add(post.postDatetime, post, sequence)
+
+    def find_range(self, user, start_datetime, end_datetime):
+        timeline = self.timelines.get(user)
+        return timeline.find_range(start_datetime, end_datetime) if timeline is not None else []
+
+    def iter_feed(self, users, start_datetime, end_datetime):
+        # Lazy k-way merge of the users' timelines, newest first. Each timeline is read backwards on demand, so
+        # taking n posts costs O(n log users) after the first post of every timeline is found in O(log posts).
+        timelines = [self.timelines[user] for user in set(users) if user in self.timelines]
+        merged = heapq.merge(*(timeline.iter_range(start_datetime, end_datetime, reverse=True)
+                               for timeline in timelines), key=lambda item: item[0], reverse=True)
+        return (post for _, post in merged)
+
+    def feed(self, users, limit, start_datetime, end_datetime):
+        # Stops as soon as limit posts have been merged; the rest of every timeline is never touched.
+        return list(itertools.islice(self.iter_feed(users, start_datetime, end_datetime), limit))
@@ -0,0 +1,239 @@
+"""2-opt and Or-opt local search for delivery routes."""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from .routing import distance
+from .vectorized import pairwise_distances
+
+
+# Code for Part 12: Route Improvement with 2-opt and Or-opt
+# Function to calculate the total length of a route, optionally including the drive back to the start.
+def route_length(route, closed=False, distance_function=distance):
+    length = sum(distance_function(a, b) for a, b in zip(route, route[1:]))
+    if closed and len(route) > 1:
+        length += distance_function(route[-1], route[0])
+    return length
+
+
+class RouteImprovement:
+    """Result of improve_route.
+
+    Attributes:
+        route (list): The improved route, still beginning at the start location.
+        length_before (float): Length of the route that was passed in.
+        length_after (float): Length of the improved route.
+        two_opt_moves (int): Number of 2-opt moves applied.
+        or_opt_moves (int): Number of Or-opt moves applied.
+        seconds (float): Time spent improving.
+    """
+
+    def __init__(self, route, length_before, length_after, two_opt_moves, or_opt_moves, seconds):
+        self.route = route
+        self.length_before = length_before
+        self.length_after = length_after
+        self.two_opt_moves = two_opt_moves
+        self.or_opt_moves = or_opt_moves
+        self.seconds = seconds
+
+    def __repr__(self):
+        saved = 100 * (1 - self.length_after / self.length_before) if self.length_before else 0.0
+        return (f"RouteImprovement(length {self.length_before:.2f} -> {self.length_after:.2f} ({saved:.1f}% shorter), "
+                f"2-opt moves={self.two_opt_moves}, or-opt moves={self.or_opt_moves}, seconds={self.seconds:.3f})")
+
+
+# Function to find the num_neighbors nearest other points of every point. The points are split at medians into
+# groups of at most chunk_size, and each group is only compared with the points inside its bounding box widened
+# by the largest within-group k-th neighbor distance, which is sure to contain every true neighbor. On spread-out
+# points that keeps the work close to linear instead of computing the whole n x n matrix.
+def nearest_neighbor_lists(points, num_neighbors, chunk_size=1024, max_block=4_000_000):
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    k = min(num_neighbors, len(points) - 1)
+    if k <= 0:
+        return [[] for _ in range(len(points))]
+    neighbors = np.empty((len(points), k), dtype=np.int64)
+    for group in _median_split_groups(points, chunk_size):
+        group_points = points[group]
+        if len(group) > k:
+            block = pairwise_distances(group_points, group_points)
+            np.fill_diagonal(block, np.inf)
+            radius = np.partition(block, k - 1, axis=1)[:, k - 1].max()
+            low, high = group_points.min(axis=0) - radius, group_points.max(axis=0) + radius
+            candidates = np.flatnonzero(np.all((points >= low) & (points <= high), axis=1))
+        else:
+            candidates = np.arange(len(points))
+        # Rows go through in slices so that one block never holds more than max_block distances.
+        step = max(1, max_block // len(candidates))
+        for start in range(0, len(group), step):
+            rows = group[start:start + step]
+            block = pairwise_distances(points[rows], points[candidates])
+            block[np.arange(len(rows)), np.searchsorted(candidates, rows)] = np.inf
+            nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+            order = np.take_along_axis(block, nearest, axis=1).argsort(axis=1, kind="stable")
+            neighbors[rows] = candidates[np.take_along_axis(nearest, order, axis=1)]
+    return neighbors.tolist()
+
+
+def _median_split_groups(points, chunk_size):
+    # Yields index arrays of at most chunk_size points, splitting each group at the median of its wider axis.
+    stack = [np.arange(len(points))]
+    while stack:
+        group = stack.pop()
+        if len(group) <= chunk_size:
+            yield group
+            continue
+        group_points = points[group]
+        axis = int(np.argmax(group_points.max(axis=0) - group_points.min(axis=0)))
+        order = np.argsort(group_points[:, axis], kind="stable")
+        half = len(group) // 2
+        stack.extend((group[order[:half]], group[order[half:]]))
+
+
+# Function to improve a route from find_nearest_neighbor with 2-opt and Or-opt moves. The first location stays first.
+# Each location only tries moves towards its num_neighbors nearest locations, and don't-look bits skip locations
+# whose surroundings have not changed since they last failed to improve. The search stops when no move improves
+# the route, after max_iterations improving moves, or once time_budget seconds have passed.
+def improve_route(route, time_budget=None, max_iterations=None, num_neighbors=8, closed=False,
+                  distance_function=distance):
+    started = time.perf_counter()
+    length_before = route_length(route, closed, distance_function)
+    if len(route) < 4:
+        return RouteImprovement(list(route), length_before, length_before, 0, 0, time.perf_counter() - started)
+
+    n = len(route)
+    neighbor_lists = nearest_neighbor_lists(route, num_neighbors)
+    # An open route is searched as a closed tour through a dummy location. The dummy is free to reach from the start
+    # and costs the same penalty from every other stop, so every move that keeps it beside the start changes the
+    # tour by exactly as much as the open route, and moving it away always costs more.
+    dummy = None if closed else n
+    penalty = 2 * length_before + 1.0
+
+    def dist(i, j):
+        if i == dummy or j == dummy:
+            return 0.0 if (i == 0 or j == 0) else penalty
+        return distance_function(route[i], route[j])
+
+    tour = list(range(n)) + ([] if closed else [dummy])
+    size = len(tour)
+    position = list(range(size))
+    active = deque(range(n))
+    queued = [True] * size
+    two_opt_moves = or_opt_moves = 0
+
+    def succ(node):
+        return tour[(position[node] + 1) % size]
+
+    def pred(node):
+        return tour[(position[node] - 1) % size]
+
+    def activate(*nodes):
+        for node in nodes:
+            if node != dummy and not queued[node]:
+                queued[node] = True
+                active.append(node)
+
+    def reverse(first, last):
+        # Reverses the tour section running forward from first to last, flipping whichever side is shorter.
+        i, j = position[first], position[last]
+        length = (j - i) % size + 1
+        if 2 * length > size:
+            i, j = (j + 1) % size, (i - 1) % size
+            length = size - length
+        for _ in range(length // 2):
+            tour[i], tour[j] = tour[j], tour[i]
+            position[tour[i]], position[tour[j]] = i, j
+            i, j = (i + 1) % size, (j - 1) % size
+
+    def move_segment(segment, c, reverse_segment):
+        # Moves the segment (consecutive stops in tour order) to between c and succ(c), reversed if asked. Only the
+        # stops on the shorter side between its old and new places are shifted, each by len(segment).
+        length, start = len(segment), position[segment[0]]
+        ahead = (position[c] - start - length + 1) % size  # stops after the segment, up to and including c
+        behind = size - length - ahead  # stops from succ(c) up to the one before the segment
+        if ahead <= behind:
+            for k in range(ahead):
+                node = tour[(start + length + k) % size]
+                tour[(start + k) % size] = node
+                position[node] = (start + k) % size
+            first_slot = start + ahead
+        else:
+            for k in range(behind - 1, -1, -1):
+                node = tour[(start - behind + k) % size]
+                tour[(start - behind + k + length) % size] = node
+                position[node] = (start - behind + k + length) % size
+            first_slot = start - behind
+        for k, node in enumerate(segment[::-1] if reverse_segment else segment):
+            tour[(first_slot + k) % size] = node
+            position[node] = (first_slot + k) % size
+
+    def try_two_opt(a):
+        for forward in (True, False):
+            b = succ(a) if forward else pred(a)
+            d_ab = dist(a, b)
+            for c in neighbor_lists[a]:
+                d_ac = dist(a, c)
+                if d_ac >= d_ab:
+                    break
+                d = succ(c) if forward else pred(c)
+                if c == b or d == a:
+                    continue
+                gain = d_ab + dist(c, d) - d_ac - dist(b, d)
+                if gain > 1e-10:
+                    if forward:
+                        reverse(b, c)
+                    else:
+                        reverse(c, b)
+                    activate(a, b, c, d)
+                    return True
+        return False
+
+    def try_or_opt(a):
+        for segment_length in (1, 2, 3):
+            first = a
+            segment = [first]
+            for _ in range(segment_length - 1):
+                segment.append(succ(segment[-1]))
+            last = segment[-1]
+            before, after = pred(first), succ(last)
+            if dummy in segment or after in segment or before in segment:
+                continue
+            removal_gain = dist(before, first) + dist(last, after) - dist(before, after)
+            if removal_gain <= 1e-10:
+                continue
+            for c in set(neighbor_lists[first]) | set(neighbor_lists[last]):
+                if c in segment or c == before:
+                    continue
+                c_next = succ(c)
+                if c_next in segment:
+                    continue
+                join = dist(c, c_next)
+                forward_cost = dist(c, first) + dist(last, c_next) - join
+                reverse_cost = dist(c, last) + dist(first, c_next) - join
+                if removal_gain - min(forward_cost, reverse_cost) > 1e-10:
+                    move_segment(segment, c, reverse_segment=forward_cost > reverse_cost)
+                    activate(before, after, c, c_next, first, last)
+                    return True
+        return False
+
+    while active:
+        if max_iterations is not None and two_opt_moves + or_opt_moves >= max_iterations:
+            break
+        if time_budget is not None and time.perf_counter() - started > time_budget:
+            break
+        node = active.popleft()
+        queued[node] = False
+        if try_two_opt(node):
+            two_opt_moves += 1
+        elif try_or_opt(node):
+            or_opt_moves += 1
+
+    # Rotate the tour back to begin at the start; an open route also has to leave the start away from the dummy.
+    start = position[0]
+    ordered = tour[start:] + tour[:start]
+    if not closed and ordered[1] == dummy:
+        ordered = [0] + ordered[1:][::-1]
+    improved = [route[i] for i in ordered if i != dummy]
+    return RouteImprovement(improved, length_before, route_length(improved, closed, distance_function),
+                            two_opt_moves, or_opt_moves, time.perf_counter() - started)
@@ -0,0 +1,148 @@
+"""Nearest neighbor heuristic for package delivery, with a k-d tree for large stop lists."""
+
+from .telemetry import instrumentation, instrumented
+
+
+# Code for Part 2: Nearest Neighbor Heuristic for Package Distribution
+# Function to calculate the shortest distance between two points a and b.
+# Each point is represented as a tuple (x-coordinate, y-coordinate).
+def distance(a, b):
+    # Calculate the square root of the sum of the squared differences of the coordinates.
+    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+
+# Function to find the nearest neighbor route for package delivery starting from a given location.
+# method="kdtree" answers each step from a KDTree instead of scanning the list, and leaves houses untouched.
+# method="matrix" reads each step from a DistanceMatrix over [start] + houses, which may hold road distances.
+@instrumented("find_nearest_neighbor")
+def find_nearest_neighbor(start, houses, method="scan", matrix=None):
+    if instrumentation.enabled:
+        # One step per house; the list scan measures the distance to every house still left at each step.
+        instrumentation.count("find_nearest_neighbor.steps", len(houses))
+        if method == "scan":
+            instrumentation.count("find_nearest_neighbor.distance_evaluations", len(houses) * (len(houses) + 1) // 2)
+    if method == "kdtree":
+        return _kdtree_nearest_neighbor_route(start, houses)
+    if method == "matrix":
+        from .vectorized import _matrix_nearest_neighbor_route
+        return _matrix_nearest_neighbor_route(start, houses, matrix)
+    if method != "scan":
+        raise ValueError(f"Unknown nearest neighbor method: {method!r}")
+
+    # Initialize the route with the start location.
+    route = [start]
+    # Set the current location as the start location.
+    current = start
+
+    # Continue until there are no more houses to visit.
+    while houses:
+        # Find the house nearest to the current location by comparing distances.
+        next_house = min(houses, key=lambda x: distance(current, x))
+        # Append the nearest house to the route.
+        route.append(next_house)
+        # Remove the visited house from the list of houses to prevent revisiting.
+        houses.remove(next_house)
+        # Update the current location to the newly visited house.
+        current = next_house
+
+    # Return the completed route that includes all visited houses.
+    return route
+
+
+# Code for Part 10: Spatial Index for the Nearest Neighbor Heuristic
+class KDTree:
+    """Static 2-d tree over a list of points that supports removing points as they are visited.
+
+    Every node keeps a count of the points still present in its subtree, so fully visited regions are skipped.
+    Ties are broken by the position of the point in the original list, exactly like min() over the list.
+
+    Attributes:
+        points (list): The indexed points, in their original order.
+        order (list): Point indices arranged as an implicit balanced tree; the node of range [lo, hi) sits at
+                      (lo + hi) // 2 and splits on the x coordinate at even depths and y at odd depths.
+        alive (list): Number of remaining points in the subtree of every node, indexed like order.
+    """
+
+    def __init__(self, points):
+        self.points = list(points)
+        self.order = list(range(len(self.points)))
+        self.alive = [0] * len(self.points)
+        self.position = [0] * len(self.points)  # Position of every point index within order
+        self._build(0, len(self.points), 0)
+        self.size = len(self.points)
+
+    def _build(self, lo, hi, depth):
+        if lo >= hi:
+            return
+        axis = depth & 1
+        # Sorting by (coordinate, index) keeps the tree deterministic when coordinates repeat.
+        self.order[lo:hi] = sorted(self.order[lo:hi], key=lambda i: (self.points[i][axis], i))
+        mid = (lo + hi) // 2
+        self.alive[mid] = hi - lo
+        self.position[self.order[mid]] = mid
+        self._build(lo, mid, depth + 1)
+        self._build(mid + 1, hi, depth + 1)
+
+    def __len__(self):
+        return self.size
+
+    def remove(self, index):
+        # Removes the point with the given original index by decrementing the counts on its root-to-node path.
+        target = self.position[index]
+        lo, hi = 0, len(self.points)
+        while True:
+            mid = (lo + hi) // 2
+            self.alive[mid] -= 1
+            if mid == target:
+                break
+            if target < mid:
+                hi = mid
+            else:
+                lo = mid + 1
+        self.size -= 1
+
+    def nearest(self, query):
+        # Returns the original index of the remaining point nearest to query, or None if no points remain.
+        best = [float('infinity'), None]
+        self._nearest(query, 0, len(self.points), 0, best)
+        return best[1]
+
+    def _nearest(self, query, lo, hi, depth, best):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self.alive[mid] == 0:
+            return
+        index = self.order[mid]
+        point = self.points[index]
+        # The node's own point is present unless its subtree count only covers its children.
+        if self._is_present(lo, hi, mid):
+            d = distance(query, point)
+            if d < best[0] or (d == best[0] and index < best[1]):
+                best[0], best[1] = d, index
+        axis = depth & 1
+        difference = query[axis] - point[axis]
+        near, far = ((lo, mid), (mid + 1, hi)) if difference <= 0 else ((mid + 1, hi), (lo, mid))
+        self._nearest(query, near[0], near[1], depth + 1, best)
+        # Only cross the splitting line if a point on the other side could be at least as close.
+        # The tiny slack keeps exact ties on the far side, so tie-breaking by index stays exact.
+        if abs(difference) * (1 - 1e-12) <= best[0]:
+            self._nearest(query, far[0], far[1], depth + 1, best)
+
+    def _is_present(self, lo, hi, mid):
+        left = self.alive[(lo + mid) // 2] if lo < mid else 0
+        right = self.alive[(mid + 1 + hi) // 2] if mid + 1 < hi else 0
+        return self.alive[mid] > left + right
+
+
+# Function to build the nearest neighbor route from a KDTree. Produces the same route as the list scan.
+def _kdtree_nearest_neighbor_route(start, houses):
+    tree = KDTree(houses)
+    route = [start]
+    current = start
+    while len(tree):
+        index = tree.nearest(current)
+        tree.remove(index)
+        current = houses[index]
+        route.append(current)
+    return route
@@ -0,0 +1,552 @@
+"""Dijkstra, point-to-point and A* searches, incremental shortest-path trees and a result cache."""
+
+import heapq
+import itertools
+import math
+import sys
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+from .heaps import IndexedHeap
+from .telemetry import instrumentation, instrumented
+from .routing import distance
+
+
+# Define the Dijkstra's algorithm function to find the shortest paths from a start vertex to all other vertices in a graph.
+# heap="lazy" uses heapq and skips stale entries, heap="indexed" uses an IndexedHeap with real decrease-key.
+# Passing a DijkstraStats object collects push, pop and stale-pop counters for the run.
+@instrumented("dijkstra")
+def dijkstra(graph, start, heap="lazy", stats=None):
+    # A frozen CSR graph is routed to its array-based implementation, which returns the same distances.
+    # It is the only graph without an adjacency list, so NumPy is only imported when one is passed in.
+    if not hasattr(graph, "adjacency_list"):
+        from .csr import csr_dijkstra
+        return csr_dijkstra(graph, start, stats)
+    if heap == "indexed":
+        return _indexed_dijkstra(graph, start, stats)
+    if heap != "lazy":
+        raise ValueError(f"Unknown heap type: {heap!r}")
+
+    # Initialize a dictionary to store the shortest distance from the start vertex to each other vertex.
+    # Set all distances to infinity as default, except the start vertex which is set to zero.
+    distances = {vertex: float('infinity') for vertex in graph.adjacency_list}
+    distances[start] = 0
+    # Keep track of the vertices whose shortest distance is final.
+    visited = set()
+    pushes = pops = stale_pops = 0
+
+    # Create a priority queue and add the start vertex with a distance of 0.
+    priority_queue = [(0, start)]
+
+    # Continue processing as long as there are vertices in the priority queue.
+    while priority_queue:
+        # Remove and return the vertex with the smallest distance from the priority queue.
+        current_distance, current_vertex = heapq.heappop(priority_queue)
+        pops += 1
+        # A vertex that was already visited was pushed again with a shorter distance, so this entry is stale.
+        if current_vertex in visited:
+            stale_pops += 1
+            continue
+        visited.add(current_vertex)
+
+        # Iterate over each neighbor connected to the current vertex.
+        for neighbor, road in graph.adjacency_list[current_vertex]:
+            # Calculate the distance to this neighbor by adding the current distance to the length of the connecting road.
+            distance = current_distance + road.length
+            # If the calculated distance is less than the previously recorded distance in the distances dictionary,
+            # update the distance for this neighbor.
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                # Add the neighbor to the priority queue with the new distance.
+                heapq.heappush(priority_queue, (distance, neighbor))
+                pushes += 1
+
+    if stats is not None:
+        stats.record(pushes=pushes + 1, pops=pops, stale_pops=stale_pops)
+    if instrumentation.enabled:
+        # Every edge of a settled vertex was relaxed once, so the count needs no work inside the loop.
+        relaxations = sum(len(graph.adjacency_list[vertex]) for vertex in visited)
+        instrumentation.count_all("dijkstra", runs=1, relaxations=relaxations, pushes=pushes + 1, pops=pops,
+                                  stale_pops=stale_pops)
+    # Return the dictionary containing the shortest distances from the start vertex to each vertex in the graph.
+    return distances
+
+
+def _indexed_dijkstra(graph, start, stats=None):
+    distances = {vertex: float('infinity') for vertex in graph.adjacency_list}
+    distances[start] = 0
+    visited = set()
+    queue = IndexedHeap()
+    queue.push(start, 0)
+    pushes, pops, decrease_keys = 1, 0, 0
+
+    while queue:
+        current_distance, current_vertex = queue.pop()
+        pops += 1
+        visited.add(current_vertex)
+        for neighbor, road in graph.adjacency_list[current_vertex]:
+            distance = current_distance + road.length
+            if distance < distances[neighbor] and neighbor not in visited:
+                distances[neighbor] = distance
+                if neighbor in queue:
+                    queue.decrease_key(neighbor, distance)
+                    decrease_keys += 1
+                else:
+                    queue.push(neighbor, distance)
+                    pushes += 1
+
+    if stats is not None:
+        stats.record(pushes=pushes, pops=pops, decrease_keys=decrease_keys)
+    if instrumentation.enabled:
+        relaxations = sum(len(graph.adjacency_list[vertex]) for vertex in visited)
+        instrumentation.count_all("dijkstra", runs=1, relaxations=relaxations, pushes=pushes, pops=pops,
+                                  decrease_keys=decrease_keys)
+    return distances
+
+
+# Code for Part 5: Point-to-Point Shortest Paths
+class ShortestPath:
+    """Result of a point-to-point shortest path query.
+
+    Attributes:
+        distance (float): Total length of the path, or infinity when the target cannot be reached.
+        vertices (list): The vertices along the path, from source to target.
+        roads (list): The Road objects travelled, one fewer than the vertices.
+        settled (int): Number of vertices settled by the search, a measure of the work done.
+    """
+
+    def __init__(self, distance, vertices, roads, settled):
+        self.distance = distance
+        self.vertices = vertices
+        self.roads = roads
+        self.settled = settled
+
+    def __repr__(self):
+        return f"ShortestPath(distance={self.distance}, roads={self.roads}, settled={self.settled})"
+
+
+# Function to walk predecessor links back from a vertex, returning the vertices and roads in travel order.
+def _trace_predecessors(predecessors, vertex):
+    vertices, roads = [vertex], []
+    while vertex in predecessors:
+        vertex, road = predecessors[vertex]
+        vertices.append(vertex)
+        roads.append(road)
+    vertices.reverse()
+    roads.reverse()
+    return vertices, roads
+
+
+# Function to find the shortest path from source to target, stopping as soon as the target is settled.
+# With bidirectional=True the search runs from both ends at once and stops when the two frontiers meet.
+# A heuristic(vertex, target) returning a lower bound on the remaining distance turns the search into A*.
+@instrumented("shortest_path")
+def shortest_path(graph, source, target, bidirectional=False, heuristic=None):
+    if bidirectional:
+        if heuristic is not None:
+            raise ValueError("A heuristic cannot be combined with the bidirectional search")
+        return _bidirectional_shortest_path(graph, source, target)
+
+    distances = {source: 0}
+    predecessors = {}
+    settled = set()
+    # The counter breaks priority ties so vertices themselves never have to be compared.
+    counter = itertools.count()
+    priority_queue = [(0, next(counter), source)]
+
+    while priority_queue:
+        _, _, current_vertex = heapq.heappop(priority_queue)
+        if current_vertex in settled:
+            continue
+        settled.add(current_vertex)
+        current_distance = distances[current_vertex]
+        if current_vertex == target:
+            vertices, roads = _trace_predecessors(predecessors, target)
+            return ShortestPath(current_distance, vertices, roads, len(settled))
+
+        for neighbor, road in graph.adjacency_list[current_vertex]:
+            distance = current_distance + road.length
+            if neighbor not in settled and distance < distances.get(neighbor, float('infinity')):
+                distances[neighbor] = distance
+                predecessors[neighbor] = (current_vertex, road)
+                # A* orders the queue by the distance so far plus the estimate of the distance still to go.
+                priority = distance if heuristic is None else distance + heuristic(neighbor, target)
+                heapq.heappush(priority_queue, (priority, next(counter), neighbor))
+
+    return ShortestPath(float('infinity'), [], [], len(settled))
+
+
+def _bidirectional_shortest_path(graph, source, target):
+    if source == target:
+        graph.adjacency_list[source]  # Raises KeyError for unknown vertices, like the one-directional search.
+        return ShortestPath(0, [source], [], 1)
+
+    # Index 0 is the forward search from the source, index 1 the backward search from the target.
+    # Roads are stored in both directions, so the backward search can follow the same adjacency lists.
+    distances = ({source: 0}, {target: 0})
+    predecessors = ({}, {})
+    settled = (set(), set())
+    counter = itertools.count()
+    queues = ([(0, next(counter), source)], [(0, next(counter), target)])
+    best_distance = float('infinity')
+    # The meeting edge (side, vertex, road, neighbor) that closes the best complete path found so far.
+    meeting_edge = None
+
+    while queues[0] and queues[1]:
+        # Once the two smallest tentative distances add up to the best path seen, no shorter path can exist.
+        if queues[0][0][0] + queues[1][0][0] >= best_distance:
+            break
+        # Expand the side with the smaller frontier to keep the two searches balanced.
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        current_distance, _, current_vertex = heapq.heappop(queues[side])
+        if current_vertex in settled[side]:
+            continue
+        settled[side].add(current_vertex)
+
+        for neighbor, road in graph.adjacency_list[current_vertex]:
+            distance = current_distance + road.length
+            if distance < distances[side].get(neighbor, float('infinity')):
+                distances[side][neighbor] = distance
+                predecessors[side][neighbor] = (current_vertex, road)
+                heapq.heappush(queues[side], (distance, next(counter), neighbor))
+            # Check whether this road joins the two searches into a shorter complete path.
+            other_distance = distances[1 - side].get(neighbor)
+            if other_distance is not None and distance + other_distance < best_distance:
+                best_distance = distance + other_distance
+                meeting_edge = (side, current_vertex, road, neighbor)
+
+    settled_count = len(settled[0]) + len(settled[1])
+    if meeting_edge is None:
+        return ShortestPath(float('infinity'), [], [], settled_count)
+
+    side, vertex, road, neighbor = meeting_edge
+    if side == 1:
+        # Orient the meeting road so that vertex lies on the source side and neighbor on the target side.
+        vertex, neighbor = neighbor, vertex
+    vertices, roads = _trace_predecessors(predecessors[0], vertex)
+    target_vertices, target_roads = _trace_predecessors(predecessors[1], neighbor)
+    # The backward search traced from the target, so its half of the path is reversed before joining.
+    vertices += target_vertices[::-1]
+    roads += [road] + target_roads[::-1]
+    distance = distances[0][vertex] + road.length + distances[1][neighbor]
+    return ShortestPath(distance, vertices, roads, settled_count)
+
+
+# Code for Part 6: A* Heuristics and Landmarks (ALT)
+# Mean radius of the Earth in kilometers, matching the kilometer road lengths.
+EARTH_RADIUS_KM = 6371.0088
+
+
+# Function to get the location of a vertex: an Intersection's coordinates, or the vertex itself when it is a point tuple.
+def vertex_coordinates(vertex):
+    coordinates = getattr(vertex, "coordinates", vertex)
+    if coordinates is None:
+        raise ValueError(f"{vertex} has no coordinates")
+    return coordinates
+
+
+# Function to calculate the great-circle distance in kilometers between two (latitude, longitude) points in degrees.
+def haversine_distance(a, b):
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+# Straight-line lower bound for planar (x, y) kilometer coordinates. Admissible as long as no road is shorter
+# than the straight line between its ends.
+def euclidean_heuristic(vertex, target):
+    return distance(vertex_coordinates(vertex), vertex_coordinates(target))
+
+
+# Great-circle lower bound for (latitude, longitude) coordinates in degrees.
+def haversine_heuristic(vertex, target):
+    return haversine_distance(vertex_coordinates(vertex), vertex_coordinates(target))
+
+
+class LandmarkHeuristic:
+    """ALT heuristic built from precomputed shortest distances to a few landmark vertices.
+
+    By the triangle inequality |d(L, target) - d(L, v)| never exceeds d(v, target), so the largest value over all
+    landmarks is an admissible and consistent lower bound. It needs no coordinates at all.
+
+    Attributes:
+        landmarks (list): The chosen landmark vertices.
+        landmark_distances (list): One dijkstra distance dictionary per landmark.
+    """
+
+    def __init__(self, graph, num_landmarks=4, landmarks=None):
+        self.landmarks = list(landmarks) if landmarks is not None else []
+        self.landmark_distances = [dijkstra(graph, landmark) for landmark in self.landmarks]
+        if landmarks is None and graph.adjacency_list:
+            self._select_farthest_landmarks(graph, num_landmarks)
+
+    def _select_farthest_landmarks(self, graph, num_landmarks):
+        # Farthest-point selection: each new landmark is the reachable vertex farthest from those chosen so far,
+        # which places landmarks on the edge of the map where their bounds are tightest.
+        closest = dijkstra(graph, next(iter(graph.adjacency_list)))
+        for _ in range(min(num_landmarks, len(graph.adjacency_list))):
+            candidates = [vertex for vertex, d in closest.items() if d != float('infinity')]
+            landmark = max(candidates, key=lambda vertex: closest[vertex])
+            if landmark in self.landmarks:
+                break
+            distances = dijkstra(graph, landmark)
+            self.landmarks.append(landmark)
+            self.landmark_distances.append(distances)
+            if len(self.landmarks) == 1:
+                closest = distances
+            else:
+                closest = {vertex: min(d, distances[vertex]) for vertex, d in closest.items()}
+
+    def __call__(self, vertex, target):
+        bound = 0
+        for distances in self.landmark_distances:
+            to_vertex, to_target = distances.get(vertex, float('infinity')), distances.get(target, float('infinity'))
+            # Landmarks in another component give no information about this pair.
+            if to_vertex != float('infinity') and to_target != float('infinity'):
+                bound = max(bound, abs(to_target - to_vertex))
+        return bound
+
+    def __repr__(self):
+        return f"LandmarkHeuristic(landmarks={self.landmarks})"
+
+
+class ShortestPathTree:
+    """Shortest-path tree from one source that is repaired in place as the graph changes.
+
+    refresh() replays the graph's change log since the tree was last current, in the style of Ramalingam and Reps:
+    only the subtrees hanging off a removed or lengthened tree road are reset, they are re-seeded from their
+    untouched neighbors, and a Dijkstra search limited to the vertices whose distance actually changes fixes the
+    rest. Roads are taken to be two-way with the same length both ways, as add_edge and add_road make them. When the
+    graph's change log no longer reaches back to the tree's version, or holds a bulk "add_edges" batch, the tree is
+    rebuilt from scratch instead.
+
+    Attributes:
+        graph (Graph): The graph the tree is kept current with.
+        source: The start vertex.
+        distances (dict): Shortest distance to every vertex, matching dijkstra(graph, source).
+        predecessors (dict): Vertex to (previous vertex, Road) on its shortest path.
+        children (dict): Vertex to the set of vertices whose predecessor it is.
+        version (int): Graph version the tree is current with.
+    """
+
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self._rebuild()
+
+    def _rebuild(self):
+        # Full Dijkstra from the source; returns the number of vertices settled.
+        self.distances = {vertex: float('infinity') for vertex in self.graph.adjacency_list}
+        self.distances[self.source] = 0
+        self.predecessors = {}
+        self.children = {}
+        self.version = self.graph.version
+        return self._search([(0, 0, self.source)], itertools.count(1))
+
+    def _set_predecessor(self, vertex, predecessor):
+        # Moves vertex under a new parent in the tree, or detaches it when predecessor is None.
+        previous = self.predecessors.pop(vertex, None)
+        if previous is not None:
+            self.children[previous[0]].discard(vertex)
+        if predecessor is not None:
+            self.predecessors[vertex] = predecessor
+            self.children.setdefault(predecessor[0], set()).add(vertex)
+
+    def _relax(self, frm, to, road, queue, counter):
+        distance = self.distances[frm] + road.length
+        if distance < self.distances.get(to, float('infinity')):
+            self.distances[to] = distance
+            self._set_predecessor(to, (frm, road))
+            heapq.heappush(queue, (distance, next(counter), to))
+
+    def _search(self, queue, counter):
+        # Dijkstra from the queued vertices; returns the number of vertices settled.
+        settled = 0
+        while queue:
+            current_distance, _, current_vertex = heapq.heappop(queue)
+            if current_distance > self.distances[current_vertex]:
+                continue
+            settled += 1
+            for neighbor, road in self.graph.adjacency_list[current_vertex]:
+                self._relax(current_vertex, neighbor, road, queue, counter)
+        return settled
+
+    def refresh(self):
+        """Applies the graph changes made since the last refresh; returns the number of vertices re-settled."""
+        changes = self.graph.changes_since(self.version)
+        if changes is None or any(change.kind == "add_edges" for change in changes):
+            return self._rebuild()
+        self.version = self.graph.version
+        if not changes:
+            return 0
+        for change in changes:
+            for vertex in (change.start, change.end):
+                if vertex in self.graph.adjacency_list:
+                    self.distances.setdefault(vertex, float('infinity'))
+
+        # Subtrees below a tree road that was removed or made longer may now have longer paths.
+        roots = []
+        for change in changes:
+            if change.end is None:
+                continue
+            for frm, to in ((change.start, change.end), (change.end, change.start)):
+                predecessor = self.predecessors.get(to)
+                if predecessor is None or predecessor[0] != frm or not any(predecessor[1] is r for r in change.roads):
+                    continue
+                if change.kind == "remove_road" or self.distances[frm] + predecessor[1].length > self.distances[to]:
+                    roots.append(to)
+        affected = set()
+        while roots:
+            vertex = roots.pop()
+            if vertex not in affected:
+                affected.add(vertex)
+                roots.extend(self.children.get(vertex, ()))
+        for vertex in affected:
+            self.distances[vertex] = float('infinity')
+            self._set_predecessor(vertex, None)
+
+        # Re-seed the reset vertices from their untouched neighbors, and relax every added or changed road,
+        # which may have made some paths shorter.
+        queue, counter = [], itertools.count()
+        for vertex in affected:
+            for neighbor, road in self.graph.adjacency_list[vertex]:
+                if neighbor not in affected:
+                    self._relax(neighbor, vertex, road, queue, counter)
+        for change in changes:
+            if change.kind in ("add_edge", "add_road", "update_road"):
+                for frm, to in ((change.start, change.end), (change.end, change.start)):
+                    for neighbor, road in self.graph.adjacency_list[frm]:
+                        if neighbor == to:
+                            self._relax(frm, to, road, queue, counter)
+        return self._search(queue, counter)
+
+    def shortest_path(self, target):
+        # ShortestPath to target read off the tree, after bringing the tree up to date.
+        self.refresh()
+        vertices, roads = _trace_predecessors(self.predecessors, target)
+        return ShortestPath(self.distances.get(target, float('infinity')), vertices, roads, 0)
+
+
+# Code for Part 25: Query-Result Cache for Dijkstra
+class CacheStats:
+    """Counters of a DijkstraCache.
+
+    Attributes:
+        hits (int): Queries answered from the cache.
+        misses (int): Queries that had to be computed.
+        evictions (int): Entries dropped to stay within max_entries or max_bytes.
+        expirations (int): Entries dropped because they were older than the TTL.
+        invalidations (int): Times the whole cache was cleared because the graph changed.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions}, "
+                f"expirations={self.expirations}, invalidations={self.invalidations})")
+
+
+# Function to estimate the bytes held by a cached result: the container itself plus one float per distance.
+# Vertices and Roads are shared with the graph, so they are not counted. A distance table must be measured as the
+# dict itself, since getsizeof of a read-only view does not include the dict behind it.
+def _result_size(value):
+    if isinstance(value, ShortestPath):
+        return sys.getsizeof(value) + sys.getsizeof(value.vertices) + sys.getsizeof(value.roads)
+    return sys.getsizeof(value) + sys.getsizeof(0.0) * len(value)
+
+
+class DijkstraCache:
+    """LRU cache of dijkstra and shortest_path results for one graph, cleared whenever the graph changes.
+
+    Every mutation of a Graph bumps graph.version (see Part 24), so a lookup that finds a different version than
+    the one the entries were computed at drops them all before answering. Entries are also dropped, least recently
+    used first, once there are more than max_entries of them or their estimated size passes max_bytes, and after
+    ttl seconds if a TTL is set.
+
+    Attributes:
+        graph (Graph): The graph the results belong to.
+        entries (OrderedDict): Key to (result, size in bytes, expiry time), least recently used first.
+        size (int): Estimated bytes held by all entries.
+        version (int): Graph version the entries were computed at.
+        stats (CacheStats): Hit, miss, eviction, expiration and invalidation counters.
+    """
+
+    def __init__(self, graph, max_entries=128, max_bytes=None, ttl=None, clock=time.monotonic):
+        self.graph = graph
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.size = 0
+        # A CSRGraph is frozen and has no version.
+        self.version = getattr(graph, "version", 0)
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def _lookup(self, key, compute, freeze=None):
+        # freeze, if given, wraps a freshly computed result after its size has been measured.
+        version = getattr(self.graph, "version", 0)
+        if version != self.version:
+            if self.entries:
+                self.stats.invalidations += 1
+            self.clear()
+            self.version = version
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[2] is not None and self.clock() >= entry[2]:
+                self.stats.expirations += 1
+                self.size -= entry[1]
+                del self.entries[key]
+            else:
+                self.stats.hits += 1
+                self.entries.move_to_end(key)
+                return entry[0]
+
+        self.stats.misses += 1
+        value = compute()
+        size = _result_size(value)
+        if freeze is not None:
+            value = freeze(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return value  # Would evict everything else and still not fit.
+        self.entries[key] = (value, size, None if self.ttl is None else self.clock() + self.ttl)
+        self.size += size
+        while len(self.entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+            _, (_, evicted_size, _) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.stats.evictions += 1
+        return value
+
+    def dijkstra(self, start, heap="lazy"):
+        # Distances from start as a read-only view, so callers cannot change the cached dict.
+        return self._lookup(("dijkstra", start), lambda: dijkstra(self.graph, start, heap), MappingProxyType)
+
+    def shortest_path(self, source, target, bidirectional=False):
+        return self._lookup(("path", source, target, bidirectional),
+                            lambda: shortest_path(self.graph, source, target, bidirectional))
+
+    def distance(self, source, target):
+        # A cached distance table from source answers with one lookup; otherwise a point-to-point search is
+        # cached instead of a full sweep.
+        entry = self.entries.get(("dijkstra", source))
+        if entry is not None and getattr(self.graph, "version", 0) == self.version:
+            return self.dijkstra(source)[target]
+        return self.shortest_path(source, target).distance
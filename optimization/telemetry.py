@@ -0,0 +1,171 @@
+"""Opt-in counters and timing histograms for the hot paths, switched on and off at runtime."""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+
+class TimingHistogram:
+    """Histogram of durations in power-of-two microsecond buckets, so recording a call is O(1) and memory is fixed.
+
+    Attributes:
+        buckets (dict): Exponent e to the number of durations in [2 ** (e - 1), 2 ** e) microseconds; bucket 0
+                        holds everything under one microsecond.
+        count (int): Number of durations recorded.
+        total (float): Sum of the durations in seconds.
+        minimum (float): Shortest duration in seconds.
+        maximum (float): Longest duration in seconds.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float('infinity')
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        # int.bit_length gives the power-of-two bucket without calling math.log.
+        exponent = int(seconds * 1e6).bit_length()
+        self.buckets[exponent] = self.buckets.get(exponent, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, fraction):
+        # Upper edge, in seconds, of the bucket holding the given fraction of the durations (0.5 for the median).
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for exponent in sorted(self.buckets):
+            seen += self.buckets[exponent]
+            if seen >= rank:
+                return min(2 ** exponent / 1e6, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        # JSON-ready summary of the histogram.
+        return {"count": self.count, "total": self.total, "mean": self.total / self.count if self.count else 0.0,
+                "min": self.minimum if self.count else 0.0, "max": self.maximum,
+                "p50": self.percentile(0.5), "p99": self.percentile(0.99),
+                "buckets": {f"<{2 ** exponent}us": n for exponent, n in sorted(self.buckets.items())}}
+
+    def __repr__(self):
+        return (f"TimingHistogram(count={self.count}, mean={self.total / max(self.count, 1) * 1e6:.1f}us, "
+                f"p99<={self.percentile(0.99) * 1e6:.0f}us)")
+
+
+class Instrumentation:
+    """Registry of named counters and timing histograms that instrumented code reports to while it is enabled.
+
+    It is disabled by default. Instrumented functions then only check the enabled flag once per call, and
+    instrumented methods cost nothing at all: enable() swaps their timed wrappers into the classes and disable()
+    puts the plain methods back.
+
+    Attributes:
+        enabled (bool): Whether instrumented code reports anything.
+        counters (dict): Counter name to its total.
+        timings (dict): Timer name to its TimingHistogram.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.timings = {}
+
+    def enable(self):
+        self.enabled = True
+        for owner, attribute, _, wrapper in _instrumented_methods:
+            setattr(owner, attribute, wrapper)
+
+    def disable(self):
+        self.enabled = False
+        for owner, attribute, function, _ in _instrumented_methods:
+            setattr(owner, attribute, function)
+
+    def reset(self):
+        self.counters = {}
+        self.timings = {}
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_all(self, prefix, **counters):
+        # Adds several counters named prefix.name at once, e.g. the totals of one dijkstra run.
+        for name, amount in counters.items():
+            self.count(f"{prefix}.{name}", amount)
+
+    def observe(self, name, seconds):
+        histogram = self.timings.get(name)
+        if histogram is None:
+            histogram = self.timings[name] = TimingHistogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        # Times the body of a with block under name; does nothing while disabled.
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self):
+        # JSON-ready copy of every counter and timing summary.
+        return {"counters": dict(self.counters),
+                "timings": {name: histogram.summary() for name, histogram in self.timings.items()}}
+
+
+# The process-wide registry every instrumented function reports to.
+instrumentation = Instrumentation()
+
+
+# Decorator that times every call of the function under name while instrumentation is enabled.
+def instrumented(name):
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                instrumentation.observe(name, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+# (owner class, attribute, plain method, timed wrapper) of every method decorated with instrumented_method.
+_instrumented_methods = []
+
+
+class instrumented_method:
+    """Decorator that times a method under "ClassName.method" while instrumentation is enabled.
+
+    The class keeps the plain method until instrumentation.enable() is called, so a disabled method runs exactly as
+    if it were not decorated.
+    """
+
+    def __init__(self, function):
+        self.function = function
+
+    def __set_name__(self, owner, attribute):
+        function = self.function
+        name = f"{owner.__name__}.{attribute}"
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                instrumentation.observe(name, time.perf_counter() - started)
+
+        _instrumented_methods.append((owner, attribute, function, wrapper))
+        setattr(owner, attribute, wrapper if instrumentation.enabled else function)
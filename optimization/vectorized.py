@@ -0,0 +1,122 @@
+"""Vectorized distance kernels and chunked distance matrices."""
+
+import numpy as np
+
+from .csr import CSRGraph
+from .multi_source import distance_matrix
+from .shortest_paths import EARTH_RADIUS_KM
+
+
+# Code for Part 11: Vectorized Distance Kernels
+# Function to calculate the distances from one point to many points at once, as a NumPy array.
+# metric="euclidean" works on planar (x, y) points, metric="haversine" on (latitude, longitude) in degrees.
+def distances_from(point, points, metric="euclidean"):
+    return pairwise_distances(np.asarray(point, dtype=np.float64)[None, :], points, metric)[0]
+
+
+# Function to calculate the full matrix of distances between two sets of points (b defaults to a).
+def pairwise_distances(a, b=None, metric="euclidean"):
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 2)
+    b = a if b is None else np.asarray(b, dtype=np.float64).reshape(-1, 2)
+    if metric == "euclidean":
+        dx = a[:, 0, None] - b[None, :, 0]
+        dy = a[:, 1, None] - b[None, :, 1]
+        return np.sqrt(dx * dx + dy * dy)
+    if metric == "haversine":
+        lat1, lon1 = np.radians(a[:, 0, None]), np.radians(a[:, 1, None])
+        lat2, lon2 = np.radians(b[None, :, 0]), np.radians(b[None, :, 1])
+        h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(h)))
+    raise ValueError(f"Unknown distance metric: {metric!r}")
+
+
+class DistanceMatrix:
+    """Distance matrix over a list of locations, computed lazily in blocks of rows and cached.
+
+    Only the blocks that are actually read get computed, and each block needs chunk_size * n temporary floats
+    rather than the n * n of a single vectorized call.
+
+    Attributes:
+        locations (list): The locations the rows and columns refer to.
+        metric (str): "euclidean", "haversine" or "road".
+        chunk_size (int): Number of rows computed together.
+        blocks (dict): Cached blocks of rows, keyed by block number.
+    """
+
+    def __init__(self, locations, metric="euclidean", chunk_size=1024, graph=None):
+        if metric == "road" and graph is None:
+            raise ValueError("Road distances need the graph the locations are vertices of")
+        self.locations = list(locations)
+        self.metric = metric
+        self.chunk_size = chunk_size
+        self.blocks = {}
+        self._graph = None if graph is None else (graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph))
+        self._points = None if metric == "road" else np.asarray(self.locations, dtype=np.float64).reshape(-1, 2)
+
+    @classmethod
+    def from_graph(cls, graph, locations, chunk_size=1024):
+        """Builds a matrix of shortest road distances between locations that are vertices of the graph."""
+        return cls(locations, "road", chunk_size, graph)
+
+    def __len__(self):
+        return len(self.locations)
+
+    def row(self, i):
+        # Returns the distances from location i to every location.
+        block = i // self.chunk_size
+        if block not in self.blocks:
+            start = block * self.chunk_size
+            sources = self.locations[start:start + self.chunk_size]
+            if self.metric == "road":
+                # One block is computed in this process: starting a worker pool for every block read would cost more
+                # than the block's own Dijkstra runs. to_array uses a single pool for all the rows it still needs.
+                self.blocks[block] = distance_matrix(self._graph, sources, self.locations, processes=1)
+            else:
+                self.blocks[block] = pairwise_distances(self._points[start:start + self.chunk_size], self._points,
+                                                        self.metric)
+        return self.blocks[block][i - block * self.chunk_size]
+
+    def __getitem__(self, key):
+        i, j = key
+        return self.row(i)[j]
+
+    def to_array(self):
+        # Computes every block and returns the complete matrix.
+        if not self.locations:
+            return np.empty((0, 0))
+        missing = [start for start in range(0, len(self.locations), self.chunk_size)
+                   if start // self.chunk_size not in self.blocks]
+        if self.metric == "road" and missing:
+            sources = [location for start in missing for location in self.locations[start:start + self.chunk_size]]
+            rows = distance_matrix(self._graph, sources, self.locations)
+            offset = 0
+            for start in missing:
+                size = len(self.locations[start:start + self.chunk_size])
+                self.blocks[start // self.chunk_size] = rows[offset:offset + size]
+                offset += size
+        return np.vstack([self._block(start) for start in range(0, len(self.locations), self.chunk_size)])
+
+    def _block(self, start):
+        self.row(start)
+        return self.blocks[start // self.chunk_size]
+
+    def __repr__(self):
+        return f"DistanceMatrix(locations={len(self.locations)}, metric='{self.metric}', cached_blocks={len(self.blocks)})"
+
+
+# Function to build the nearest neighbor route from a DistanceMatrix over [start] + houses.
+def _matrix_nearest_neighbor_route(start, houses, matrix=None):
+    if matrix is None:
+        matrix = DistanceMatrix([start] + list(houses))
+    elif len(matrix) != len(houses) + 1:
+        raise ValueError("The distance matrix must cover the start location followed by every house")
+    route = [start]
+    # Matrix indices of the houses not yet visited, kept in their original order so argmin breaks ties like min().
+    remaining = np.arange(1, len(houses) + 1)
+    current = 0
+    while len(remaining):
+        position = int(np.argmin(matrix.row(current)[remaining]))
+        current = int(remaining[position])
+        remaining = np.delete(remaining, position)
+        route.append(houses[current - 1])
+    return route
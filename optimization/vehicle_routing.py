@@ -0,0 +1,119 @@
+"""Capacitated multi-vehicle routing: cluster the stops, then route each vehicle."""
+
+import math
+import multiprocessing
+import os
+
+import numpy as np
+
+from .route_improvement import improve_route, route_length
+from .routing import find_nearest_neighbor
+
+
+# Code for Part 13: Multi-Vehicle Capacitated Routing
+class VehicleRoute:
+    """Route planned for one vehicle.
+
+    Attributes:
+        vehicle (int): Index of the vehicle.
+        route (list): The depot followed by the houses in delivery order.
+        load (int): Number of parcels delivered on the route.
+        length (float): Length of the route from the depot to the last house.
+    """
+
+    def __init__(self, vehicle, route, load, length):
+        self.vehicle = vehicle
+        self.route = route
+        self.load = load
+        self.length = length
+
+    def __repr__(self):
+        return f"VehicleRoute(vehicle={self.vehicle}, stops={len(self.route) - 1}, load={self.load}, length={self.length:.2f})"
+
+
+# Function to split houses into clusters that each fit in one vehicle.
+# method="sweep" orders houses by their angle around the depot and cuts the sweep whenever a vehicle is full.
+# method="kmeans" groups nearby houses with k-means and then cuts each group the same way.
+# Each house carries demand[i] parcels (one parcel each by default). Returns lists of house indices.
+def cluster_houses(depot, houses, capacity, demands=None, method="sweep", seed=0):
+    points = np.asarray(houses, dtype=np.float64).reshape(-1, 2)
+    demands = np.ones(len(points), dtype=np.int64) if demands is None else np.asarray(demands, dtype=np.int64)
+    if len(points) and demands.max() > capacity:
+        raise ValueError("A single house needs more parcels than one vehicle can carry")
+    if method == "sweep":
+        angles = np.arctan2(points[:, 1] - depot[1], points[:, 0] - depot[0])
+        return _cut_by_capacity(np.argsort(angles, kind="stable"), demands, capacity)
+    if method == "kmeans":
+        num_clusters = max(1, math.ceil(int(demands.sum()) / capacity))
+        labels = _kmeans_labels(points, num_clusters, seed)
+        clusters = []
+        for label in range(num_clusters):
+            members = np.flatnonzero(labels == label)
+            # Visit the members of a k-means group by angle too, so an over-full group splits into neighboring parts.
+            angles = np.arctan2(points[members, 1] - depot[1], points[members, 0] - depot[0])
+            clusters += _cut_by_capacity(members[np.argsort(angles, kind="stable")], demands, capacity)
+        return clusters
+    raise ValueError(f"Unknown clustering method: {method!r}")
+
+
+def _cut_by_capacity(order, demands, capacity):
+    # Cuts an ordering of house indices into consecutive groups whose demand fits the capacity.
+    clusters, current, load = [], [], 0
+    for index in order.tolist():
+        if load + demands[index] > capacity:
+            clusters.append(current)
+            current, load = [], 0
+        current.append(index)
+        load += int(demands[index])
+    if current:
+        clusters.append(current)
+    return clusters
+
+
+def _kmeans_labels(points, num_clusters, seed, iterations=20):
+    # Lloyd's algorithm with centers seeded from random houses; returns the cluster label of every house.
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    centers = points[rng.choice(len(points), size=min(num_clusters, len(points)), replace=False)]
+    labels = np.zeros(len(points), dtype=np.int64)
+    for _ in range(iterations):
+        # Assign every house to its nearest center, a block of houses at a time to bound the temporary arrays.
+        # |p - c|^2 = |p|^2 - 2 p.c + |c|^2, and |p|^2 does not change the argmin, so one matrix product suffices.
+        center_norms = (centers ** 2).sum(axis=1)
+        for start in range(0, len(points), 4096):
+            block = points[start:start + 4096]
+            labels[start:start + 4096] = (center_norms[None, :] - 2 * block @ centers.T).argmin(axis=1)
+        # Move every center to the mean of its houses; a center that lost all its houses stays where it was.
+        counts = np.bincount(labels, minlength=len(centers))
+        sums = np.stack([np.bincount(labels, points[:, axis], minlength=len(centers)) for axis in (0, 1)], axis=1)
+        new_centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        if np.allclose(new_centers, centers):
+            break
+        centers = new_centers
+    return labels
+
+
+def _plan_cluster(task):
+    # Worker task: builds and improves the route of one cluster.
+    vehicle, depot, stops, load, time_budget = task
+    route = find_nearest_neighbor(depot, stops, method="kdtree")
+    route = improve_route(route, time_budget=time_budget).route
+    return VehicleRoute(vehicle, route, load, route_length(route))
+
+
+# Function to plan capacity-respecting routes for a fleet of vehicles leaving the same depot.
+# Clusters are routed with the k-d tree nearest neighbor heuristic and improved with improve_route, in parallel
+# worker processes. Returns one VehicleRoute per vehicle used.
+def plan_vehicle_routes(depot, houses, capacity, demands=None, method="sweep", processes=None,
+                        time_budget_per_route=None):
+    clusters = cluster_houses(depot, houses, capacity, demands, method)
+    demand_of = (lambda index: 1) if demands is None else (lambda index: int(demands[index]))
+    tasks = [(vehicle, depot, [houses[index] for index in cluster], sum(demand_of(index) for index in cluster),
+              time_budget_per_route) for vehicle, cluster in enumerate(clusters)]
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    if processes <= 1:
+        return [_plan_cluster(task) for task in tasks]
+    with multiprocessing.Pool(processes) as pool:
+        # Larger chunks cut inter-process overhead when there are many small clusters.
+        return pool.map(_plan_cluster, tasks, chunksize=max(1, len(tasks) // (processes * 4)))